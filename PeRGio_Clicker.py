@@ -2,11 +2,13 @@
 # -*- coding: utf-8 -*-
 """
 PeRGio Clicker — Always Embedded Core
-- Εκκινεί πάντα το embedded core (γρήγορη εκκίνηση)
-- Κάνει update στο παρασκήνιο από Google Drive
-- Νέο core εφαρμόζεται στην επόμενη εκκίνηση
+- Φορτώνει το νεότερο επαληθευμένο core (updates/ ή δίπλα στον launcher) με bytecode cache·
+  το embedded core μόνο αν κανένα δεν επαληθεύεται
+- Κάνει update στο παρασκήνιο (ETag/304, streaming hash, atomic replace)
+- Νέο core εφαρμόζεται στο πρώτο idle σημείο μέσα στο ίδιο process: το παράθυρο κλείνει και ξανανοίγει
+  με το νέο core. Τα runs δεν μεταφέρονται· το swap περιμένει να σταματήσουν όλα
 """
-import sys, json, hashlib, threading, time, re, types
+import sys, os, json, hashlib, threading, time, re, types, importlib.util
 from pathlib import Path
 
 REMOTE_URL = "https://raw.githubusercontent.com/Pergio13/PeRGio-Clicker/refs/heads/main/PeRGio_Clicker_core.py"
@@ -341,120 +343,257 @@ if __name__ == "__main__":
     main()
 """
 
-def _ensure_requests():
-    try:
-        import requests  # noqa
-        return True
-    except Exception:
-        if not getattr(sys, "frozen", False):
-            try:
-                import subprocess
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "requests"])
-                import requests  # noqa
-                return True
-            except Exception:
-                return False
-        return False
+UPDATE_TIMEOUT = 25
+UPDATE_CHUNK = 1 << 16
+BACKOFF_BASE, BACKOFF_MAX = 60, 24 * 3600  # sec μέχρι την επόμενη προσπάθεια μετά από αποτυχία
+USER_AGENT = "Mozilla/5.0 (PeRGio Clicker Updater)"
 
-_HAVE_REQ = _ensure_requests()
-if _HAVE_REQ:
-    import requests  # type: ignore
+def _requests():
+    """Lazy import του requests μέσα στο thread του updater (όχι στο startup path, χωρίς pip)."""
+    try:
+        import requests
+        return requests
+    except ImportError:
+        raise RuntimeError("Το 'requests' δεν είναι διαθέσιμο.")
 
 def sha256_bytes(b: bytes) -> str:
     h = hashlib.sha256(); h.update(b); return h.hexdigest()
 
-def load_state():
-    if STATE_PATH.exists():
+def sha256_file(path, chunk=UPDATE_CHUNK) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""): h.update(block)
+    return h.hexdigest()
+
+def load_state(path=STATE_PATH):
+    if path.exists():
         try:
-            return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+            return json.loads(path.read_text(encoding="utf-8"))
         except Exception:
             return {}
     return {}
 
-def save_state(d):
+def save_state(d, path=STATE_PATH):
+    # Ατομικά: ένα crash στη μέση δεν αφήνει μισό JSON (που θα έσβηνε ETag/backoff)
+    tmp = path.with_name(path.name + ".tmp")
     try:
-        STATE_PATH.write_text(json.dumps(d, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.write_text(json.dumps(d, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
     except Exception:
         pass
 
-def _download_from_gdrive(url: str, timeout=25) -> bytes:
-    if not _HAVE_REQ:
-        raise RuntimeError("Το 'requests' δεν είναι διαθέσιμο.")
-    s = requests.Session()
-    headers = {"User-Agent": "Mozilla/5.0 (PeRGio Clicker Updater)"}
-    r = s.get(url, headers=headers, timeout=timeout, allow_redirects=True)
-    r.raise_for_status()
-    data = r.content
-    text_start = data[:200].decode("utf-8", errors="ignore").lower()
-    if ("<!doctype html" in text_start) or ("<html" in text_start):
-        m = re.search(r'href="([^"]*?confirm=([^"&]+)[^"]*?)"', r.text, re.IGNORECASE)
-        if m:
-            href = m.group(1).replace("&amp;", "&")
-            if href.startswith("http"):
-                url2 = href
-            else:
-                url2 = "https://drive.google.com" + href
+def _looks_html(head: bytes) -> bool:
+    sniff = head[:200].decode("utf-8", errors="ignore").strip().lower()
+    return sniff.startswith("<!doctype html") or "<html" in sniff
+
+def _gdrive_confirm(url, r):
+    """URL επιβεβαίωσης από τη σελίδα "can't scan for viruses" του Google Drive."""
+    m = re.search(r'href="([^"]*?confirm=([^"&]+)[^"]*?)"', r.text, re.IGNORECASE)
+    if m:
+        href = m.group(1).replace("&amp;", "&")
+        return href if href.startswith("http") else "https://drive.google.com" + href
+    for k, v in r.cookies.items():
+        if k.startswith("download_warning"):
+            return url + ("&" if "?" in url else "?") + "confirm=" + v
+    raise RuntimeError("Google Drive returned HTML page without confirm token.")
+
+def _stream_to(r, tmp):
+    """Γράφει το body σε tmp ενώ ενημερώνει το SHA-256 ανά chunk. Επιστρέφει (hash, bytes)."""
+    h, size = hashlib.sha256(), 0
+    with open(tmp, "wb") as f:
+        for block in r.iter_content(UPDATE_CHUNK):
+            if size == 0 and _looks_html(block): raise RuntimeError("HTML αντί για Python script.")
+            h.update(block); f.write(block); size += len(block)
+        f.flush(); os.fsync(f.fileno())
+    return h.hexdigest(), size
+
+def check_for_update(url=REMOTE_URL, dest=REMOTE_CORE, state_path=STATE_PATH, timeout=UPDATE_TIMEOUT, session=None):
+    """Ένας έλεγχος για νέο core. Επιστρέφει "updated", "unchanged" ή "backoff".
+    - If-None-Match/If-Modified-Since: ένα αμετάβλητο core κοστίζει ένα 304 χωρίς body.
+    - Το body γράφεται σε temp αρχείο δίπλα στο dest με SHA-256 ανά chunk, ελέγχεται ότι είναι
+      Python, και μόνο τότε os.replace: το dest είναι πάντα είτε το παλιό είτε το νέο core.
+    - Σε αποτυχία, εκθετικό backoff (retry_at στο state) και η εξαίρεση προς τα πάνω."""
+    state = load_state(state_path)
+    if time.time() < state.get("retry_at", 0): return "backoff"
+    headers = {"User-Agent": USER_AGENT}
+    if dest.exists():  # τα validators έχουν νόημα μόνο αν έχουμε ακόμα το αρχείο που περιγράφουν
+        if state.get("etag"): headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"): headers["If-Modified-Since"] = state["last_modified"]
+    s = session or _requests().Session()
+    tmp = dest.with_name(dest.name + ".part")
+    r = None
+    try:
+        r = s.get(url, headers=headers, timeout=timeout, stream=True, allow_redirects=True)
+        if r.status_code == 304:
+            result = "unchanged"
         else:
-            for k, v in r.cookies.items():
-                if k.startswith("download_warning"):
-                    if "?" in url:
-                        url2 = url + "&confirm=" + v
-                    else:
-                        url2 = url + "?confirm=" + v
-                    break
+            r.raise_for_status()
+            if "text/html" in r.headers.get("Content-Type", ""):
+                confirm = _gdrive_confirm(url, r); r.close()
+                r = s.get(confirm, headers={"User-Agent": USER_AGENT}, timeout=timeout, stream=True)
+                r.raise_for_status()
+            digest, size = _stream_to(r, tmp)
+            if not size: raise RuntimeError("Κενό αρχείο.")
+            compile(tmp.read_bytes(), str(dest), "exec")  # SyntaxError: το παλιό core μένει όπως είναι
+            if dest.exists() and digest == state.get("sha256"):
+                result = "unchanged"
             else:
-                raise RuntimeError("Google Drive returned HTML page without confirm token.")
-        r2 = s.get(url2, headers=headers, timeout=timeout, allow_redirects=True)
-        r2.raise_for_status()
-        data = r2.content
-    sniff = data[:200].decode("utf-8", errors="ignore").strip().lower()
-    if sniff.startswith("<!doctype html") or "<html" in sniff:
-        raise RuntimeError("HTML αντί για Python script.")
-    return data
-
-def background_update():
-    try:
-        state = load_state()
-        last_hash = state.get("sha256", "")
-        data = _download_from_gdrive(REMOTE_URL, timeout=25)
-        new_hash = sha256_bytes(data)
-        if (not REMOTE_CORE.exists()) or (new_hash != last_hash):
-            REMOTE_CORE.write_bytes(data)
-            state["sha256"] = new_hash
-            state["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
-            save_state(state)
-    except Exception:
-        pass
+                os.replace(tmp, dest); result = "updated"
+                state["sha256"] = digest
+                state["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        state["etag"] = r.headers.get("ETag", state.get("etag"))
+        state["last_modified"] = r.headers.get("Last-Modified", state.get("last_modified"))
+        state["checked_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        for k in ("failures", "retry_at", "last_error"): state.pop(k, None)
+        return result
+    except Exception as e:
+        n = state["failures"] = state.get("failures", 0) + 1
+        state["retry_at"] = time.time() + min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (n - 1))
+        state["last_error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if r is not None: r.close()
+        try: tmp.unlink()
+        except OSError: pass
+        save_state(state, state_path)
 
 def background_update():
-    try:
-        print("🔍 Έλεγχος για ενημερώσεις...")  # Debug
-        state = load_state()
-        print(f"📜 Τρέχουσα κατάσταση: {state}")  # Debug
-
-        print(f"🔗 Κατέβασμα από: {REMOTE_URL}")  # Debug
-        data = _download_from_gdrive(REMOTE_URL)
-        print(f"✅ Λήψη ολοκληρώθηκε ({len(data)} bytes)")  # Debug
-
-        new_hash = sha256_bytes(data)
-        print(f"🔢 Νέο hash: {new_hash}")  # Debug
-
-        if (not REMOTE_CORE.exists()) or (new_hash != state.get("sha256")):
-            print("🔄 Βρέθηκε νέα έκδοση!")  # Debug
-            REMOTE_CORE.write_bytes(data)
-            save_state({"sha256": new_hash, "updated_at": time.strftime("%Y-%m-%d %H:%M:%S")})
-        else:
-            print("⏩ Χωρίς αλλαγές.")  # Debug
-    except Exception as e:
-        print(f"❌ Σφάλμα: {e}")  # Debug
+    # Ο έλεγχος/η αποτυχία καταγράφονται στο update_state.json· το UI δεν επηρεάζεται ποτέ
+    try: check_for_update()
+    except Exception: pass
+
+CORE_NAME = "PeRGio_Clicker_core"
+# Μέσα στο exe (datas του spec, στο sys._MEIPASS) ή δίπλα στον launcher (εγκατάσταση από source)
+BUNDLED_CORE = (Path(sys._MEIPASS) if getattr(sys, "frozen", False) else APP_DIR) / (CORE_NAME + ".py")
+CODE_CACHE = UPD_DIR / "__pycache__"
+CACHE_KEEP = 3  # compiled cores στο cache: remote και bundled εναλλάξ (π.χ. μετά από rollback) δεν ξανακάνουν compile
+GUI_DEPS = ("customtkinter", "pyautogui", "keyboard")  # για core που δεν δηλώνει τα δικά του GUI_DEPS
+
+class CoreLoader:
+    """Φορτώνει το νεότερο επαληθευμένο core ως κανονικό module (sys.modules[CORE_NAME]):
+    1. updates/PeRGio_Clicker_core.py, αν το SHA-256 του ταιριάζει με αυτό που κατέγραψε ο updater,
+    2. το core δίπλα στον launcher,
+    3. αλλιώς None, και ο launcher τρέχει το embedded core.
+    Ένα core χωρίς main(), ή (για το GUI) με modules που λείπουν από αυτό το περιβάλλον, παραλείπεται:
+    αλλιώς το exe (console=False) θα τερμάτιζε χωρίς να ανοίξει παράθυρο και χωρίς μήνυμα.
+    Ο compiled κώδικας κρατιέται ως marshal στο updates/__pycache__ με κλειδί το SHA-256 του source,
+    οπότε κάθε επόμενη εκκίνηση με το ίδιο core δεν κάνει compile. Μένουν τα CACHE_KEEP πιο πρόσφατα."""
+
+    def __init__(self, remote=REMOTE_CORE, bundled=BUNDLED_CORE, state_path=STATE_PATH, cache_dir=CODE_CACHE):
+        self.remote, self.bundled, self.state_path, self.cache_dir = remote, bundled, state_path, cache_dir
+        self.sha = None; self.path = None
+        self._seen = None  # (mtime_ns, size) του remote στον τελευταίο έλεγχο του newer_available
+        self._pending = False  # μένει True μέχρι το επόμενο load(), όσο κι αν αργήσει το idle σημείο
+
+    def _verified_remote(self):
+        """SHA-256 του remote core αν υπάρχει και ταιριάζει με το state, αλλιώς None."""
+        want = load_state(self.state_path).get("sha256")
+        if not want or not self.remote.exists(): return None
+        try: return want if sha256_file(self.remote) == want else None
+        except OSError: return None
+
+    def _code(self, path, sha):
+        import marshal
+        cache = self.cache_dir / f"core-{sha[:32]}.{sys.implementation.cache_tag}.bin"
+        try: return marshal.loads(cache.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError): pass
+        code = compile(path.read_bytes(), str(path), "exec")
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            tmp = cache.with_name(cache.name + ".tmp")
+            tmp.write_bytes(marshal.dumps(code)); os.replace(tmp, cache)
+        except OSError: return code
+        self._prune(cache)
+        return code
+
+    def _prune(self, keep):
+        """Σβήνει τα παλαιότερα entries πέρα από τα CACHE_KEEP (το keep, που μόλις γράφτηκε, μένει πάντα)."""
+        entries = []
+        for p in self.cache_dir.glob("core-*.bin"):
+            try: entries.append((p.stat().st_mtime_ns, p))
+            except OSError: pass
+        entries.sort(reverse=True)
+        for _, p in [e for e in entries if e[1] != keep][CACHE_KEEP - 1:]:
+            try: p.unlink()
+            except OSError: pass
+
+    @staticmethod
+    def _usable(mod, gui):
+        if not callable(getattr(mod, "main", None)): return False  # π.χ. παλιό core που τρέχει μόνο ως script
+        if not gui: return True
+        # find_spec χωρίς import: το core φορτώνει pyautogui/keyboard αργότερα, για γρήγορο πρώτο παράθυρο
+        try: return all(importlib.util.find_spec(m) is not None for m in getattr(mod, "GUI_DEPS", GUI_DEPS))
+        except (ImportError, ValueError): return False
+
+    def load(self, gui=True):
+        """Νέο module από το καλύτερο διαθέσιμο core, ή None αν κανένα δεν φορτώνεται και τρέχει.
+        gui: το core θα ανοίξει το GUI, άρα πρέπει να βρίσκονται και τα GUI_DEPS του."""
+        sha = self._verified_remote()
+        candidates = [(self.remote, sha)] if sha else []
+        if self.bundled.exists():
+            try: candidates.append((self.bundled, sha256_file(self.bundled)))
+            except OSError: pass
+        for path, sha in candidates:
+            try: code = self._code(path, sha)
+            except (OSError, SyntaxError, ValueError): continue
+            mod = types.ModuleType(CORE_NAME)
+            mod.__file__ = str(path)
+            os.environ["PERGIO_APP_DIR"] = str(APP_DIR)  # config/εγγραφές δίπλα στον launcher, όχι στο updates/
+            if str(path.parent) not in sys.path: sys.path.insert(0, str(path.parent))  # workers (spawn) κάνουν import
+            prev = sys.modules.get(CORE_NAME)
+            sys.modules[CORE_NAME] = mod
+            try:
+                exec(code, mod.__dict__)
+                ok = self._usable(mod, gui)
+            except Exception: ok = False
+            if not ok:
+                if prev is None: sys.modules.pop(CORE_NAME, None)
+                else: sys.modules[CORE_NAME] = prev
+                continue
+            self.sha, self.path, self._pending = sha, path, False
+            try: self._seen = self._stat()
+            except OSError: self._seen = None
+            return mod
+        return None
+
+    def _stat(self):
+        st = self.remote.stat()
+        return st.st_mtime_ns, st.st_size
+
+    def newer_available(self):
+        """True αν ο updater έφερε επαληθευμένο core διαφορετικό από το φορτωμένο. Καλείται περιοδικά
+        από το GUI: χωρίς αλλαγή στο αρχείο κοστίζει ένα stat()."""
+        try: st = self._stat()
+        except OSError: return False
+        if st == self._seen: return self._pending
+        sha = self._verified_remote()
+        if sha is None: return self._pending  # μισό/αταίριαστο αρχείο: ξαναελέγχεται στην επόμενη αλλαγή
+        self._seen = st
+        self._pending = sha != self.sha
+        return self._pending
 
 def run_embedded():
     module = types.ModuleType("__main__")
     exec(compile(EMBEDDED_CODE_STR, "<embedded_core>", "exec"), module.__dict__)
 
+def run_core(loader, argv=None):
+    """Τρέχει το core και, όσο το GUI κλείνει για hot-swap (EXIT_SWAP), φορτώνει το νεότερο στο ίδιο process.
+    Δεν είναι live swap: το νέο core ξεκινάει νέο App από το (flushed) config, χωρίς runs σε εξέλιξη."""
+    import inspect
+    gui = not argv  # με ορίσματα είναι CLI command (run, simulate, ...) που δεν χρειάζεται τα GUI modules
+    mod = loader.load(gui)
+    if mod is None: return run_embedded()
+    while True:
+        swap = "swap_ready" in inspect.signature(mod.main).parameters
+        rc = mod.main(argv, swap_ready=loader.newer_available) if swap else mod.main(argv)
+        if not swap or rc != getattr(mod, "EXIT_SWAP", None): return rc
+        mod = loader.load(gui) or mod
+
 def main():
     threading.Thread(target=background_update, daemon=True).start()
-    run_embedded()
+    return run_core(CoreLoader(), sys.argv[1:])
 
 if __name__ == "__main__":
-    main()
+    if getattr(sys, "frozen", False):
+        import multiprocessing; multiprocessing.freeze_support()
+    sys.exit(main())
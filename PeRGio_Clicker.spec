@@ -1,12 +1,21 @@
 # -*- mode: python ; coding: utf-8 -*-
 
 
+# Ο launcher φορτώνει το PeRGio_Clicker_core.py (το bundled ή το κατεβασμένο στο updates/) με exec, οπότε
+# το Analysis δεν βλέπει τα imports του: ό,τι χρειάζεται το core πρέπει να δηλωθεί εδώ.
+core_imports = [
+    'customtkinter', 'keyboard', 'mouse', 'numpy', 'PIL.Image',
+    'tkinter.simpledialog', 'tkinter.filedialog',
+    'sqlite3', 'mmap', 'ctypes.util', 'argparse', 'signal', 'http.server',
+    'concurrent.futures', 'multiprocessing.shared_memory',
+]
+
 a = Analysis(
     ['PeRGio_Clicker.py'],
     pathex=[],
     binaries=[],
-    datas=[('coords_minutes.json', '.'), ('icon.ico', '.')],
-    hiddenimports=['tkinter', 'tkinter.messagebox', 'pyautogui', 'requests'],
+    datas=[('coords_minutes.json', '.'), ('icon.ico', '.'), ('PeRGio_Clicker_core.py', '.')],
+    hiddenimports=['tkinter', 'tkinter.messagebox', 'pyautogui', 'requests'] + core_imports,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
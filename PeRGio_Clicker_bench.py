@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PeRGio Clicker — Benchmarks
+- startup: χρόνος import (-X importtime) του core, του launcher και των GUI modules, και
+  (αν υπάρχει οθόνη) time-to-first-window, σε σύγκριση με STARTUP_BUDGET_MS.
+- engine: κόστος compile/trajectory, overhead του _humanized_click και ενός πραγματικού run
+  (drift/dispatch ανά κύκλο), με το recording backend αντί για pyautogui (τρέχει headless).
+- scheduler: wake-up jitter του Scheduler και stop latency ενός run.
+- config: load/save/reload_if_changed του JSON Config και του SqliteConfig σε 1/100/10000
+  profiles και points.
+- updater: throughput του hashing του launcher και check_for_update (200 και 304) απέναντι σε
+  τοπικό http.server.
+Τα αποτελέσματα βγαίνουν ως JSON (stdout ή --out) για σύγκριση ανάμεσα σε εκδόσεις.
+Exit code 1 αν κάποια μέτρηση ξεπεράσει το budget της.
+"""
+import argparse, json, os, platform, random, shutil, statistics, subprocess, sys, tempfile, threading, time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+TREE = ["PeRGio_Clicker.py", "PeRGio_Clicker_core.py"]
+
+STARTUP_BUDGET_MS = {
+    "core_import": 30,       # import PeRGio_Clicker_core (χωρίς GUI, χωρίς pyautogui)
+    "launcher_import": 30,   # import PeRGio_Clicker
+    "gui_load": 300,         # core + tkinter/customtkinter + ορισμός App
+    "first_window": 1000,    # από το spawn του process μέχρι το πρώτο σχεδιασμένο παράθυρο
+}
+
+def _env():
+    # Όπως σε κανονικό launch: με .pyc cache, ακόμα κι αν το shell έχει PYTHONDONTWRITEBYTECODE
+    env = dict(os.environ); env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+def _sandbox():
+    """Αντίγραφο των αρχείων σε temp dir, ώστε τα μετρούμενα processes να μη γράφουν config/updates στο repo."""
+    d = Path(tempfile.mkdtemp(prefix="pergio_bench_"))
+    for name in TREE: shutil.copy2(HERE / name, d / name)
+    return d
+
+MARK = "--pergio-bench--"
+
+def parse_importtime(stderr):
+    """(συνολικά ms των top-level imports μετά το MARK, [(module, self_ms)] ταξινομημένα κατά self time).
+    Ό,τι φορτώθηκε πριν το MARK (site, .pth αρχεία) δεν ανήκει στη μέτρηση."""
+    total_us, mods = 0, []
+    lines = stderr.splitlines()
+    if MARK in lines: lines = lines[lines.index(MARK) + 1:]
+    for line in lines:
+        if not line.startswith("import time:") or "[us]" in line: continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        mods.append((name.strip(), int(self_us) / 1000))
+        if not name.startswith("  "): total_us += int(cum_us)  # χωρίς εσοχή = top-level import
+    mods.sort(key=lambda m: -m[1])
+    return total_us / 1000, mods
+
+def importtime(stmt, cwd, runs):
+    samples, top = [], []
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import sys; sys.stderr.write({MARK!r} + '\\n'); {stmt}"]
+    subprocess.run(cmd, cwd=cwd, env=_env(), capture_output=True)  # warm-up: γράφει τα .pyc, όπως σε κάθε επόμενο launch
+    for _ in range(runs):
+        p = subprocess.run(cmd, cwd=cwd, env=_env(), capture_output=True, text=True)
+        if p.returncode != 0: raise RuntimeError(p.stderr.strip().splitlines()[-1])
+        ms, mods = parse_importtime(p.stderr)
+        samples.append(ms); top = mods[:8]
+    return {"ms": statistics.median(samples), "min_ms": min(samples), "runs": runs,
+            "top": [{"module": m, "self_ms": round(t, 3)} for m, t in top]}
+
+def first_window(cwd, runs):
+    code = ("import PeRGio_Clicker_core as c; c._load_gui(); a = c.App(); a.update(); "
+            "import sys; sys.stdout.write('ready\\n'); sys.stdout.flush(); a.on_close()")
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        p = subprocess.Popen([sys.executable, "-c", code], cwd=cwd, env=_env(), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        line = p.stdout.readline()
+        samples.append((time.perf_counter() - t0) * 1000)
+        p.wait()
+        if line.strip() != "ready": raise RuntimeError("window did not start")
+    return {"ms": statistics.median(samples), "min_ms": min(samples), "runs": runs}
+
+def bench_startup(runs=5):
+    cwd = _sandbox()
+    try:
+        results = {
+            "core_import": importtime("import PeRGio_Clicker_core", cwd, runs),
+            "launcher_import": importtime("import PeRGio_Clicker", cwd, runs),
+            "gui_load": importtime("import PeRGio_Clicker_core as c; c._load_gui()", cwd, runs),
+        }
+        if os.name == "nt" or os.environ.get("DISPLAY") or sys.platform == "darwin":
+            try: results["first_window"] = first_window(cwd, runs)
+            except Exception as e: results["first_window"] = {"error": str(e)}
+        else:
+            results["first_window"] = {"skipped": "no display"}
+    finally:
+        shutil.rmtree(cwd, ignore_errors=True)
+    for name, r in results.items():
+        if "ms" in r:
+            r["budget_ms"] = STARTUP_BUDGET_MS[name]
+            r["ok"] = r["ms"] <= r["budget_ms"]
+    return results
+
+def _stats(samples, scale=1000.0, unit="ms"):
+    """Σύνοψη δειγμάτων (σε δευτερόλεπτα) στη μονάδα unit."""
+    xs = sorted(v * scale for v in samples)
+    if not xs: return {"n": 0}
+    q = lambda p: xs[min(len(xs) - 1, int(p * len(xs)))]
+    return {"n": len(xs), f"mean_{unit}": round(statistics.fmean(xs), 3), f"p50_{unit}": round(q(0.5), 3),
+            f"p99_{unit}": round(q(0.99), 3), f"max_{unit}": round(xs[-1], 3)}
+
+def _timeit(fn, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter(); fn(); samples.append(time.perf_counter() - t0)
+    return samples
+
+def _core():
+    """Το core in-process: το import δεν φέρνει GUI ούτε pyautogui, και το recording backend δεν αγγίζει ποντίκι."""
+    if str(HERE) not in sys.path: sys.path.insert(0, str(HERE))
+    import PeRGio_Clicker_core as core
+    return core
+
+def _profile(core, points=2, **kw):
+    rng = random.Random(points)
+    prof = dict(core.DEFAULTS, points=[[rng.randrange(1920), rng.randrange(1080)] for _ in range(points)],
+                start_delay_sec=0, backend="recording")
+    prof.update(kw); return prof
+
+def _write_config(core, path, profiles):
+    path.write_text(json.dumps({"current_profile": next(iter(profiles)), "profiles": profiles},
+                               default=core._json_default), encoding="utf-8")
+
+def bench_engine(runs=5):
+    core = _core()
+    d = Path(tempfile.mkdtemp(prefix="pergio_bench_"))
+    try:
+        # interval 0.01 min: ~0.6 s αναμονή ανά κύκλο, χωρίς scroll/jitter ώστε να μετράει μόνο το κλικ
+        _write_config(core, d / "c.json", {"A": _profile(core, 8, interval_minutes=0.01, scroll=0, move_jitter=0)})
+        cfg = core.open_config(d / "c.json")
+        plan = core.RunPlan(cfg.raw_data["profiles"]["A"], name="A")
+        results = {}
+
+        comp = core.PlanCompiler(plan, seed=1); comp.compile(1)  # warm-up (import NumPy)
+        n = 1000
+        results["compile_per_cycle"] = _stats([t / n for t in _timeit(lambda: comp.compile(n), runs)], 1e6, "us")
+
+        rng = random.Random(1)
+        cases = [(rng.randrange(1920), rng.randrange(1080), rng.randrange(1920), rng.randrange(1080), rng.uniform(0.1, 0.5)) for _ in range(1000)]
+        def paths():
+            cache = core.TrajectoryCache()
+            for x0, y0, x1, y1, dur in cases: cache.path(x0, y0, x1, y1, dur, "inout")
+        results["trajectory_per_path"] = _stats([t / len(cases) for t in _timeit(paths, runs)], 1e6, "us")
+
+        # _humanized_click: πραγματικός χρόνος μείον τον προγραμματισμένο (t του τελευταίου step)
+        mgr = core.RunManager(cfg)
+        eng = core.ClickEngine(mgr, "A"); eng.backend = core.RecordingBackend()
+        over = []
+        for cy in core.PlanCompiler(plan, seed=2).compile(max(5, runs * 2)):
+            t0 = time.monotonic(); eng._humanized_click(cy.click)
+            over.append(time.monotonic() - t0 - cy.click[-1].t)
+        results["humanized_click_overhead"] = _stats(over)
+
+        # Ολόκληρο run μέσω RunManager (scheduler + arbiter): drift και dispatch από τα metrics του run
+        run = mgr.start("A")
+        deadline = time.monotonic() + 30
+        while run.metrics.clicks.value < runs and time.monotonic() < deadline: time.sleep(0.05)
+        mgr.shutdown(); run.wait(1)
+        m = core.METRICS.to_json()["profiles"]["A"]
+        results["run_loop"] = {"cycles": m["clicks"], "drift": run.drift.summary(),
+                               "drift_p99_le_ms": None if m["drift"]["p99"] is None else m["drift"]["p99"] * 1000,
+                               "dispatch_p99_le_ms": None if m["dispatch"]["p99"] is None else m["dispatch"]["p99"] * 1000,
+                               "error": None if run.error is None else str(run.error)}
+        return results
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+def bench_scheduler(runs=5):
+    core = _core()
+    results = {}
+    sched = core.Scheduler()
+    threading.Thread(target=sched.run, daemon=True).start()
+    lags, done = [], threading.Event()
+    count, step = 200, 0.005
+    t0 = time.monotonic() + 0.05
+    for i in range(count):
+        dl = t0 + i * step
+        sched.call_at(dl, lambda dl=dl, last=(i == count - 1): (lags.append(time.monotonic() - dl), last and done.set()))
+    done.wait(count * step + 5); sched.stop()
+    results["wakeup_jitter"] = dict(_stats(lags, 1e6, "us"), spacing_ms=step * 1000)
+
+    d = Path(tempfile.mkdtemp(prefix="pergio_bench_"))
+    try:
+        _write_config(core, d / "c.json", {"A": _profile(core, 4, interval_minutes=0.01)})
+        mgr = core.RunManager(core.open_config(d / "c.json"))
+        rng, lat = random.Random(3), []
+        for _ in range(max(5, runs)):
+            run = mgr.start("A")
+            time.sleep(rng.uniform(0.05, 0.5))  # stop σε τυχαίο σημείο (συχνά μέσα σε glide/press)
+            run.stop(); run.wait(2)
+            if run.stop_latency is not None: lat.append(run.stop_latency)
+        mgr.shutdown()
+        results["stop_latency"] = _stats(lat)
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+    return results
+
+def bench_config(runs=5, sizes=(1, 100, 10000)):
+    core = _core()
+    results = {}
+    d = Path(tempfile.mkdtemp(prefix="pergio_bench_"))
+    try:
+        for axis in ("profiles", "points"):
+            for n in sizes:
+                if axis == "profiles": profiles = {f"p{i}": _profile(core, 10) for i in range(n)}
+                else: profiles = {"p0": _profile(core, n)}
+                src = d / f"{axis}_{n}.json"
+                _write_config(core, src, profiles)
+                db = d / f"{axis}_{n}.db"
+                core.SqliteConfig(db, migrate_from=src).flush()
+                for kind, path in (("json", src), ("sqlite", db)):
+                    cfg = core.open_config(path)
+                    r = {"file_kb": round(path.stat().st_size / 1024, 1)}
+                    r["load"] = _stats(_timeit(lambda: core.open_config(path).data, runs))
+                    def save():
+                        cfg.data["interval_minutes"] += 1; cfg.save(); cfg.flush()
+                    r["save"] = _stats(_timeit(save, runs))
+                    r["reload_noop"] = _stats(_timeit(lambda: cfg.reload_if_changed(), runs))
+                    r["reload_forced"] = _stats(_timeit(lambda: cfg.reload_if_changed(force=True), runs))
+                    other, changed = core.open_config(path), []
+                    for _ in range(runs):  # εξωτερική αλλαγή από άλλο instance, μετά reload
+                        other.data["scroll"] -= 1; other.save(); other.flush()
+                        t0 = time.perf_counter(); cfg.reload_if_changed(force=True); changed.append(time.perf_counter() - t0)
+                    r["reload_changed"] = _stats(changed)
+                    results[f"{kind}.{axis}.{n}"] = r
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+    return results
+
+def _core_server(body):
+    """Τοπικός http.server στη θέση του GitHub: σερβίρει το body με ETag/Last-Modified και
+    απαντά 304 σε If-None-Match. Επιστρέφει (server, url, μετρητής αιτημάτων ανά status)."""
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    import hashlib
+    etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+    hits = {}
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            code = 304 if self.headers.get("If-None-Match") == etag else 200
+            hits[code] = hits.get(code, 0) + 1
+            self.send_response(code)
+            self.send_header("ETag", etag); self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", "0" if code == 304 else str(len(body)))
+            self.end_headers()
+            if code == 200: self.wfile.write(body)
+        def log_message(self, *a): pass
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}/PeRGio_Clicker_core.py", hits
+
+def bench_updater(runs=5, size_mb=16):
+    """Hashing (ολόκληρο buffer και streaming από αρχείο) και check_for_update του launcher απέναντι
+    σε τοπικό http.server: πλήρης λήψη (200) και έλεγχος χωρίς αλλαγή (304). Στο sandbox, ώστε
+    το import να μη γράφει updates/ στο repo."""
+    cwd = _sandbox()
+    srv, url, hits = _core_server((HERE / "PeRGio_Clicker_core.py").read_bytes())
+    code = ("import json, os, time, requests, PeRGio_Clicker as L\n"
+            "from pathlib import Path\n"
+            f"data = os.urandom({size_mb} << 20); Path('blob').write_bytes(data); out = {{'bytes': [], 'file': [], 'full': [], 'not_modified': []}}\n"
+            f"for _ in range({runs}):\n"
+            "    t0 = time.perf_counter(); L.sha256_bytes(data); out['bytes'].append(time.perf_counter() - t0)\n"
+            "    t0 = time.perf_counter(); L.sha256_file('blob'); out['file'].append(time.perf_counter() - t0)\n"
+            "s = requests.Session(); dest, st = Path('core.py'), Path('state.json')\n"
+            f"for _ in range({runs}):\n"
+            "    dest.unlink(missing_ok=True); st.unlink(missing_ok=True)\n"
+            f"    t0 = time.perf_counter(); assert L.check_for_update({url!r}, dest, st, session=s) == 'updated'; out['full'].append(time.perf_counter() - t0)\n"
+            f"    t0 = time.perf_counter(); assert L.check_for_update({url!r}, dest, st, session=s) == 'unchanged'; out['not_modified'].append(time.perf_counter() - t0)\n"
+            "print(json.dumps(out))")
+    try:
+        p = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=_env(), capture_output=True, text=True)
+        if p.returncode != 0: return {"updater": {"error": p.stderr.strip().splitlines()[-1]}}
+        samples = json.loads(p.stdout)
+    finally:
+        srv.shutdown(); srv.server_close()
+        shutil.rmtree(cwd, ignore_errors=True)
+    rate = lambda xs: round(size_mb / statistics.median(xs), 1)
+    return {"sha256_bytes": dict(_stats(samples["bytes"]), size_mb=size_mb, mb_per_s=rate(samples["bytes"])),
+            "sha256_file": dict(_stats(samples["file"]), size_mb=size_mb, mb_per_s=rate(samples["file"])),
+            "check_full": _stats(samples["full"]),
+            "check_not_modified": dict(_stats(samples["not_modified"]), responses_304=hits.get(304, 0))}
+
+SUITES = {"startup": bench_startup, "engine": bench_engine, "scheduler": bench_scheduler,
+          "config": bench_config, "updater": bench_updater}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="PeRGio Clicker benchmarks (JSON output)")
+    ap.add_argument("suites", nargs="*", metavar="suite", help=f"{', '.join(sorted(SUITES))} (προεπιλογή: όλα)")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--out", help="αρχείο JSON (προεπιλογή: stdout)")
+    args = ap.parse_args(argv)
+    unknown = [s for s in args.suites if s not in SUITES]
+    if unknown: ap.error(f"unknown suite(s): {', '.join(unknown)} (choose from {', '.join(sorted(SUITES))})")
+
+    report = {"python": platform.python_version(), "platform": platform.platform(),
+              "time": time.strftime("%Y-%m-%d %H:%M:%S"), "suites": {}}
+    for name in args.suites or sorted(SUITES):
+        report["suites"][name] = SUITES[name](runs=args.runs)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out: Path(args.out).write_text(text, encoding="utf-8")
+    else: print(text)
+    over = [f"{s}.{k}" for s, res in report["suites"].items() for k, r in res.items() if r.get("ok") is False]
+    if over: print(f"over budget: {', '.join(over)}", file=sys.stderr)
+    return 1 if over else 0
+
+if __name__ == "__main__": sys.exit(main())
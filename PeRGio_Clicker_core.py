@@ -3,32 +3,50 @@
 """
 PeRGio Clicker — Core App (V3.0 - Profiles, Sequences, Click Types, Hotkeys)
 """
-import json, os, random, threading, time, sys
+import json, os, random, threading, time, sys, heapq, itertools, math, zlib, hashlib, select, struct, base64, queue, bisect, contextlib
+from abc import ABC, abstractmethod
+from array import array
+from collections import namedtuple, OrderedDict
+from collections.abc import MutableMapping
 from pathlib import Path
-import tkinter as tk
 
-# ---------- AUTO-INSTALL DEPENDENCIES ----------
-import importlib.util, subprocess
-def _ensure(pkg):
-    if importlib.util.find_spec(pkg) is None:
-        try: subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
-        except Exception: pass
+# ---------- DEPENDENCIES ----------
+# Κανένα pip/subprocess στην εκκίνηση: μόνο find_spec (χωρίς import), και τα βαριά modules
+# φορτώνονται όταν χρειαστούν: tkinter/customtkinter από το _load_gui(), keyboard αφού φανεί
+# το παράθυρο, pyautogui στο πρώτο κλικ, NumPy στο πρώτο compile. Το pyautogui φέρνει μαζί του
+# tkinter μέσω pymsgbox/mouseinfo· τα headless commands τα μπλοκάρουν με _headless(), οπότε
+# το `run` δεν αγγίζει ποτέ GUI modules.
+import importlib.util
+def missing_deps(*pkgs):
+    return [p for p in pkgs if importlib.util.find_spec(p) is None]
 
-_ensure("pyautogui")
-_ensure("customtkinter")
-_ensure("keyboard")
+GUI_DEPS = ("customtkinter", "pyautogui", "keyboard")  # ο launcher τα ελέγχει πριν τρέξει αυτό το core ως GUI
 
-import pyautogui
-import customtkinter as ctk
-import keyboard
-from tkinter import messagebox, simpledialog
+pyautogui = None
+def _pyautogui():
+    global pyautogui
+    if pyautogui is None:
+        import pyautogui as m
+        m.FAILSAFE = False
+        pyautogui = m
+    return pyautogui
 
-pyautogui.FAILSAFE = False
+def _headless():
+    """pymsgbox/mouseinfo χρειάζονται μόνο για alert()/mouseInfo(): με None στο sys.modules το import
+    τους δίνει ImportError, που το pyautogui πιάνει, και το tkinter δεν φορτώνεται ποτέ."""
+    for m in ("pymsgbox", "mouseinfo"):
+        if m not in sys.modules: sys.modules[m] = None
 
 # Paths
-APP_DIR = Path(sys.executable).resolve().parent if getattr(sys, "frozen", False) else Path(__file__).resolve().parent
+# PERGIO_APP_DIR: ο launcher φορτώνει το ενημερωμένο core από το updates/, αλλά config/εγγραφές μένουν δίπλα του
+if os.environ.get("PERGIO_APP_DIR"): APP_DIR = Path(os.environ["PERGIO_APP_DIR"])
+else: APP_DIR = Path(sys.executable).resolve().parent if getattr(sys, "frozen", False) else Path(__file__).resolve().parent
+EXIT_SWAP = 75  # main() -> launcher: το παράθυρο έκλεισε για να φορτωθεί νεότερο core στο ίδιο process
 CONFIG_PATH = APP_DIR / "coords_minutes.json"
+DB_PATH = APP_DIR / "coords_minutes.db"  # αν υπάρχει, χρησιμοποιείται αντί για το JSON
 ICON_PATH = APP_DIR / "icon.ico"
+REC_DIR = APP_DIR / "recordings"  # εγγραφές μακροεντολών (.pgrec)
+TEMPLATE_DIR = APP_DIR / "templates"  # εικόνες-στόχοι (σχετικά paths των profiles)
 
 DEFAULTS = {
     "points": [],
@@ -37,41 +55,269 @@ DEFAULTS = {
     "scroll": -100, 
     "move_jitter": 15, 
     "start_delay_sec": 5,
-    "click_type": "Αριστερό" # Αριστερό, Δεξί, Διπλό
+    "click_type": "Αριστερό", # Αριστερό, Δεξί, Διπλό
+    "order": "as_recorded", # as_recorded, shortest_path
+    "max_clicks_per_min": 0, # rate limit ανά profile, 0 = χωρίς όριο
+    "backend": "pyautogui", # pyautogui, xtest (Linux/X11), recording (χωρίς πραγματική είσοδο)
+    "seed": None, # None = νέο τυχαίο seed σε κάθε εκκίνηση, int = αναπαραγώγιμο run
+    "replay": "", # εγγραφή .pgrec (σχετικό path = μέσα στο recordings/): αν οριστεί, το run την αναπαράγει αντί για τα points
+    "replay_speed": 1.0, # >1 συμπίεση, <1 επέκταση χρόνου
+    "replay_loop": False,
+    "replay_tolerance": 2, # px για τη decimation (Ramer–Douglas–Peucker) των κινήσεων, 0 = όλα τα events
+    "replay_humanize": False, # νέα τυχαία offsets/overshoot στα κλικ σε κάθε αναπαραγωγή
+    "target": "points", # points, image: πριν από κάθε κλικ εντοπίζεται το template στην οθόνη
+    "template": "", # εικόνα-στόχος (σχετικό path = μέσα στο templates/)· λίστα = κλικ στην πρώτη που βρεθεί
+    "match_threshold": 0.8, # ελάχιστο NCC για να θεωρηθεί ότι βρέθηκε
+    "search_region": None, # [x, y, w, h] για αναζήτηση μόνο σε μέρος της οθόνης, None = όλη
+    "trigger": "timer", # timer, change, color, stable: κλικ όταν αλλάξει η watch_region αντί για interval
+    "watch_region": None, # [x, y, w, h] η περιοχή που παρακολουθείται (όσο μικρότερη, τόσο φθηνότερο το poll)
+    "watch_color": "", # "#rrggbb" για trigger color
+    "color_tolerance": 10, # ± ανά κανάλι RGB
+    "stable_ms": 500 # trigger stable: πόση ώρα πρέπει να μείνει ίδια η περιοχή μετά από αλλαγή
 }
 
-# --- TOOLTIP CLASS ---
-class ToolTip:
-    def __init__(self, widget, text):
-        self.widget = widget
-        self.text = text
-        self.tip_window = None
-        self.widget.bind("<Enter>", self.show_tip)
-        self.widget.bind("<Leave>", self.hide_tip)
-
-    def show_tip(self, event=None):
-        if self.tip_window or not self.text: return
-        x, y, _cx, cy = self.widget.bbox("insert")
-        x = x + self.widget.winfo_rootx() + 25
-        y = y + cy + self.widget.winfo_rooty() + 25
-        self.tip_window = tw = tk.Toplevel(self.widget)
-        tw.wm_overrideredirect(True)
-        tw.attributes("-topmost", True)
-        tw.wm_geometry(f"+{x}+{y}")
-        label = tk.Label(tw, text=self.text, justify='left',
-                         background="#ffffe0", relief='solid', borderwidth=1,
-                         font=("tahoma", "9", "normal"), padx=5, pady=2)
-        label.pack(ipadx=1)
-
-    def hide_tip(self, event=None):
-        tw = self.tip_window
-        self.tip_window = None
-        if tw: tw.destroy()
+ORDER_LABELS = {"as_recorded": "Όπως καταγράφηκαν", "shortest_path": "Συντομότερη διαδρομή"}
+TARGET_LABELS = {"points": "Σημεία", "image": "Εικόνα"}
+TRIGGER_LABELS = {"timer": "Χρονόμετρο", "change": "Αλλαγή περιοχής", "color": "Εμφάνιση χρώματος", "stable": "Σταθεροποίηση"}
+
+# ---------- POINTS ----------
+class Point:
+    """Ελαφριά όψη ενός σημείου μέσα σε PointSet (χωρίς dict ανά σημείο). Υποστηρίζει και p["x"]."""
+    __slots__ = ("_ps", "_i")
+
+    def __init__(self, ps, i):
+        self._ps = ps; self._i = i
+
+    @property
+    def x(self): return self._ps._x[self._i]
+
+    @property
+    def y(self): return self._ps._y[self._i]
+
+    @property
+    def attrs(self): return self._ps._attrs.get(self._i, {})
+
+    def __getitem__(self, key):
+        if key == "x": return self._ps._x[self._i]
+        if key == "y": return self._ps._y[self._i]
+        return self.attrs[key]
+
+    def get(self, key, default=None):
+        try: return self[key]
+        except KeyError: return default
+
+    def __repr__(self): return f"Point({self.x}, {self.y})"
+
+class PointSet:
+    """Συντεταγμένες σε array('i') (x και y χωριστά) με προαιρετικά attributes ανά σημείο και
+    grid index (spatial hash) για nearest/duplicate/region queries. Στο JSON γράφεται ως λίστα
+    από {"x", "y"} όταν είναι μικρό, αλλιώς σε compact base64 μορφή (COMPACT_MIN και πάνω)."""
+    CELL = 32  # μέγεθος κελιού του grid σε px
+    COMPACT_MIN = 64
+
+    def __init__(self, xs=(), ys=(), attrs=None):
+        self._x = array('i', xs); self._y = array('i', ys)
+        self._attrs = attrs or {}  # index -> dict, μόνο για όσα σημεία έχουν
+        self._grid = None
+
+    @classmethod
+    def from_json(cls, obj):
+        if isinstance(obj, PointSet): return obj
+        if isinstance(obj, dict) and obj.get("enc") == "i32le-b64":
+            ps = cls()
+            ps._x.frombytes(base64.b64decode(obj["x"])); ps._y.frombytes(base64.b64decode(obj["y"]))
+            if sys.byteorder == "big": ps._x.byteswap(); ps._y.byteswap()
+            ps._attrs = {int(k): v for k, v in obj.get("attrs", {}).items()}
+            return ps
+        ps = cls()
+        for p in obj or (): ps.append(p)
+        return ps
+
+    def to_json(self):
+        if len(self) < self.COMPACT_MIN:
+            return [{"x": x, "y": y, **self._attrs.get(i, {})} for i, (x, y) in enumerate(self.coords())]
+        xs, ys = array('i', self._x), array('i', self._y)
+        if sys.byteorder == "big": xs.byteswap(); ys.byteswap()
+        out = {"enc": "i32le-b64", "x": base64.b64encode(xs.tobytes()).decode("ascii"),
+               "y": base64.b64encode(ys.tobytes()).decode("ascii")}
+        if self._attrs: out["attrs"] = {str(k): v for k, v in self._attrs.items()}
+        return out
+
+    def __len__(self): return len(self._x)
+    def __bool__(self): return len(self._x) > 0
+    def __iter__(self): return (Point(self, i) for i in range(len(self._x)))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice): return [Point(self, k) for k in range(*i.indices(len(self)))]
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError(i)
+        return Point(self, i)
+
+    def __delitem__(self, i):
+        if i < 0: i += len(self)
+        del self._x[i]; del self._y[i]
+        self._attrs = {(k if k < i else k - 1): v for k, v in self._attrs.items() if k != i}
+        self._grid = None
+
+    def xy(self, i): return self._x[i], self._y[i]
+    def coords(self): return zip(self._x, self._y)
+
+    def append(self, p, **attrs):
+        """p: dict με x/y (τα υπόλοιπα κλειδιά γίνονται attributes), Point ή (x, y)."""
+        if isinstance(p, Point): x, y, extra = p.x, p.y, dict(p.attrs)
+        elif isinstance(p, dict):
+            x, y = p["x"], p["y"]
+            extra = {k: v for k, v in p.items() if k not in ("x", "y")}
+        else: (x, y), extra = p, {}
+        extra.update(attrs)
+        i = len(self._x)
+        self._x.append(int(x)); self._y.append(int(y))
+        if extra: self._attrs[i] = extra
+        if self._grid is not None: self._grid.setdefault(self._cell(x, y), []).append(i)
+        return i
+
+    def clear(self):
+        del self._x[:]; del self._y[:]
+        self._attrs = {}; self._grid = None
+
+    def set_xy(self, i, x, y):
+        self._x[i] = int(x); self._y[i] = int(y)
+        self._grid = None
+
+    def swap(self, i, j):
+        """Αλλάζει θέση στα σημεία i και j (μαζί με τα attributes τους)."""
+        self._x[i], self._x[j] = self._x[j], self._x[i]
+        self._y[i], self._y[j] = self._y[j], self._y[i]
+        a, b = self._attrs.pop(i, None), self._attrs.pop(j, None)
+        if a is not None: self._attrs[j] = a
+        if b is not None: self._attrs[i] = b
+        self._grid = None
+
+    def digest(self):
+        return hashlib.blake2b(self._x.tobytes() + self._y.tobytes(), digest_size=16).hexdigest()
+
+    # --- spatial index ---
+    def _cell(self, x, y): return x // self.CELL, y // self.CELL
+
+    def _index(self):
+        if self._grid is None:
+            g = {}; c = self.CELL
+            for i, (x, y) in enumerate(zip(self._x, self._y)):
+                g.setdefault((x // c, y // c), []).append(i)
+            self._grid = g
+        return self._grid
+
+    def nearest(self, x, y, max_dist=None):
+        """(index, απόσταση) του πλησιέστερου σημείου, ή None. Ψάχνει σε δακτυλίους κελιών γύρω από το (x, y)."""
+        g = self._index()
+        if not g: return None
+        cx, cy = self._cell(x, y)
+        span = max(max(abs(kx - cx), abs(ky - cy)) for kx, ky in g) if max_dist is None else int(max_dist // self.CELL) + 1
+        best, best_d = None, float("inf")
+        for r in range(span + 1):
+            # Κανένα σημείο σε δακτύλιο r δεν απέχει λιγότερο από (r - 1) * CELL
+            if (r - 1) * self.CELL > best_d: break
+            for kx in range(cx - r, cx + r + 1):
+                for ky in ((cy - r, cy + r) if abs(kx - cx) != r else range(cy - r, cy + r + 1)):
+                    for i in g.get((kx, ky), ()):
+                        d = math.hypot(self._x[i] - x, self._y[i] - y)
+                        if d < best_d: best, best_d = i, d
+        if best is None or (max_dist is not None and best_d > max_dist): return None
+        return best, best_d
+
+    def find_duplicate(self, x, y, tol=5):
+        hit = self.nearest(x, y, max_dist=tol)
+        return hit[0] if hit else None
+
+    def region(self, x0, y0, x1, y1):
+        """Indices των σημείων μέσα στο ορθογώνιο (κλειστά όρια), σε σειρά εισαγωγής."""
+        g = self._index(); c = self.CELL
+        out = []
+        for kx in range(min(x0, x1) // c, max(x0, x1) // c + 1):
+            for ky in range(min(y0, y1) // c, max(y0, y1) // c + 1):
+                for i in g.get((kx, ky), ()):
+                    if min(x0, x1) <= self._x[i] <= max(x0, x1) and min(y0, y1) <= self._y[i] <= max(y0, y1): out.append(i)
+        return sorted(out)
+
+# ---------- POINT ORDERING ----------
+Route = namedtuple("Route", "order before after")  # before/after: μήκος κλειστής διαδρομής σε px
+
+def _tour_length(xs, ys, order):
+    n = len(order)
+    return sum(math.hypot(xs[order[i]] - xs[order[i - 1]], ys[order[i]] - ys[order[i - 1]]) for i in range(n)) if n > 1 else 0.0
+
+def _nearest_neighbour(xs, ys):
+    n = len(xs)
+    np = _numpy()
+    if np is not None:
+        ax, ay = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        left = np.ones(n, dtype=bool); left[0] = False
+        order = [0]; cur = 0
+        for _ in range(n - 1):
+            d = np.where(left, (ax - ax[cur]) ** 2 + (ay - ay[cur]) ** 2, np.inf)
+            cur = int(d.argmin()); left[cur] = False; order.append(cur)
+        return order
+    left = set(range(1, n)); order = [0]; cur = 0
+    while left:
+        cx, cy = xs[cur], ys[cur]
+        cur = min(left, key=lambda j: (xs[j] - cx) ** 2 + (ys[j] - cy) ** 2)
+        left.discard(cur); order.append(cur)
+    return order
+
+def _two_opt(xs, ys, order, deadline):
+    """2-opt πάνω σε κλειστή διαδρομή μέχρι να μη βρίσκεται βελτίωση ή να λήξει το deadline."""
+    n = len(order)
+    d = lambda a, b: math.hypot(xs[a] - xs[b], ys[a] - ys[b])
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = False
+        for i in range(n - 1):
+            a, b = order[i], order[i + 1]
+            for j in range(i + 2, n if i else n - 1):
+                c, e = order[j], order[(j + 1) % n]
+                if d(a, c) + d(b, e) < d(a, b) + d(c, e) - 1e-9:
+                    order[i + 1:j + 1] = order[i + 1:j + 1][::-1]
+                    a, b = order[i], order[i + 1]
+                    improved = True
+            if time.monotonic() >= deadline: break
+    return order
+
+_ROUTES = OrderedDict()
+
+def shortest_route(ps, budget=2.0):
+    """Σειρά επίσκεψης (nearest-neighbour + 2-opt) που ελαχιστοποιεί τη συνολική μετακίνηση ανά
+    κύκλο, ξεκινώντας πάντα από το πρώτο σημείο. Cache ανά digest των σημείων· το 2-opt σταματά
+    μετά από budget δευτερόλεπτα για πολύ μεγάλα profiles."""
+    key = ps.digest()
+    hit = _ROUTES.get(key)
+    if hit is not None:
+        _ROUTES.move_to_end(key); return hit
+    xs, ys = ps._x, ps._y
+    identity = list(range(len(ps)))
+    before = _tour_length(xs, ys, identity)
+    order = _two_opt(xs, ys, _nearest_neighbour(xs, ys), time.monotonic() + budget) if len(ps) > 3 else identity
+    after = _tour_length(xs, ys, order)
+    if after >= before: order, after = identity, before
+    route = _ROUTES[key] = Route(order, before, after)
+    if len(_ROUTES) > 32: _ROUTES.popitem(last=False)
+    return route
+
+def _json_default(o):
+    if isinstance(o, PointSet): return o.to_json()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
 
 class Config:
-    def __init__(self, path: Path):
+    COALESCE = 0.25  # τα save() μέσα σε αυτό το παράθυρο γίνονται μία εγγραφή
+
+    def __init__(self, path: Path, compact=False):
         self.path = path
+        self.compact = compact  # χωρίς indent: μικρότερο αρχείο, γρηγορότερη σειριοποίηση
+        self._dirty = threading.Event()
+        self._io_lock = threading.Lock()
+        self._writer = None
+        self.writes = 0; self.last_error = None
         self._mtime = None
+        self._hash = None  # hash του περιεχομένου που φορτώθηκε/γράφτηκε τελευταίο
         self.raw_data = {"profiles": {"Default": dict(DEFAULTS)}, "current_profile": "Default"}
         self.load()
 
@@ -80,358 +326,3119 @@ class Config:
         cp = self.raw_data.get("current_profile", "Default")
         if cp not in self.raw_data.get("profiles", {}):
             self.raw_data["profiles"][cp] = dict(DEFAULTS)
-        return self.raw_data["profiles"][cp]
-
-    def load(self):
-        if self.path.exists():
-            try: 
-                d = json.loads(self.path.read_text(encoding="utf-8"))
-                # Migration check from old format to new Multiple-Profiles format
-                if "profiles" not in d:
-                    old_profile = dict(DEFAULTS)
-                    old_profile.update(d)
-                    
-                    if "x" in old_profile and "y" in old_profile and old_profile["x"] is not None:
-                        old_profile["points"] = [{"x": old_profile.pop("x"), "y": old_profile.pop("y")}]
-                    elif "points" not in old_profile:
-                        old_profile["points"] = []
-                    
-                    self.raw_data = {"profiles": {"Default": old_profile}, "current_profile": "Default"}
-                else:
-                    self.raw_data = d
-            except Exception: pass
+        prof = self.raw_data["profiles"][cp]
+        if not isinstance(prof.get("points"), PointSet): prof["points"] = PointSet.from_json(prof.get("points"))
+        return prof
+
+    @staticmethod
+    def _digest(raw):
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    @staticmethod
+    def _migrate(d):
+        # Migration check from old format to new Multiple-Profiles format
+        if "profiles" not in d:
+            old_profile = dict(DEFAULTS)
+            old_profile.update(d)
             
+            if "x" in old_profile and "y" in old_profile and old_profile["x"] is not None:
+                old_profile["points"] = [{"x": old_profile.pop("x"), "y": old_profile.pop("y")}]
+            elif "points" not in old_profile:
+                old_profile["points"] = []
+            
+            return {"profiles": {"Default": old_profile}, "current_profile": "Default"}
+        return d
+
+    def _fill_current(self):
         cp = self.raw_data.get("current_profile", "Default")
         if cp not in self.raw_data["profiles"]:
             self.raw_data["profiles"][cp] = dict(DEFAULTS)
         else:
+            prof = self.raw_data["profiles"][cp]
             for k, v in DEFAULTS.items():
-                if k not in self.raw_data["profiles"][cp]:
-                    self.raw_data["profiles"][cp][k] = v
+                if k not in prof:
+                    prof[k] = v
+
+    def load(self, raw=None):
+        if raw is None and self.path.exists():
+            try: raw = self.path.read_bytes()
+            except OSError: raw = None
+        if raw is not None:
+            self._hash = self._digest(raw)
+            try: self.raw_data = self._migrate(json.loads(raw.decode("utf-8")))
+            except Exception: pass
+        self._fill_current()
 
         try: self._mtime = self.path.stat().st_mtime
         except FileNotFoundError: self._mtime = None; self.save()
 
     def save(self):
-        self.path.write_text(json.dumps(self.raw_data, ensure_ascii=False, indent=2), encoding="utf-8")
+        """Σημαδεύει τα δεδομένα ως αλλαγμένα και επιστρέφει αμέσως· η εγγραφή γίνεται από
+        background thread, μία φορά ανά COALESCE όσα save() κι αν έρθουν στο μεταξύ."""
+        self._dirty.set()
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        fails = 0
+        while True:
+            # Το thread δεν τερματίζει ποτέ: αλλιώς κανένα επόμενο save() δεν θα γραφόταν
+            try:
+                self._dirty.wait()
+                time.sleep(self.COALESCE * 2 ** min(fails, 7))  # backoff (έως ~30 sec) όσο η εγγραφή αποτυγχάνει
+                fails = 0 if self.flush() else fails + 1
+            except Exception as e:
+                self.last_error = e; fails += 1
+                print(f"config writer: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def flush(self):
+        """Γράφει αμέσως ό,τι εκκρεμεί (π.χ. στο κλείσιμο της εφαρμογής). Σε αποτυχία επιστρέφει
+        False και η αλλαγή μένει dirty, ώστε να ξαναδοκιμαστεί στο επόμενο coalesce."""
+        with self._io_lock:
+            if not self._dirty.is_set(): return True
+            # clear πριν τη σειριοποίηση: ένα save() που έρχεται στο μεταξύ γράφεται στον επόμενο γύρο
+            self._dirty.clear()
+            try: self._write()
+            except Exception as e:
+                self._dirty.set()
+                if self.last_error is None: print(f"config write failed: {type(e).__name__}: {e}", file=sys.stderr)
+                self.last_error = e
+                return False
+            self.last_error = None
+            return True
+
+    def _write(self):
+        indent = None if self.compact else 2
+        seps = (",", ":") if self.compact else None
+        for attempt in range(3):
+            # το UI thread μπορεί να αλλάζει το raw_data την ώρα της σειριοποίησης
+            try: raw = json.dumps(self.raw_data, ensure_ascii=False, indent=indent, separators=seps, default=_json_default).encode("utf-8"); break
+            except RuntimeError:
+                if attempt == 2: raise
+        # Temp + fsync + os.replace: ένα crash αφήνει είτε το παλιό είτε το νέο αρχείο, ποτέ μισό
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        prev, self._hash = self._hash, self._digest(raw)  # πριν το replace, ώστε ο watcher να το αναγνωρίσει ως δικό μας
+        try:
+            with open(tmp, "wb") as f:
+                f.write(raw); f.flush(); os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            self._hash = prev
+            try: tmp.unlink()
+            except OSError: pass
+            raise
+        self.writes += 1
         try: self._mtime = self.path.stat().st_mtime
         except FileNotFoundError: self._mtime = None
 
-    def reload_if_changed(self):
+    def reload_if_changed(self, force=False):
+        """Φορτώνει ξανά μόνο αν άλλαξε το περιεχόμενο· οι δικές μας εγγραφές (ίδιο hash) αγνοούνται.
+        Χωρίς force, ίδιο mtime σημαίνει "καμία αλλαγή" και το αρχείο δεν διαβάζεται καν."""
         try: m = self.path.stat().st_mtime
         except FileNotFoundError: return False
-        if self._mtime is None or m != self._mtime:
-            self.load(); return True
-        return False
+        if not force and self._mtime is not None and m == self._mtime: return False
+        try: raw = self.path.read_bytes()
+        except OSError: return False
+        self._mtime = m
+        if self._digest(raw) == self._hash: return False
+        self.load(raw); return True
 
-class App(ctk.CTk):
-    def __init__(self):
-        super().__init__()
-        ctk.set_appearance_mode("dark")
-        ctk.set_default_color_theme("blue")
-        self.title("PeRGio Clicker")
-        self.geometry("520x620")
-        
+# ---------- SQLITE STORE ----------
+class SqliteProfiles(MutableMapping):
+    """dict-like πάνω στον πίνακα profiles: κάθε profile διαβάζεται μόνο όταν ζητηθεί και μένει
+    στη μνήμη. Οι διαγραφές/προσθήκες εφαρμόζονται στη βάση στο επόμενο flush."""
+
+    def __init__(self, cfg):
+        self._cfg = cfg
+        self._cache = {}
+        self._digests = {}  # name -> digest όπως είναι στη βάση
+        self._deleted = set()
+
+    def __getitem__(self, name):
+        if name in self._cache: return self._cache[name]
+        if name in self._deleted: raise KeyError(name)
+        prof = self._cfg._fetch(name)
+        if prof is None: raise KeyError(name)
+        self._cache[name] = prof
+        self._digests[name] = SqliteConfig._profile_digest(prof)
+        return prof
+
+    def __setitem__(self, name, prof):
+        self._cache[name] = prof
+        self._deleted.discard(name)
+
+    def __delitem__(self, name):
+        if name not in self: raise KeyError(name)
+        self._cache.pop(name, None)
+        self._deleted.add(name)
+
+    def __contains__(self, name):
+        if name in self._cache: return True
+        return name not in self._deleted and self._cfg._exists(name)
+
+    def __iter__(self):
+        seen = set()
+        for name in self._cfg._names():
+            if name not in self._deleted:
+                seen.add(name); yield name
+        for name in list(self._cache):
+            if name not in seen: yield name
+
+    def __len__(self): return sum(1 for _ in self)
+
+class SqliteConfig(Config):
+    """Ίδιο interface με το Config (raw_data, data, save, flush, reload_if_changed) πάνω σε sqlite3
+    με WAL. Startup διαβάζει μόνο το current_profile, και κάθε flush γράφει μόνο τα profiles που
+    άλλαξαν (σύγκριση digest), ανεξάρτητα από το μέγεθος της βιβλιοθήκης. Τα points αποθηκεύονται
+    ως blob από int32 little-endian (x, y, x, y, ...)."""
+
+    def __init__(self, path: Path, migrate_from=None):
+        import sqlite3
+        self._sqlite = sqlite3
+        self._db_lock = threading.RLock()
+        self._migrate_from = migrate_from
+        self._conn = None
+        self._version = None
+        super().__init__(path)
+
+    def _connect(self):
+        new = not self.path.exists()
+        self._conn = c = self._sqlite.connect(str(self.path), check_same_thread=False)
+        c.execute("PRAGMA journal_mode=WAL")
+        c.execute("PRAGMA synchronous=NORMAL")
+        c.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        c.execute("CREATE TABLE IF NOT EXISTS profiles (name TEXT PRIMARY KEY, settings TEXT NOT NULL, points BLOB)")
+        c.commit()
+        if new and self._migrate_from is not None and Path(self._migrate_from).exists():
+            self.import_json(self._migrate_from)
+
+    def import_json(self, json_path):
+        """Εισαγωγή από coords_minutes.json (και από το παλιό flat format με x/y)."""
+        d = self._migrate(json.loads(Path(json_path).read_text(encoding="utf-8")))
+        with self._db_lock:
+            for name, prof in d.get("profiles", {}).items():
+                self._put(name, prof)
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('current_profile', ?)", (d.get("current_profile", "Default"),))
+            self._conn.commit()
+
+    @staticmethod
+    def _encode_points(ps):
+        a = array('i', itertools.chain.from_iterable(ps.coords()))
+        if sys.byteorder == "big": a.byteswap()
+        return a.tobytes()
+
+    @staticmethod
+    def _decode_points(blob):
+        a = array('i')
+        if blob: a.frombytes(blob)
+        if sys.byteorder == "big": a.byteswap()
+        return PointSet(a[0::2], a[1::2])
+
+    @staticmethod
+    def _profile_digest(prof):
+        return hashlib.blake2b(json.dumps(prof, sort_keys=True, default=_json_default).encode("utf-8"), digest_size=16).digest()
+
+    def _put(self, name, prof):
+        ps = PointSet.from_json(prof.get("points"))
+        settings = {k: v for k, v in prof.items() if k != "points"}
+        if ps._attrs: settings["point_attrs"] = {str(k): v for k, v in ps._attrs.items()}
+        self._conn.execute("INSERT OR REPLACE INTO profiles VALUES (?, ?, ?)",
+                           (name, json.dumps(settings, ensure_ascii=False), self._encode_points(ps)))
+
+    def _fetch(self, name):
+        with self._db_lock:
+            row = self._conn.execute("SELECT settings, points FROM profiles WHERE name = ?", (name,)).fetchone()
+        if row is None: return None
+        prof = json.loads(row[0])
+        ps = prof["points"] = self._decode_points(row[1])
+        ps._attrs = {int(k): v for k, v in prof.pop("point_attrs", {}).items()}
+        return prof
+
+    def _exists(self, name):
+        with self._db_lock:
+            return self._conn.execute("SELECT 1 FROM profiles WHERE name = ?", (name,)).fetchone() is not None
+
+    def _names(self):
+        with self._db_lock:
+            return [r[0] for r in self._conn.execute("SELECT name FROM profiles ORDER BY rowid")]
+
+    def _data_version(self):
+        with self._db_lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self, raw=None):
+        with self._db_lock:
+            if self._conn is None: self._connect()
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'current_profile'").fetchone()
+        self.raw_data = {"profiles": SqliteProfiles(self), "current_profile": row[0] if row else "Default"}
+        self._fill_current()
+        self._version = self._data_version()
+
+    def _write(self):
+        profiles = self.raw_data["profiles"]
+        with self._db_lock:
+            c = self._conn
+            deleted, written = set(profiles._deleted), {}
+            try:
+                for name in deleted:
+                    c.execute("DELETE FROM profiles WHERE name = ?", (name,))
+                for name, prof in list(profiles._cache.items()):
+                    dg = self._profile_digest(prof)
+                    if name in deleted or profiles._digests.get(name) != dg:
+                        self._put(name, prof); written[name] = dg
+                c.execute("INSERT OR REPLACE INTO meta VALUES ('current_profile', ?)", (self.raw_data.get("current_profile", "Default"),))
+                c.commit()
+            except BaseException:
+                c.rollback(); raise  # _deleted/_digests μένουν ως είχαν: το retry ξαναγράφει τα ίδια
+            profiles._deleted -= deleted
+            for name in deleted: profiles._digests.pop(name, None)
+            profiles._digests.update(written)
+            self._version = self._data_version()
+        self.writes += 1
+
+    def reload_if_changed(self, force=False):
+        """Το PRAGMA data_version αλλάζει μόνο όταν κάνει commit άλλη σύνδεση, άρα οι δικές μας
+        εγγραφές δεν προκαλούν reload. Ό,τι περιμένει ακόμα το coalesce γράφεται πριν το reload (μόνο
+        τα profiles που άλλαξαν εδώ), ώστε μια εξωτερική αλλαγή να μην πετάει τοπικές αλλαγές."""
+        v = self._data_version()
+        if v == self._version: return False
+        if not self.flush(): return False  # η εγγραφή απέτυχε: οι τοπικές αλλαγές μένουν, reload αργότερα
+        self.load(); return True
+
+def open_config(path=None):
+    """Config για το path (.db = SqliteConfig). Χωρίς path: το coords_minutes.db αν υπάρχει
+    δίπλα στην εφαρμογή, αλλιώς το coords_minutes.json."""
+    if path is None: path = DB_PATH if DB_PATH.exists() else CONFIG_PATH
+    if path.suffix in (".db", ".sqlite"): return SqliteConfig(path)
+    return Config(path)
+
+# ---------- CONFIG WATCHER ----------
+class ConfigWatcher:
+    """Καλεί το on_change όταν το αρχείο ρυθμίσεων αλλάξει εξωτερικά. Σε Linux με inotify: το thread
+    μπλοκάρει στο select (κανένα wake-up χωρίς αλλαγές) και οι ριπές εγγραφών συγχωνεύονται σε μία
+    κλήση. Αλλού γυρίζει σε stat polling κάθε POLL δευτερόλεπτα."""
+    DEBOUNCE = 0.02  # ησυχία που απαιτείται μετά το τελευταίο event
+    POLL = 2.0
+    # IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE: καλύπτει εγγραφή στη θέση του και atomic replace.
+    # IN_MODIFY μόνο για τα -wal/-journal της SQLite: ένα commit άλλης σύνδεσης γράφει στο -wal
+    # χωρίς να το κλείσει, οπότε δεν βγάζει κανένα από τα υπόλοιπα events
+    IN_MODIFY = 0x2
+    MASK = IN_MODIFY | 0x8 | 0x80 | 0x100
+
+    def __init__(self, cfg, on_change, metrics=None):
+        self.cfg = cfg
+        self.on_change = on_change
+        self.metrics = metrics if metrics is not None else METRICS
+        self._stop = threading.Event()
+        self._pipe = None
+        self.mode = None
+
+    def start(self):
+        fd = self._inotify()
+        self.mode = "inotify" if fd is not None else "poll"
+        target = (lambda: self._run_inotify(fd)) if fd is not None else self._run_poll
+        threading.Thread(target=target, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._pipe:
+            try: os.write(self._pipe[1], b"x")
+            except OSError: pass
+
+    def _inotify(self):
+        if not sys.platform.startswith("linux"): return None
         try:
-            if ICON_PATH.exists(): self.iconbitmap(str(ICON_PATH))
-        except Exception: pass
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+            if fd < 0: return None
+            if libc.inotify_add_watch(fd, os.fsencode(self.cfg.path.parent), self.MASK) < 0:
+                os.close(fd); return None
+        except Exception:
+            return None
+        self._pipe = os.pipe()
+        return fd
+
+    def _names(self, fd):
+        """Τα ονόματα των events που αφορούν το αρχείο: το ίδιο (όχι σε σκέτο IN_MODIFY, δηλαδή όσο
+        γράφεται ακόμα) και τα -wal/-journal της SQLite (σε κάθε event)."""
+        name, names = self.cfg.path.name, set()
+        while True:
+            try: buf = os.read(fd, 65536)
+            except BlockingIOError: return names
+            off = 0
+            while off < len(buf):
+                _wd, mask, _cookie, ln = struct.unpack_from("iIII", buf, off)
+                n = buf[off + 16:off + 16 + ln].rstrip(b"\0").decode("utf-8", "replace")
+                if n.startswith(name + "-") or (n == name and mask != self.IN_MODIFY): names.add(n)
+                off += 16 + ln
+
+    def _run_inotify(self, fd):
+        try:
+            while not self._stop.is_set():
+                r, _, _ = select.select([fd, self._pipe[0]], [], [])
+                if self._pipe[0] in r: break
+                if not self._names(fd): continue
+                # Debounce: περιμένουμε να σταματήσουν τα events πριν διαβάσουμε το αρχείο
+                while select.select([fd, self._pipe[0]], [], [], self.DEBOUNCE)[0]:
+                    if self._stop.is_set(): return
+                    self._names(fd)
+                self.reload(force=True)
+        finally:
+            for f in (fd, *self._pipe):
+                try: os.close(f)
+                except OSError: pass
 
-        self.cfg = Config(CONFIG_PATH)
-        self.running = False; self.watcher_run = True
-
-        self.grid_columnconfigure(0, weight=1)
-        
-        # Header
-        top_frame = ctk.CTkFrame(self, fg_color="transparent")
-        top_frame.pack(fill="x", padx=10, pady=(10, 5))
-        ctk.CTkLabel(top_frame, text="PeRGio Clicker", font=ctk.CTkFont(size=26, weight="bold")).pack(side="left", padx=10)
-        ctk.CTkLabel(top_frame, text="Hotkeys: F6 (Start), F7 (Stop)", font=ctk.CTkFont(size=11), text_color="gray").pack(side="right", padx=10, pady=10)
-
-        # Profiles
-        self.prof_frame = ctk.CTkFrame(self)
-        self.prof_frame.pack(fill="x", padx=20, pady=5)
-        ctk.CTkLabel(self.prof_frame, text="Προφίλ:").pack(side="left", padx=(10,5), pady=10)
-        self.prof_var = ctk.StringVar(value=self.cfg.raw_data["current_profile"])
-        self.prof_menu = ctk.CTkOptionMenu(self.prof_frame, variable=self.prof_var, command=self._change_profile)
-        self.prof_menu.pack(side="left", padx=5)
-        self.prof_menu.configure(values=list(self.cfg.raw_data["profiles"].keys()))
-        
-        ctk.CTkButton(self.prof_frame, text="Νέο", width=50, command=self._new_profile).pack(side="left", padx=5)
-        ctk.CTkButton(self.prof_frame, text="Διαγραφή", width=60, fg_color="#dc3545", hover_color="#c82333", command=self._delete_profile).pack(side="left", padx=5)
-
-        # Points
-        self.points_frame = ctk.CTkFrame(self)
-        self.points_frame.pack(fill="x", padx=20, pady=10)
-        
-        self.points_lbl = ctk.CTkLabel(self.points_frame, text="Σημεία: 0", font=ctk.CTkFont(weight="bold"))
-        self.points_lbl.pack(pady=(10, 5))
-        
-        p_btn_frame = ctk.CTkFrame(self.points_frame, fg_color="transparent")
-        p_btn_frame.pack(pady=(0, 10))
-        btn_add = ctk.CTkButton(p_btn_frame, text="Προσθήκη Σημείου (3s)", width=150, command=self.add_point)
-        btn_add.pack(side="left", padx=5)
-        ToolTip(btn_add, "Πάτησε το, πήγαινε το ποντίκι στο σημείο και περίμενε.\nΜπορείς να προσθέσεις πολλά σημεία το ένα μετά το άλλο.")
-        
-        btn_clear = ctk.CTkButton(p_btn_frame, text="Καθαρισμός", width=80, fg_color="#ffc107", text_color="black", hover_color="#e0a800", command=self.clear_points)
-        btn_clear.pack(side="left", padx=5)
-
-        # Form
-        self.form = ctk.CTkFrame(self)
-        self.form.pack(fill="both", expand=True, padx=20, pady=5)
-
-        # Click Type
-        type_frame = ctk.CTkFrame(self.form, fg_color="transparent")
-        type_frame.pack(fill="x", pady=2)
-        ctk.CTkLabel(type_frame, text="Τύπος Κλικ:", width=170, anchor="e").pack(side="left", padx=5)
-        self.click_type_var = ctk.StringVar(value="Αριστερό")
-        ctk.CTkOptionMenu(type_frame, variable=self.click_type_var, values=["Αριστερό", "Δεξί", "Διπλό"], width=100).pack(side="left", padx=5)
-
-        self.interval_entry = self._add_field("Χρονικό Διάστημα (min):", "Πόση ώρα θα περιμένει το πρόγραμμα ανάμεσα σε κάθε κλικ.")
-        
-        # Random Switch with Tooltip
-        self.rand_frame = ctk.CTkFrame(self.form, fg_color="transparent")
-        self.rand_frame.pack(fill="x", pady=10)
-        self.rand_switch = ctk.CTkSwitch(self.rand_frame, text="Τυχαίο Διάστημα")
-        self.rand_switch.pack(side="left", padx=(60, 5))
-        info_i = ctk.CTkLabel(self.rand_frame, text="(i)", font=ctk.CTkFont(size=12, slant="italic"), text_color="gray")
-        info_i.pack(side="left")
-        ToolTip(info_i, "Αν ενεργοποιηθεί, το κλικ θα γίνεται σε μια τυχαία στιγμή\nαπό 1 δευτερόλεπτο έως το 'Χρονικό Διάστημα' που έβαλες.")
-
-        self.scroll_entry = self._add_field("Scroll:", "Πόσο θα 'ρολάρει' (κυλήσει) η σελίδα ανάμεσα στα κλικ.")
-        self.move_jitter_entry = self._add_field("Τυχαία Μετακίνηση (px):", "Πόσα pixels θα κινείται τυχαία το ποντίκι γύρω από το σημείο.")
-        self.delay_entry = self._add_field("Καθυστέρηση (sec):", "Πόσα δευτερόλεπτα θα περιμένει το πρόγραμμα πριν ξεκινήσει το πρώτο κλικ.")
-
-        self._refresh_form()
-
-        # Action Buttons
-        self.btn_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.btn_frame.pack(fill="x", padx=20, pady=15)
-        self.start_btn = ctk.CTkButton(self.btn_frame, text="ΕΝΑΡΞΗ (F6)", command=self.start, fg_color="#28a745", hover_color="#218838", font=ctk.CTkFont(weight="bold"))
-        self.start_btn.grid(row=0, column=0, padx=(0,5), sticky="ew")
-        self.stop_btn = ctk.CTkButton(self.btn_frame, text="ΠΑΥΣΗ (F7)", command=self.stop, fg_color="#dc3545", hover_color="#c82333", font=ctk.CTkFont(weight="bold"), state="disabled")
-        self.stop_btn.grid(row=0, column=1, padx=(5,0), sticky="ew")
-        self.btn_frame.grid_columnconfigure((0,1), weight=1)
-
-        self.status_bar = ctk.CTkLabel(self, text="Έτοιμο", font=ctk.CTkFont(size=11), text_color="gray")
-        self.status_bar.pack(side="bottom", pady=5)
-
-        # Start background threads
-        threading.Thread(target=self._watcher, daemon=True).start()
-        
-        # Setup Hotkeys
+    def _run_poll(self):
+        while not self._stop.wait(self.POLL):
+            self.reload(force=False)
+
+    def reload(self, force=True):
+        """Διαβάζει ξανά τις ρυθμίσεις και καλεί το on_change αν άλλαξαν· μετράει μόνο τα πραγματικά reloads
+        (ένα reload χωρίς αλλαγή είναι ένα stat/hash και θα αλλοίωνε το histogram)."""
         try:
-            keyboard.add_hotkey('F6', self._hotkey_start)
-            keyboard.add_hotkey('F7', self._hotkey_stop)
+            t0 = time.monotonic()
+            if not self.cfg.reload_if_changed(force=force): return
+            self.metrics.config_reload.observe(time.monotonic() - t0)
+            self.on_change()
         except Exception: pass
-        
-        self.protocol("WM_DELETE_WINDOW", self.on_close)
-
-    def _add_field(self, label_text, tooltip_text):
-        frame = ctk.CTkFrame(self.form, fg_color="transparent")
-        frame.pack(fill="x", pady=2)
-        ctk.CTkLabel(frame, text=label_text, width=170, anchor="e").pack(side="left", padx=5)
-        entry = ctk.CTkEntry(frame, width=70)
-        entry.pack(side="left", padx=5)
-        info = ctk.CTkLabel(frame, text="(i)", font=ctk.CTkFont(size=12, slant="italic"), text_color="gray")
-        info.pack(side="left")
-        ToolTip(info, tooltip_text)
+
+# ---------- SCHEDULER ----------
+class DriftStats:
+    """Καθυστέρηση (actual - scheduled) κάθε εκτέλεσης του Scheduler, σε δευτερόλεπτα."""
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.count = 0; self.total = 0.0; self.max = 0.0; self.last = 0.0
+
+    def record(self, d):
+        self.count += 1; self.total += d; self.last = d
+        if d > self.max: self.max = d
+
+    def summary(self):
+        mean = self.total / self.count if self.count else 0.0
+        return {"count": self.count, "mean_ms": mean * 1000, "max_ms": self.max * 1000, "last_ms": self.last * 1000}
+
+class Scheduler:
+    """Heap απόλυτων deadlines σε time.monotonic(). Το thread κοιμάται σε Event μέχρι
+    το επόμενο deadline (ή ένα νεότερο/stop) αντί να κάνει polling."""
+    SPIN = 0.0015  # το τελευταίο κομμάτι της αναμονής γίνεται με yield για sub-ms ακρίβεια
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self.stopped = threading.Event()
+        self.drift = DriftStats()
+
+    def call_at(self, deadline, fn, *args):
+        entry = [deadline, next(self._seq), fn, args]
+        with self._lock:
+            heapq.heappush(self._heap, entry)
+            first = self._heap[0] is entry
+        if first: self._wake.set()
         return entry
 
-    def _hotkey_start(self):
-        if not self.running: self.after(0, self.start)
-        
-    def _hotkey_stop(self):
-        if self.running: self.after(0, self.stop)
-
-    def _change_profile(self, new_val):
-        self.cfg.raw_data["current_profile"] = new_val
-        self.cfg.save()
-        self._refresh_form()
-
-    def _new_profile(self):
-        name = simpledialog.askstring("Νέο Προφίλ", "Όνομα νέου προφίλ:", parent=self)
-        if name and name.strip():
-            name = name.strip()
-            self.cfg.raw_data["profiles"][name] = dict(DEFAULTS)
-            self.cfg.raw_data["current_profile"] = name
-            self.prof_menu.configure(values=list(self.cfg.raw_data["profiles"].keys()))
-            self.prof_var.set(name)
-            self.cfg.save()
-            self._refresh_form()
+    def call_later(self, delay, fn, *args):
+        return self.call_at(time.monotonic() + max(0.0, delay), fn, *args)
 
-    def _delete_profile(self):
-        cp = self.cfg.raw_data["current_profile"]
-        if cp == "Default":
-            messagebox.showwarning("Προσοχή", "Το Προφίλ 'Default' δεν μπορεί να διαγραφεί.")
-            return
-        if messagebox.askyesno("Επιβεβαίωση", f"Διαγραφή του προφίλ '{cp}';"):
-            del self.cfg.raw_data["profiles"][cp]
-            new_cp = list(self.cfg.raw_data["profiles"].keys())[0]
-            self.cfg.raw_data["current_profile"] = new_cp
-            self.prof_menu.configure(values=list(self.cfg.raw_data["profiles"].keys()))
-            self.prof_var.set(new_cp)
-            self.cfg.save()
-            self._refresh_form()
+    def cancel(self, entry):
+        entry[2] = None  # lazy deletion, αφαιρείται όταν φτάσει στην κορυφή
+
+    def stop(self):
+        self.stopped.set(); self._wake.set()
+
+    def run(self):
+        while not self.stopped.is_set():
+            with self._lock:
+                while self._heap and self._heap[0][2] is None: heapq.heappop(self._heap)
+                entry = self._heap[0] if self._heap else None
+                self._wake.clear()
+            if entry is None:
+                self._wake.wait(); continue
+            remaining = entry[0] - time.monotonic()
+            if remaining > self.SPIN:
+                self._wake.wait(remaining - self.SPIN); continue
+            while time.monotonic() < entry[0]:
+                if self.stopped.is_set(): return
+                time.sleep(0)
+            with self._lock:
+                if not self._heap or self._heap[0] is not entry: continue
+                heapq.heappop(self._heap)
+            fn, args = entry[2], entry[3]
+            if fn is None: continue
+            self.drift.record(time.monotonic() - entry[0])
+            fn(*args)
+
+# ---------- PLAN COMPILER ----------
+_np = None
+def _numpy():
+    """Lazy import του NumPy· None αν δεν είναι εγκατεστημένο."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np or None
+
+class RandomBatch:
+    """Όλες οι τυχαίες τιμές ενός batch βγαίνουν με μία κλήση ανά κατανομή, από ρητό seed.
+    NumPy Generator όταν υπάρχει, αλλιώς random.Random (διαφορετική ακολουθία, ίδιες κατανομές)."""
+
+    def __init__(self, seed):
+        self.seed = seed
+        np = _numpy()
+        self._np = np.random.default_rng(seed) if np else None
+        self._py = None if np else random.Random(seed)
+
+    def uniform(self, lo, hi, n):
+        if self._np is not None: return self._np.uniform(lo, hi, n).tolist()
+        u = self._py.uniform
+        return [u(lo, hi) for _ in range(n)]
+
+    def integers(self, lo, hi, n):
+        """Ακέραιοι στο κλειστό [lo, hi], όπως το random.randint."""
+        if self._np is not None: return self._np.integers(lo, hi + 1, n).tolist()
+        r = self._py.randint
+        return [r(lo, hi) for _ in range(n)]
+
+    def random(self, n):
+        if self._np is not None: return self._np.random(n).tolist()
+        r = self._py.random
+        return [r() for _ in range(n)]
+
+# kind: move/press/release/scroll/jitter. Για move: x, y απόλυτα. Για jitter: x, y σχετικά.
+# Για scroll: y = ποσό. t = offset σε sec από την αρχή του κλικ (click) ή από το τέλος του (after).
+Step = namedtuple("Step", "t kind x y dur button ease", defaults=(0, 0, 0.0, None, None))
+Cycle = namedtuple("Cycle", "index point click wait after")
+
+def _field(profile, key, typ):
+    """Τιμή του profile μετατρεμμένη σε typ· σε λάθος τιμή, η προεπιλογή από το DEFAULTS."""
+    try: return typ(profile.get(key, DEFAULTS[key]))
+    except (TypeError, ValueError): return typ(DEFAULTS[key])
+
+class RunPlan:
+    """Αμετάβλητο, επικυρωμένο snapshot ενός profile για ένα run. Χτίζεται μία φορά (εκτός του
+    hot loop, και η διαδρομή shortest_path μαζί), ώστε ο engine να μην κάνει dict lookups
+    και μια αλλαγή ρυθμίσεων να εφαρμόζεται ολόκληρη σε όριο κύκλου."""
+    __slots__ = ("name", "xs", "ys", "order", "route", "interval_sec", "random_timing", "scroll",
+                 "jitter", "start_delay", "click_type", "button", "backend", "seed", "min_click_gap",
+                 "replay", "replay_speed", "replay_loop", "replay_tolerance", "replay_humanize",
+                 "target", "templates", "match_threshold", "search_region", "watch")
+
+    def __init__(self, profile, name=None):
+        ps = PointSet.from_json(profile.get("points"))
+        replay = profile.get("replay") or None
+        if replay: replay = str(Path(replay) if Path(replay).is_absolute() else REC_DIR / replay)
+        target = "image" if profile.get("target") == "image" else "points"
+        templates = profile.get("template") or ()
+        if isinstance(templates, str): templates = (templates,)
+        templates = tuple(str(Path(t) if Path(t).is_absolute() else TEMPLATE_DIR / t) for t in templates if t)
+        if target == "image":
+            if not templates: raise ValueError("image target without template")
+            ps = PointSet.from_json([(0, 0)])  # τα κλικ γίνονται compile γύρω από το (0, 0) και μεταφέρονται στο match
+        try: region = tuple(int(v) for v in profile["search_region"]) if profile.get("search_region") else None
+        except (TypeError, ValueError): region = None
+        if region is not None and len(region) != 4: region = None
+        if not ps and not replay: raise ValueError("profile has no points")
+        watch = None
+        kind = profile.get("trigger") or "timer"
+        if kind != "timer":
+            if kind not in TRIGGER_KINDS: raise ValueError(f"unknown trigger: {kind}")
+            try: wr = tuple(int(v) for v in profile.get("watch_region") or ())
+            except (TypeError, ValueError): wr = ()
+            if len(wr) != 4 or wr[2] <= 0 or wr[3] <= 0: raise ValueError("trigger without watch_region")
+            color = _parse_color(profile.get("watch_color"))
+            if kind == "color" and color is None: raise ValueError("color trigger without watch_color")
+            watch = WatchSpec(kind, wr, color, max(0, _field(profile, "color_tolerance", int)),
+                              max(0.0, _field(profile, "stable_ms", float)) / 1000)
+        route = shortest_route(ps) if profile.get("order") == "shortest_path" and target == "points" else None
+        click_type = profile.get("click_type", "Αριστερό")
+        try: seed = None if profile.get("seed") is None else int(profile["seed"])
+        except (TypeError, ValueError): seed = None
+        rate = _field(profile, "max_clicks_per_min", float)
+        init = object.__setattr__
+        for k, v in (("name", name), ("xs", tuple(ps._x)), ("ys", tuple(ps._y)),
+                     ("order", tuple(route.order) if route else None), ("route", route),
+                     ("interval_sec", _field(profile, "interval_minutes", float) * 60),
+                     ("random_timing", bool(profile.get("use_random_timing"))),
+                     ("scroll", _field(profile, "scroll", int)), ("jitter", max(0, _field(profile, "move_jitter", int))),
+                     ("start_delay", max(0.0, _field(profile, "start_delay_sec", float))),
+                     ("click_type", click_type), ("button", 'right' if click_type == "Δεξί" else 'left'),
+                     ("backend", profile.get("backend") or "pyautogui"),
+                     ("seed", seed), ("min_click_gap", 60.0 / rate if rate > 0 else 0.0),
+                     ("replay", replay), ("replay_speed", max(0.01, _field(profile, "replay_speed", float))),
+                     ("replay_loop", bool(profile.get("replay_loop"))),
+                     ("replay_tolerance", max(0.0, _field(profile, "replay_tolerance", float))),
+                     ("replay_humanize", bool(profile.get("replay_humanize"))),
+                     ("target", target), ("templates", templates), ("search_region", region), ("watch", watch),
+                     ("match_threshold", min(1.0, max(0.0, _field(profile, "match_threshold", float))))):
+            init(self, k, v)
 
-    def _refresh_points_lbl(self):
-        pts = self.cfg.data.get("points", [])
-        if not pts:
-            self.points_lbl.configure(text="Σημεία: 0 (Κενό)")
+    def __setattr__(self, key, value): raise AttributeError("RunPlan is immutable")
+    def __len__(self): return len(self.xs)
+
+class PlanCompiler:
+    """Μετατρέπει ένα RunPlan σε timeline από Cycle για τους επόμενους N κύκλους.
+    Το hot path απλώς εκτελεί τα έτοιμα Step· οι κατανομές μπορούν να ελεγχθούν offline.
+    Με trigger το κλικ είναι αντίδραση σε γεγονός: μία σύντομη κίνηση κατευθείαν στο σημείο, χωρίς
+    overshoot, και χωρίς scroll/jitter (είναι τοποθετημένα μέσα στην αναμονή του timer)."""
+    REFLEX_MOVE = (0.02, 0.05)     # sec της κίνησης προς το σημείο όταν το κλικ το προκαλεί trigger
+    REFLEX_SETTLE = (0.005, 0.02)  # sec από το τέλος της κίνησης μέχρι το press
+
+    def __init__(self, plan, seed=None, batch=32):
+        if seed is None: seed = plan.seed
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = RandomBatch(self.seed)
+        self.batch = max(1, int(batch))
+        self.plan = plan
+        self._next_index = 0
+        self._buf = []
+
+    def update(self, plan):
+        """Νέο plan από τον επόμενο μη-εκτελεσμένο κύκλο (καλείται από το thread του engine)."""
+        if self._buf: self._next_index = self._buf[0].index
+        self.plan = plan
+        self._buf = []
+
+    def __iter__(self): return self
+
+    def prefetch(self):
+        if not self._buf: self._buf = self.compile(self.batch)
+
+    def __next__(self):
+        self.prefetch()
+        return self._buf.pop(0)
+
+    def compile(self, n):
+        plan = self.plan
+        xs, ys, order = plan.xs, plan.ys, plan.order
+        rng = self.rng
+        start = self._next_index
+        self._next_index += n
+
+        off_x, off_y = rng.integers(-20, 20, n), rng.integers(-20, 20, n)
+        do_over = rng.random(n)
+        ov_x, ov_y = rng.integers(-15, 15, n), rng.integers(-15, 15, n)
+        ov_dur, ov_pause = rng.uniform(0.15, 0.3, n), rng.uniform(0.01, 0.05, n)
+        mv_dur, settle = rng.uniform(0.1, 0.25, n), rng.uniform(0.05, 0.2, n)
+        press1, press2 = rng.uniform(0.03, 0.08, n), rng.uniform(0.03, 0.08, n)
+        dbl_gap, press = rng.uniform(0.05, 0.15, n), rng.uniform(0.03, 0.12, n)
+
+        base = plan.interval_sec
+        if plan.random_timing:
+            waits = rng.uniform(2.0, max(2.0, base), n)
         else:
-            p_strs = [f"({p['x']},{p['y']})" for p in pts]
-            title = f"Σημεία: {len(pts)}"
-            if len(pts) <= 3: title += f" ({', '.join(p_strs)})"
-            else: title += f" ({', '.join(p_strs[:3])}...)"
-            self.points_lbl.configure(text=title)
-
-    def _refresh_form(self):
-        self._refresh_points_lbl()
-        self.interval_entry.delete(0, 'end'); self.interval_entry.insert(0, str(self.cfg.data.get("interval_minutes", 1.0)))
-        self.scroll_entry.delete(0, 'end'); self.scroll_entry.insert(0, str(self.cfg.data.get("scroll", -100)))
-        self.move_jitter_entry.delete(0, 'end'); self.move_jitter_entry.insert(0, str(self.cfg.data.get("move_jitter", 15)))
-        self.delay_entry.delete(0, 'end'); self.delay_entry.insert(0, str(self.cfg.data.get("start_delay_sec", 5)))
-        self.click_type_var.set(self.cfg.data.get("click_type", "Αριστερό"))
-        if self.cfg.data.get("use_random_timing"): self.rand_switch.select()
-        else: self.rand_switch.deselect()
-
-    def _save_form(self):
+            waits = [max(0.2, base) + w for w in rng.uniform(-0.5, 0.5, n)]
+        scroll_amt = plan.scroll
+        scroll_at, scroll_gap = rng.uniform(0.3, 0.6, n), rng.uniform(0.05, 0.15, n)
+        j = plan.jitter
+        jit_at, jit_dur = rng.uniform(0.6, 0.9, n), rng.uniform(0.2, 0.5, n)
+        jit_x, jit_y = rng.integers(-j, j, n), rng.integers(-j, j, n)
+
+        reflex = plan.watch is not None
+        if reflex: mv_dur, settle = rng.uniform(*self.REFLEX_MOVE, n), rng.uniform(*self.REFLEX_SETTLE, n)
+
+        click_type, btn = plan.click_type, plan.button
+        out = []
+        for i in range(n):
+            idx = (start + i) % len(xs)
+            if order: idx = order[idx]
+            tx, ty = xs[idx] + off_x[i], ys[idx] + off_y[i]
+            t = 0.0; click = []
+            if do_over[i] > 0.3 and not reflex:
+                click.append(Step(t, "move", tx + ov_x[i], ty + ov_y[i], ov_dur[i], ease="out"))
+                t += ov_dur[i] + ov_pause[i]
+            click.append(Step(t, "move", tx, ty, mv_dur[i], ease="out" if reflex else "inout"))
+            t += mv_dur[i] + settle[i]
+            if click_type == "Διπλό":
+                click.append(Step(t, "press", button=btn)); t += press1[i]
+                click.append(Step(t, "release", button=btn)); t += dbl_gap[i]
+                click.append(Step(t, "press", button=btn)); t += press2[i]
+                click.append(Step(t, "release", button=btn))
+            else:
+                click.append(Step(t, "press", button=btn)); t += press[i]
+                click.append(Step(t, "release", button=btn))
+
+            wait = waits[i]; after = []
+            if scroll_amt != 0 and not reflex:
+                ts = wait * scroll_at[i]
+                after.append(Step(ts, "scroll", y=scroll_amt // 2))
+                after.append(Step(ts + scroll_gap[i], "scroll", y=scroll_amt - scroll_amt // 2))
+            if j > 0 and not reflex:
+                after.append(Step(wait * jit_at[i], "jitter", jit_x[i], jit_y[i], jit_dur[i], ease="sine"))
+            out.append(Cycle(start + i, idx, tuple(click), wait, tuple(after)))
+        return out
+
+# ---------- TRAJECTORIES ----------
+def _ease(t, ease, cos=math.cos):
+    """Χρονική παραμετροποίηση s(t) στο [0, 1]· δουλεύει και με NumPy arrays (cos=np.cos)."""
+    if ease == "out": return t * (2 - t)
+    if ease == "inout": return t * t * t * (10 - 15 * t + 6 * t * t)  # minimum-jerk
+    if ease == "sine": return 0.5 - 0.5 * cos(math.pi * t)
+    return t
+
+class TrajectoryCache:
+    """Ολόκληρο το path μιας κίνησης υπολογίζεται μαζί. Το κανονικοποιημένο path (από (0,0) σε (1,0),
+    cubic Bezier με ελαφριά καμπύλη + χρονικό profile) μπαίνει σε cache ανά (distance bucket,
+    angle bucket, πλήθος βημάτων, ease) και μόνο περιστρέφεται/κλιμακώνεται/μετατοπίζεται ανά κίνηση."""
+    HZ = 125  # βήματα/δευτερόλεπτο για κινήσεις με διάρκεια
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self.hits = self.misses = 0
+
+    def _key(self, dx, dy, dur, ease):
+        dist = math.hypot(dx, dy)
+        db = int(math.log2(dist) * 2) if dist >= 1 else 0
+        ab = int((math.atan2(dy, dx) + math.pi) / (2 * math.pi) * 16) % 16
+        return db, ab, max(1, int(dur * self.HZ)), ease
+
+    def _normalized(self, key):
+        db, ab, n, ease = key
+        r = random.Random(zlib.crc32(repr(key).encode()))
+        # Η καμπύλη έχει σταθερή φορά ανά κατεύθυνση και μικραίνει σχετικά στις μεγάλες αποστάσεις
+        bow = (1 if ab % 2 else -1) * r.uniform(0.02, 0.09) / (1 + 0.1 * db)
+        c1, c2 = bow * r.uniform(0.6, 1.2), bow * r.uniform(0.6, 1.2)
+        np = _numpy()
+        if np is not None:
+            s = _ease(np.arange(1, n + 1) / n, ease, np.cos)
+            m = 1 - s
+            return s, 3 * m * s * (m * c1 + s * c2)
+        us, vs = [], []
+        for i in range(1, n + 1):
+            t = _ease(i / n, ease); m = 1 - t
+            us.append(t); vs.append(3 * m * t * (m * c1 + t * c2))
+        return us, vs
+
+    def path(self, x0, y0, x1, y1, dur, ease):
+        """Λίστα από ακέραια (x, y), ένα ανά 1/HZ sec· το τελευταίο είναι ακριβώς το (x1, y1)."""
+        dx, dy = x1 - x0, y1 - y0
+        key = self._key(dx, dy, dur, ease)
+        uv = self._cache.get(key)
+        if uv is None:
+            self.misses += 1
+            uv = self._cache[key] = self._normalized(key)
+            if len(self._cache) > self.maxsize: self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        u, v = uv
+        np = _numpy()
+        if np is not None:
+            xs = np.rint(x0 + u * dx - v * dy).astype(int)
+            ys = np.rint(y0 + u * dy + v * dx).astype(int)
+            return list(zip(xs.tolist(), ys.tolist()))
+        return [(round(x0 + a * dx - b * dy), round(y0 + a * dy + b * dx)) for a, b in zip(u, v)]
+
+TRAJECTORIES = TrajectoryCache()
+
+# ---------- INPUT BACKENDS ----------
+# Κάθε κλήση εκτελείται αμέσως (χωρίς PAUSE, tween ή sleeps)· το timing το ορίζει μόνο ο engine.
+# Abstract: ένα backend που ξεχνά κάποια μέθοδο αποτυγχάνει στη δημιουργία του, όχι στη μέση ενός run.
+class InputBackend(ABC):
+    name = "base"
+    @abstractmethod
+    def move_to(self, x, y): ...
+    @abstractmethod
+    def press(self, button): ...
+    @abstractmethod
+    def release(self, button): ...
+    @abstractmethod
+    def scroll(self, amount): ...
+    @abstractmethod
+    def position(self): ...
+    def close(self): pass
+
+    # Οθόνη για image targets: grayscale float32 (H, W) της περιοχής (x, y, w, h) ή όλης της οθόνης
+    def grab(self, region=None):
+        img = _pyautogui().screenshot(region=region)
+        return _numpy().asarray(img.convert("L"), dtype="float32")
+
+    def screen_size(self):
+        w, h = _pyautogui().size()
+        return int(w), int(h)
+
+    # Triggers: grabber μιας σταθερής περιοχής (x, y, w, h), με grab() -> raw bytes
+    def region_grabber(self, region): return open_grabber(region)
+
+class PyAutoGuiBackend(InputBackend):
+    """pyautogui με _pause=False και duration=0: παρακάμπτει το global PAUSE και τα tween sleeps."""
+    name = "pyautogui"
+    def __init__(self): self._pg = _pyautogui()
+    def move_to(self, x, y): self._pg.moveTo(x, y, _pause=False)
+    def press(self, button): self._pg.mouseDown(button=button, _pause=False)
+    def release(self, button): self._pg.mouseUp(button=button, _pause=False)
+    def scroll(self, amount): self._pg.scroll(amount, _pause=False)
+    def position(self):
+        x, y = self._pg.position()
+        return int(x), int(y)
+
+class XTestBackend(InputBackend):
+    """Απευθείας XTest μέσω ctypes (Linux/X11): ένα XFlush ανά ενέργεια, χωρίς Python overhead του pyautogui."""
+    name = "xtest"
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+    def __init__(self):
+        import ctypes, ctypes.util
+        x11, xtst = ctypes.util.find_library("X11"), ctypes.util.find_library("Xtst")
+        if not x11 or not xtst: raise OSError("libX11/libXtst not found")
+        self._ct = ctypes
+        self._x = x = ctypes.CDLL(x11); self._t = t = ctypes.CDLL(xtst)
+        x.XOpenDisplay.restype = ctypes.c_void_p; x.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x.XDefaultRootWindow.restype = ctypes.c_ulong; x.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x.XFlush.argtypes = [ctypes.c_void_p]
+        x.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x.XQueryPointer.argtypes = [ctypes.c_void_p, ctypes.c_ulong] + [ctypes.POINTER(ctypes.c_ulong)] * 2 \
+            + [ctypes.POINTER(ctypes.c_int)] * 4 + [ctypes.POINTER(ctypes.c_uint)]
+        t.XTestFakeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+        t.XTestFakeButtonEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+        self._dpy = x.XOpenDisplay(None)
+        if not self._dpy: raise OSError("cannot open X display")
+        self._root = x.XDefaultRootWindow(self._dpy)
+
+    def _button(self, button, down):
+        self._t.XTestFakeButtonEvent(self._dpy, self.BUTTONS.get(button, 1), 1 if down else 0, 0)
+        self._x.XFlush(self._dpy)
+
+    def move_to(self, x, y):
+        self._t.XTestFakeMotionEvent(self._dpy, -1, int(x), int(y), 0)
+        self._x.XFlush(self._dpy)
+
+    def press(self, button): self._button(button, True)
+    def release(self, button): self._button(button, False)
+
+    def scroll(self, amount):
+        # X11: button 4 = πάνω, 5 = κάτω, ένα press/release ανά "κλικ" ροδέλας (όπως το pyautogui)
+        b = 4 if amount > 0 else 5
+        for _ in range(abs(int(amount))):
+            self._t.XTestFakeButtonEvent(self._dpy, b, 1, 0)
+            self._t.XTestFakeButtonEvent(self._dpy, b, 0, 0)
+        self._x.XFlush(self._dpy)
+
+    def position(self):
+        ct = self._ct
+        w1, w2 = ct.c_ulong(), ct.c_ulong()
+        rx, ry, wx, wy, m = ct.c_int(), ct.c_int(), ct.c_int(), ct.c_int(), ct.c_uint()
+        self._x.XQueryPointer(self._dpy, self._root, ct.byref(w1), ct.byref(w2),
+                              ct.byref(rx), ct.byref(ry), ct.byref(wx), ct.byref(wy), ct.byref(m))
+        return rx.value, ry.value
+
+    def close(self):
+        if self._dpy: self._x.XCloseDisplay(self._dpy); self._dpy = None
+
+class RecordingBackend(InputBackend):
+    """Καταγράφει (t, kind, a, b) στη μνήμη χωρίς να αγγίζει το πραγματικό ποντίκι."""
+    name = "recording"
+
+    def __init__(self, clock=time.monotonic, start=(0, 0), screen=None):
+        self.clock = clock
+        self.x, self.y = start
+        self.held = set()
+        self.events = []
+        self.screen = screen  # προαιρετικός πίνακας (H, W) για image targets χωρίς πραγματική οθόνη
+
+    def move_to(self, x, y):
+        self.x, self.y = int(x), int(y)
+        self.events.append((self.clock(), "move", self.x, self.y))
+
+    def press(self, button):
+        self.held.add(button); self.events.append((self.clock(), "press", button, None))
+
+    def release(self, button):
+        self.held.discard(button); self.events.append((self.clock(), "release", button, None))
+
+    def scroll(self, amount): self.events.append((self.clock(), "scroll", int(amount), None))
+    def position(self): return self.x, self.y
+
+    def grab(self, region=None):
+        if self.screen is None: raise RuntimeError("recording backend has no screen")
+        if region is None: return self.screen
+        x, y, w, h = region
+        return self.screen[y:y + h, x:x + w]
+
+    def screen_size(self):
+        if self.screen is None: raise RuntimeError("recording backend has no screen")
+        return self.screen.shape[1], self.screen.shape[0]
+
+    def region_grabber(self, region):
+        if self.screen is None: raise RuntimeError("recording backend has no screen")
+        return ArrayGrabber(self.screen, region)
+
+BACKENDS = {"pyautogui": PyAutoGuiBackend, "xtest": XTestBackend, "recording": RecordingBackend}
+
+def make_backend(name):
+    """Backend από το όνομα του profile· fallback στο pyautogui αν δεν είναι διαθέσιμο."""
+    cls = BACKENDS.get(name or "pyautogui", PyAutoGuiBackend)
+    if cls is PyAutoGuiBackend: return cls()
+    try: return cls()
+    except Exception: return PyAutoGuiBackend()
+
+# ---------- IMAGE TARGETS ----------
+TEMPLATE_SIDE = 48  # πλευρά (px) της εικόνας-στόχου που τραβάει το κουμπί "Λήψη" του GUI
+
+def load_template(path):
+    """Grayscale float32 πίνακας από αρχείο εικόνας (PIL: έρχεται μαζί με το pyautogui)."""
+    from PIL import Image
+    with Image.open(path) as img:
+        return _numpy().asarray(img.convert("L"), dtype="float32")
+
+def _pool(a):
+    """Ένα επίπεδο της πυραμίδας: μέσος όρος σε μπλοκ 2×2 (τέσσερις strided προσθέσεις, χωρίς reshape/mean)."""
+    h, w = a.shape[0] // 2 * 2, a.shape[1] // 2 * 2
+    out = a[0:h:2, 0:w:2] + a[1:h:2, 0:w:2]
+    out += a[0:h:2, 1:w:2]; out += a[1:h:2, 1:w:2]
+    out *= 0.25
+    return out
+
+class TemplateMatcher:
+    """Normalized cross-correlation με NumPy, coarse-to-fine: πλήρες NCC (μέσω FFT και integral images)
+    μόνο στο πιο χονδρό επίπεδο της πυραμίδας, και σε κάθε λεπτότερο επίπεδο μόνο μικρά παράθυρα
+    γύρω από τους καλύτερους υποψήφιους. Πριν από όλα ελέγχεται η θέση του τελευταίου hit, με grab
+    μόνο μιας μικρής περιοχής γύρω της."""
+    MIN_SIDE = 8    # ελάχιστη πλευρά του template στο πιο χονδρό επίπεδο
+    MAX_LEVELS = 4
+    TOP_K = 5       # υποψήφιοι από το χονδρό επίπεδο
+    REFINE = 2      # ±px αναζήτησης σε κάθε λεπτότερο επίπεδο
+    CACHE_MARGIN = 8  # px γύρω από το τελευταίο hit
+    FLAT = 1.0        # ελάχιστη τυπική απόκλιση (επίπεδα γκρι) μιας περιοχής για να μετρήσει
+
+    def __init__(self, template, threshold=0.8):
+        np = _numpy()
+        if np is None: raise ValueError("image targets need NumPy")
+        t = np.asarray(template, dtype="float32")
+        if min(t.shape) < 4: raise ValueError("template too small")
+        self.threshold = threshold
+        self.h, self.w = t.shape
+        levels = 0
+        while levels < self.MAX_LEVELS and min(t.shape) // (2 ** (levels + 1)) >= self.MIN_SIDE: levels += 1
+        self.levels = [t]
+        for _ in range(levels): self.levels.append(_pool(self.levels[-1]))
+        # Για κάθε επίπεδο: template μείον τον μέσο όρο του και η νόρμα του
+        self._tz = [(lv - lv.mean(), float(np.sqrt(((lv - lv.mean()) ** 2).sum()))) for lv in self.levels]
+        self.last = None  # (x, y) πάνω-αριστερά του τελευταίου hit, σε συντεταγμένες οθόνης
+        self._fft = {}  # shape -> FFT του template του χονδρού επιπέδου (η οθόνη/ROI σπάνια αλλάζει μέγεθος)
+
+    @classmethod
+    def load(cls, path, threshold=0.8): return cls(load_template(path), threshold)
+
+    def _ncc_map(self, img, level):
+        """NCC για όλες τις θέσεις (valid) του template του επιπέδου μέσα στο img."""
+        np = _numpy()
+        tz, tn = self._tz[level]
+        h, w = tz.shape
+        H, W = img.shape
+        if H < h or W < w or tn == 0: return None
+        shape = (H, W)
+        f = img.astype("float64")
+        tf = self._fft.get((level, shape))
+        if tf is None: tf = self._fft[(level, shape)] = np.conj(np.fft.rfft2(tz, shape))
+        corr = np.fft.irfft2(np.fft.rfft2(f) * tf, shape)[:H - h + 1, :W - w + 1]
+        # Τοπικά αθροίσματα των I και I² από integral images (float64 για ακρίβεια), με in-place πράξεις
+        def box(a):
+            ii = np.zeros((H + 1, W + 1)); np.cumsum(a, 0, out=ii[1:, 1:]); np.cumsum(ii[1:, 1:], 1, out=ii[1:, 1:])
+            out = ii[h:, w:] - ii[:-h, w:]
+            out -= ii[h:, :-w]; out += ii[:-h, :-w]
+            return out
+        s1 = box(f); f *= f; var = box(f)
+        s1 *= s1; s1 /= h * w; var -= s1  # Σ(I²) - (ΣI)²/N
+        # Σχεδόν επίπεδες περιοχές (std < FLAT) δεν ταιριάζουν με τίποτα, αντί για NCC = 0/0
+        flat = var <= self.FLAT ** 2 * h * w
+        var[flat] = 1.0
+        np.sqrt(var, out=var); var *= tn
+        corr /= var; corr[flat] = 0.0
+        return corr
+
+    def _ncc_at(self, img, level, x0, y0, r):
+        """NCC σε (2r+1)² θέσεις γύρω από το (x0, y0)· (score, x, y) της καλύτερης ή None."""
+        np = _numpy()
+        tz, tn = self._tz[level]
+        h, w = tz.shape
+        H, W = img.shape
+        xa, ya = max(0, x0 - r), max(0, y0 - r)
+        xb, yb = min(W - w, x0 + r), min(H - h, y0 + r)
+        if xb < xa or yb < ya or tn == 0: return None
+        win = np.lib.stride_tricks.sliding_window_view(img[ya:yb + h, xa:xb + w], (h, w))
+        wz = win - win.mean(axis=(2, 3), keepdims=True)
+        num = np.einsum("ijkl,kl->ij", wz, tz)
+        var = np.einsum("ijkl,ijkl->ij", wz, wz)
+        ok = var > self.FLAT ** 2 * h * w
+        score = np.where(ok, num / (np.sqrt(np.where(ok, var, 1.0)) * tn), 0.0)
+        iy, ix = np.unravel_index(int(score.argmax()), score.shape)
+        return float(score[iy, ix]), xa + int(ix), ya + int(iy)
+
+    def _candidates(self, ncc, k):
+        """Οι k καλύτερες θέσεις, τουλάχιστον μισό template η μία από την άλλη."""
+        np = _numpy()
+        flat = ncc.ravel()
+        n = min(flat.size, 64)
+        idx = np.argpartition(flat, -n)[-n:]
+        idx = idx[np.argsort(flat[idx])[::-1]]
+        h, w = self._tz[-1][0].shape
+        out = []
+        for i in idx:
+            y, x = divmod(int(i), ncc.shape[1])
+            if all(abs(x - cx) > w // 2 or abs(y - cy) > h // 2 for cx, cy in out): out.append((x, y))
+            if len(out) == k: break
+        return out
+
+    def search(self, img):
+        """(score, x, y) του καλύτερου match μέσα στο img (πάνω-αριστερά, σε pixels του img) ή None."""
+        top = len(self.levels) - 1
+        pyr = [img]
+        for _ in range(top): pyr.append(_pool(pyr[-1]))
+        ncc = self._ncc_map(pyr[top], top)
+        if ncc is None: return None
+        best = None
+        for x, y in self._candidates(ncc, self.TOP_K):
+            hit = (float(ncc[y, x]), x, y)
+            for level in range(top - 1, -1, -1):
+                hit = self._ncc_at(pyr[level], level, hit[1] * 2, hit[2] * 2, self.REFINE)
+                if hit is None: break
+            if hit is not None and (best is None or hit[0] > best[0]): best = hit
+        return best
+
+    def locate(self, grab, region=None, screen=None):
+        """Κέντρο (x, y) του template στην οθόνη ή None. grab(region) -> πίνακας της περιοχής,
+        region = (x, y, w, h) περιορίζει την αναζήτηση, screen = (W, H) για το clipping."""
+        rx, ry, rw, rh = region if region else (0, 0) + tuple(screen or (1 << 30, 1 << 30))
+        if screen: rw, rh = min(rw, screen[0] - rx), min(rh, screen[1] - ry)
+        if self.last is not None:
+            m = self.CACHE_MARGIN
+            x0, y0 = max(rx, self.last[0] - m), max(ry, self.last[1] - m)
+            x1, y1 = min(rx + rw, self.last[0] + self.w + m), min(ry + rh, self.last[1] + self.h + m)
+            if x1 - x0 >= self.w and y1 - y0 >= self.h:
+                hit = self._ncc_at(grab((x0, y0, x1 - x0, y1 - y0)), 0, self.last[0] - x0, self.last[1] - y0, m)
+                if hit and hit[0] >= self.threshold:
+                    self.last = (x0 + hit[1], y0 + hit[2])
+                    return self.last[0] + self.w // 2, self.last[1] + self.h // 2
+        img = grab((rx, ry, rw, rh) if region or screen else None)
+        hit = self.search(img)
+        if hit is None or hit[0] < self.threshold:
+            self.last = None; return None
+        self.last = (rx + hit[1], ry + hit[2])
+        return self.last[0] + self.w // 2, self.last[1] + self.h // 2
+
+# ---------- TRIGGERS ----------
+# Triggers: αντί για timer, το κλικ γίνεται όταν αλλάξει μια μικρή περιοχή της οθόνης. Κάθε poll
+# τραβάει μόνο την περιοχή (όχι όλη την οθόνη), και ένα CRC32 των bytes αποφασίζει αν χρειάζεται
+# καν σύγκριση pixel. Όσο η περιοχή μένει ίδια, το poll αραιώνει (adaptive interval).
+TRIGGER_KINDS = ("timer", "change", "color", "stable")
+WatchSpec = namedtuple("WatchSpec", "kind region color tolerance stable")  # region: (x, y, w, h), stable: sec
+
+def _parse_color(v):
+    """(r, g, b) από "#rrggbb" ή [r, g, b]· None σε κενή/λάθος τιμή."""
+    try:
+        if isinstance(v, str):
+            v = v.strip().lstrip("#")
+            return (int(v[0:2], 16), int(v[2:4], 16), int(v[4:6], 16)) if len(v) == 6 else None
+        r, g, b = (int(c) for c in v)
+        return r, g, b
+    except (TypeError, ValueError): return None
+
+class XShmGrabber:
+    """Περιοχή της οθόνης μέσω MIT-SHM (Linux/X11): ο X server γράφει κατευθείαν σε System V shared
+    memory, χωρίς να περάσουν τα pixels από το socket. Το XImage και το segment δεσμεύονται μία φορά."""
+    channels, order = 4, (2, 1, 0)  # ZPixmap 32bpp: B, G, R, X
+
+    def __init__(self, region):
+        if not sys.platform.startswith("linux") or not os.environ.get("DISPLAY"): raise OSError("no X11 display")
+        import ctypes as ct, ctypes.util
+        x11, xext = ctypes.util.find_library("X11"), ctypes.util.find_library("Xext")
+        if not x11 or not xext: raise OSError("libX11/libXext not found")
+
+        class XImage(ct.Structure):  # μόνο τα πεδία μέχρι το bits_per_pixel
+            _fields_ = [("width", ct.c_int), ("height", ct.c_int), ("xoffset", ct.c_int), ("format", ct.c_int),
+                        ("data", ct.c_void_p), ("byte_order", ct.c_int), ("bitmap_unit", ct.c_int),
+                        ("bitmap_bit_order", ct.c_int), ("bitmap_pad", ct.c_int), ("depth", ct.c_int),
+                        ("bytes_per_line", ct.c_int), ("bits_per_pixel", ct.c_int)]
+        class ShmInfo(ct.Structure):
+            _fields_ = [("shmseg", ct.c_ulong), ("shmid", ct.c_int), ("shmaddr", ct.c_void_p), ("readOnly", ct.c_int)]
+
+        self._ct = ct
+        self._x = x = ct.CDLL(x11); self._e = e = ct.CDLL(xext); self._libc = libc = ct.CDLL(None, use_errno=True)
+        x.XOpenDisplay.restype = ct.c_void_p; x.XOpenDisplay.argtypes = [ct.c_char_p]
+        x.XDefaultScreen.argtypes = [ct.c_void_p]
+        x.XDefaultRootWindow.restype = ct.c_ulong; x.XDefaultRootWindow.argtypes = [ct.c_void_p]
+        x.XDefaultVisual.restype = ct.c_void_p; x.XDefaultVisual.argtypes = [ct.c_void_p, ct.c_int]
+        x.XDefaultDepth.argtypes = [ct.c_void_p, ct.c_int]
+        x.XSync.argtypes = [ct.c_void_p, ct.c_int]
+        x.XFree.argtypes = [ct.c_void_p]; x.XCloseDisplay.argtypes = [ct.c_void_p]
+        e.XShmQueryExtension.argtypes = [ct.c_void_p]
+        e.XShmCreateImage.restype = ct.POINTER(XImage)
+        e.XShmCreateImage.argtypes = [ct.c_void_p, ct.c_void_p, ct.c_uint, ct.c_int, ct.c_void_p, ct.POINTER(ShmInfo), ct.c_uint, ct.c_uint]
+        e.XShmAttach.argtypes = e.XShmDetach.argtypes = [ct.c_void_p, ct.POINTER(ShmInfo)]
+        e.XShmGetImage.argtypes = [ct.c_void_p, ct.c_ulong, ct.POINTER(XImage), ct.c_int, ct.c_int, ct.c_ulong]
+        libc.shmget.argtypes = [ct.c_int, ct.c_size_t, ct.c_int]
+        libc.shmat.restype = ct.c_void_p; libc.shmat.argtypes = [ct.c_int, ct.c_void_p, ct.c_int]
+        libc.shmdt.argtypes = [ct.c_void_p]; libc.shmctl.argtypes = [ct.c_int, ct.c_int, ct.c_void_p]
+
+        self.x, self.y, self.w, self.h = region
+        self._info = ShmInfo(); self._img = None; self._attached = False
+        self._d = d = x.XOpenDisplay(None)
+        if not d: raise OSError("cannot open X display")
         try:
-            self.cfg.data.update({
-                "interval_minutes": float(self.interval_entry.get()),
-                "use_random_timing": bool(self.rand_switch.get()),
-                "scroll": int(self.scroll_entry.get()),
-                "move_jitter": int(self.move_jitter_entry.get()),
-                "start_delay_sec": int(self.delay_entry.get()),
-                "click_type": self.click_type_var.get()
-            })
-            self.cfg.save(); return True
-        except ValueError: messagebox.showerror("Λάθος", "Ελέγξτε τις τιμές."); return False
-
-    def add_point(self):
-        self.status_bar.configure(text="Καταγραφή ποντικιού σε 3s...")
-        self.after(3000, self._capture)
-
-    def clear_points(self):
-        self.cfg.data["points"] = []
-        self.cfg.save()
-        self._refresh_points_lbl()
-
-    def _capture(self):
-        x, y = pyautogui.position()
-        if "points" not in self.cfg.data: self.cfg.data["points"] = []
-        self.cfg.data["points"].append({"x": int(x), "y": int(y)})
-        self.cfg.save(); self._refresh_form()
-        self.status_bar.configure(text=f"Προστέθηκε σημείο: ({x}, {y})")
+            if not e.XShmQueryExtension(d): raise OSError("MIT-SHM not available")
+            scr = x.XDefaultScreen(d)
+            self._root = x.XDefaultRootWindow(d)
+            self._img = img = e.XShmCreateImage(d, x.XDefaultVisual(d, scr), x.XDefaultDepth(d, scr), 2, None,
+                                                ct.byref(self._info), self.w, self.h)  # 2 = ZPixmap
+            if not img or img.contents.bits_per_pixel != 32: raise OSError("unsupported XImage format")
+            self.stride = img.contents.bytes_per_line
+            self._size = self.stride * self.h
+            shmid = self._info.shmid = libc.shmget(0, self._size, 0o1600)  # IPC_PRIVATE, IPC_CREAT | 0600
+            if shmid < 0: raise OSError(ct.get_errno(), "shmget failed")
+            addr = libc.shmat(shmid, None, 0)
+            if addr in (None, ct.c_void_p(-1).value):
+                libc.shmctl(shmid, 0, None); raise OSError(ct.get_errno(), "shmat failed")
+            self._info.shmaddr = img.contents.data = addr
+            if not e.XShmAttach(d, ct.byref(self._info)): raise OSError("XShmAttach failed")
+            self._attached = True
+            x.XSync(d, 0)
+            libc.shmctl(shmid, 0, None)  # IPC_RMID: το segment σβήνεται μόλις κάνουν detach και οι δύο πλευρές
+        except Exception:
+            self.close(); raise
+
+    def grab(self):
+        if not self._e.XShmGetImage(self._d, self._root, self._img, self.x, self.y, 0xFFFFFFFF):
+            raise OSError("XShmGetImage failed")
+        return self._ct.string_at(self._info.shmaddr, self._size)
+
+    def close(self):
+        if self._d is None: return
+        if self._attached: self._e.XShmDetach(self._d, self._ct.byref(self._info)); self._x.XSync(self._d, 0)
+        if self._info.shmaddr: self._libc.shmdt(self._info.shmaddr)
+        if self._img: self._x.XFree(self._img)
+        self._x.XCloseDisplay(self._d); self._d = None
+
+class MssGrabber:
+    """Περιοχή μέσω mss (αν είναι εγκατεστημένο): native grab μόνο της περιοχής σε BGRA, χωρίς PIL."""
+    channels, order = 4, (2, 1, 0)
+
+    def __init__(self, region):
+        import mss
+        self._m = mss.mss()
+        x, y, self.w, self.h = region
+        self.stride = self.w * 4
+        self._mon = {"left": x, "top": y, "width": self.w, "height": self.h}
+
+    def grab(self): return self._m.grab(self._mon).raw
+    def close(self): self._m.close()
+
+class ScreenshotGrabber:
+    """Fallback: pyautogui.screenshot(region=...), σε RGB bytes."""
+    channels, order = 3, (0, 1, 2)
+
+    def __init__(self, region):
+        self.region = tuple(region); self.w, self.h = region[2], region[3]
+        self.stride = self.w * 3
+
+    def grab(self): return _pyautogui().screenshot(region=self.region).convert("RGB").tobytes()
+    def close(self): pass
+
+class ArrayGrabber:
+    """Περιοχή ενός πίνακα-οθόνης (RecordingBackend): grayscale (H, W) ή RGB (H, W, 3)."""
+    channels, order = 3, (0, 1, 2)
+
+    def __init__(self, screen, region):
+        self.screen = screen
+        self.x, self.y, self.w, self.h = region
+        self.stride = self.w * 3
+
+    def grab(self):
+        np = _numpy()
+        a = self.screen[self.y:self.y + self.h, self.x:self.x + self.w]
+        if a.ndim == 2: a = np.repeat(a[..., None], 3, axis=2)
+        return np.clip(a, 0, 255).astype(np.uint8).tobytes()
+
+    def close(self): pass
+
+def open_grabber(region):
+    """Ο γρηγορότερος διαθέσιμος τρόπος λήψης μιας περιοχής: MIT-SHM, mss, pyautogui."""
+    for cls in (XShmGrabber, MssGrabber):
+        try: return cls(region)
+        except (ImportError, OSError, AttributeError): pass
+    return ScreenshotGrabber(region)
+
+class RegionWatch:
+    """Η λογική ενός trigger πάνω σε διαδοχικά frames μιας περιοχής. Το poll() επιστρέφει True όταν
+    πρέπει να γίνει κλικ· το arm() (μετά από κάθε κλικ) ορίζει νέο σημείο αναφοράς.
+      change: η περιοχή διαφέρει από το frame αμέσως μετά το arm
+      color:  εμφανίζεται pixel με το χρώμα (± tolerance) ενώ πριν δεν υπήρχε
+      stable: η περιοχή άλλαξε και μετά έμεινε ίδια για `stable` sec"""
+    FAST, SLOW = 0.015, 0.06  # όρια του poll interval (sec)
+    BACKOFF = 1.5  # πολλαπλασιαστής του interval σε κάθε ίδιο frame
+    NOISE = 12     # διαφορά ανά κανάλι που θεωρείται θόρυβος (dithering, cursor blink)
+    MIN_CHANGE = 0.005  # ελάχιστο ποσοστό pixel που πρέπει να αλλάξει
+
+    def __init__(self, spec, grabber):
+        np = _numpy()
+        if np is None: raise ValueError("watch triggers need NumPy")
+        self.np, self.spec, self.grabber = np, spec, grabber
+        if spec.color is not None: self._color = np.array(spec.color, dtype=np.int16)
+        self._matched = False  # color: η κατάσταση του τελευταίου frame
+        self.arm()
+
+    def arm(self):
+        self.interval = self.FAST
+        self._crc = None; self._ref = None; self._changed_at = None
+
+    def _frame(self, raw):
+        g = self.grabber
+        a = self.np.frombuffer(raw, dtype=self.np.uint8).reshape(g.h, -1)[:, :g.w * g.channels]
+        return a.reshape(g.h, g.w, g.channels)[..., g.order].astype(self.np.int16)
+
+    def _differs(self, a, b):
+        return (self.np.abs(a - b) > self.NOISE).any(axis=2).mean() >= self.MIN_CHANGE
+
+    def poll(self, now):
+        raw = self.grabber.grab()
+        crc = zlib.crc32(raw)
+        kind = self.spec.kind
+        settled = kind == "stable" and self._changed_at is not None and now - self._changed_at >= self.spec.stable
+        if crc == self._crc:
+            # Ίδια bytes: καμία σύγκριση pixel, και το επόμενο poll αργεί λίγο περισσότερο
+            self.interval = min(self.SLOW, self.interval * self.BACKOFF)
+            return settled
+        first = self._crc is None
+        self._crc = crc
+        frame = self._frame(raw)
+        if kind == "color":
+            hit = bool((self.np.abs(frame - self._color) <= self.spec.tolerance).all(axis=2).any())
+            fire, self._matched = hit and not self._matched, hit
+            self.interval = self.FAST if fire else min(self.SLOW, self.interval * self.BACKOFF)
+            return fire
+        if first: self._ref = frame; return False
+        if not self._differs(frame, self._ref):
+            self.interval = min(self.SLOW, self.interval * self.BACKOFF); return settled
+        self.interval = self.FAST
+        if kind == "change": return True
+        self._ref = frame; self._changed_at = now  # stable: μετράει από την τελευταία αλλαγή
+        return False
+
+    def close(self): self.grabber.close()
+
+# ---------- MATCH SERVICE ----------
+# Πολλά templates (ενός profile ή πολλών profiles ταυτόχρονα) ψάχνονται πάνω στο ΙΔΙΟ frame: ένα grab
+# ανά tick γράφεται σε multiprocessing.shared_memory, και κάθε worker του process pool το βλέπει ως
+# np.ndarray πάνω στο ίδιο buffer, χωρίς αντίγραφο. Ίδια αιτήματα μέσα σε ένα frame εκτελούνται μία φορά.
+_MW = {"name": None, "shm": None, "frame": None, "matchers": {}}  # κατάσταση μέσα σε κάθε worker process
+
+def _match_one(frame, matchers, path, threshold, region, last):
+    m = matchers.get((path, threshold))
+    if m is None: m = matchers[(path, threshold)] = TemplateMatcher.load(path, threshold)
+    m.last = last  # η θέση του προηγούμενου hit έρχεται από τον service, όποιος worker κι αν το βρήκε
+    grab = lambda r: frame if r is None else frame[r[1]:r[1] + r[3], r[0]:r[0] + r[2]]
+    hit = m.locate(grab, region, (frame.shape[1], frame.shape[0]))
+    return hit, m.last
+
+def _match_task(shm_name, shape, path, threshold, region, last):
+    st = _MW
+    if st["name"] != shm_name:
+        from multiprocessing import shared_memory
+        if st["shm"] is not None: st["frame"] = None; st["shm"].close()
+        # Python < 3.13 γράφει και το attach στον resource tracker· είναι όμως ο ίδιος (κοινός) tracker
+        # του parent, οπότε το unlink του service αρκεί για να μη μείνει τίποτα πίσω
+        try: shm = shared_memory.SharedMemory(name=shm_name, track=False)
+        except TypeError: shm = shared_memory.SharedMemory(name=shm_name)
+        st.update(name=shm_name, shm=shm, frame=_numpy().ndarray(shape, dtype="float32", buffer=shm.buf))
+    return _match_one(st["frame"], st["matchers"], path, threshold, region, last)
+
+class MatchService:
+    """Κοινός εντοπισμός templates για όλα τα runs ενός RunManager. Ένα locate_many() μέσα στο ίδιο
+    tick ξαναχρησιμοποιεί frame και αποτελέσματα· τα αιτήματα που λείπουν μοιράζονται στο pool
+    (ένα μόνο εκτελείται επί τόπου, γιατί εκεί το IPC κοστίζει περισσότερο από το matching).
+    Κάθε χρήστης δίνει στο acquire() το grab του δικού του backend: το frame το τραβάει πάντα ένας
+    χρήστης που τρέχει ακόμα, ποτέ ένα backend που έκλεισε."""
+    TICK = 0.05  # sec που ένα frame θεωρείται τρέχον
+
+    def __init__(self, clock=time.monotonic, workers=None):
+        self.clock = clock
+        self.workers = workers or max(1, (os.cpu_count() or 1) - 1)
+        self._grabs = []  # ένα ανά acquire(), με τη σειρά
+        self._frame_grab = None
+        self.frames = 0; self.requests = 0; self.searches = 0  # για στατιστικά/bench
+        self._pool = None; self._shm = None; self._frame = None
+        self._frame_t = -math.inf
+        self._results = {}  # (path, threshold, region) -> hit στο τρέχον frame
+        self._last = {}     # (path, threshold) -> πάνω-αριστερά του τελευταίου hit
+        self._local = {}    # matchers για τα αιτήματα που τρέχουν επί τόπου
+        self._lock = threading.Lock()
+
+    @property
+    def users(self): return len(self._grabs)
+
+    def acquire(self, grab):
+        with self._lock: self._grabs.append(grab)
+
+    def release(self, grab):
+        with self._lock:
+            self._grabs.remove(grab)
+            if not self._grabs: self._close()
+            elif grab == self._frame_grab: self._frame_t = -math.inf  # το επόμενο frame από ζωντανό backend
+
+    def _new_frame(self):
+        np = _numpy()
+        grab = self._frame_grab = self._grabs[-1]
+        img = grab(None)
+        if self._frame is None or self._frame.shape != img.shape:
+            from multiprocessing import shared_memory
+            self._frame = None
+            if self._shm is not None: self._shm.close(); self._shm.unlink()
+            self._shm = shared_memory.SharedMemory(create=True, size=img.nbytes)
+            self._frame = np.ndarray(img.shape, dtype="float32", buffer=self._shm.buf)
+        np.copyto(self._frame, img, casting="unsafe")
+        self._frame_t = self.clock(); self.frames += 1
+        self._results.clear()
+
+    def _executor(self):
+        if self._pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn: τα threads του scheduler/arbiter/GUI δεν πρέπει να αντιγραφούν με fork
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def locate_many(self, requests):
+        """requests: [(path, threshold, region)] -> [κέντρο (x, y) ή None], στην ίδια σειρά."""
+        with self._lock:
+            if self.clock() - self._frame_t >= self.TICK: self._new_frame()
+            self.requests += len(requests)
+            todo = list(dict.fromkeys(k for k in requests if k not in self._results))
+            self.searches += len(todo)
+            if len(todo) == 1 or (todo and self.workers == 1):
+                for k in todo:
+                    hit, self._last[k[:2]] = _match_one(self._frame, self._local, *k, self._last.get(k[:2]))
+                    self._results[k] = hit
+            elif todo:
+                pool, name, shape = self._executor(), self._shm.name, self._frame.shape
+                futs = [(k, pool.submit(_match_task, name, shape, *k, self._last.get(k[:2]))) for k in todo]
+                for k, f in futs: self._results[k], self._last[k[:2]] = f.result()
+            return [self._results[k] for k in requests]
+
+    def _close(self):
+        if self._pool is not None: self._pool.shutdown(wait=False, cancel_futures=True); self._pool = None
+        self._frame = None
+        if self._shm is not None: self._shm.close(); self._shm.unlink(); self._shm = None
+        self._frame_t = -math.inf; self._frame_grab = None
+        self._results.clear(); self._last.clear(); self._local.clear()
+
+# ---------- METRICS ----------
+class Counter:
+    # Το `+=` δεν είναι atomic: clicks/misses αυξάνονται από τον arbiter και από το run thread
+    __slots__ = ("value", "_lock")
+    def __init__(self): self.value = 0; self._lock = threading.Lock()
+    def inc(self, n=1):
+        with self._lock: self.value += n
+
+class Histogram:
+    """Σταθερά buckets (σε δευτερόλεπτα), προ-δεσμευμένα: ένα observe είναι bisect + τρεις προσθέσεις,
+    χωρίς καμία δέσμευση μνήμης ανά event."""
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # το τελευταίο είναι το +Inf
+        self.sum = 0.0; self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, v):
+        i = bisect.bisect_left(self.bounds, v)  # le: v <= bound
+        with self._lock:
+            self.counts[i] += 1; self.sum += v; self.count += 1
+
+    def snapshot(self):
+        with self._lock: return list(self.counts), self.sum, self.count
+
+    def quantile(self, q):
+        """Άνω όριο του bucket που περιέχει το q-quantile (None χωρίς δείγματα ή αν πέφτει στο +Inf)."""
+        counts, _, count = self.snapshot()
+        if not count: return None
+        rank, acc = q * count, 0
+        for bound, c in zip(self.bounds, counts):
+            acc += c
+            if acc >= rank: return bound
+        return None
+
+# (attribute, όνομα metric, τύπος, περιγραφή)
+METRIC_SPEC = (
+    ("clicks", "pergio_clicks_total", "counter", "Ολοκληρωμένα κλικ"),
+    ("scrolls", "pergio_scrolls_total", "counter", "Εκτελεσμένα scroll"),
+    ("jitters", "pergio_jitters_total", "counter", "Εκτελεσμένες τυχαίες μετακινήσεις"),
+    ("errors", "pergio_errors_total", "counter", "Σφάλματα που σταμάτησαν ένα run"),
+    ("drift", "pergio_drift_seconds", "histogram", "Έναρξη μιας ενέργειας μείον το προγραμματισμένο deadline της"),
+    ("dispatch", "pergio_click_dispatch_seconds", "histogram", "Από το προγραμματισμένο press μέχρι να επιστρέψει το backend"),
+    ("move", "pergio_move_seconds", "histogram", "Πραγματική διάρκεια μιας κίνησης του ποντικιού"),
+    ("stop", "pergio_stop_seconds", "histogram", "Από το stop() μέχρι να αφεθούν τα κουμπιά"),
+    ("plan", "pergio_plan_build_seconds", "histogram", "Κατασκευή νέου RunPlan μετά από αλλαγή ρυθμίσεων"),
+    ("misses", "pergio_target_misses_total", "counter", "Κύκλοι όπου η εικόνα-στόχος δεν βρέθηκε"),
+    ("locate", "pergio_locate_seconds", "histogram", "Εντοπισμός της εικόνας-στόχου (grab + matching)"),
+    ("triggers", "pergio_triggers_total", "counter", "Κλικ που προκάλεσε trigger περιοχής"),
+    ("poll", "pergio_watch_poll_seconds", "histogram", "Ένα poll της περιοχής παρακολούθησης (grab + CRC + diff)"),
+)
+
+class RunMetrics:
+    """Τα metrics ενός profile. Ο engine κρατάει reference, άρα στο hot path δεν γίνεται lookup."""
+    __slots__ = tuple(a for a, *_ in METRIC_SPEC)
+
+    def __init__(self):
+        for attr, _, kind, _ in METRIC_SPEC:
+            setattr(self, attr, Counter() if kind == "counter" else Histogram())
+
+# Metrics της εφαρμογής, χωρίς label profile
+GLOBAL_METRIC_SPEC = (
+    ("config_reload", "pergio_config_reload_seconds", "histogram", "Επαναφόρτωση των ρυθμίσεων από τον δίσκο μετά από εξωτερική αλλαγή"),
+)
+
+class Metrics:
+    """Registry με ένα RunMetrics ανά profile· οι τιμές επιβιώνουν από run σε run του ίδιου profile."""
+
+    def __init__(self):
+        self._runs = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.config_reload = Histogram()
+
+    def run(self, profile):
+        with self._lock:
+            m = self._runs.get(profile)
+            if m is None: m = self._runs[profile] = RunMetrics()
+            return m
+
+    def prometheus(self):
+        """Text exposition format 0.0.4."""
+        with self._lock: runs = sorted(self._runs.items())
+        esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        lines = []
+
+        def sample(name, label, v):
+            if isinstance(v, Counter):
+                lines.append(f"{name}{{{label}}} {v.value}" if label else f"{name} {v.value}"); return
+            counts, total, count = v.snapshot()
+            acc, sep = 0, f"{label}," if label else ""
+            for bound, c in zip(v.bounds, counts):
+                acc += c
+                lines.append(f'{name}_bucket{{{sep}le="{bound}"}} {acc}')
+            suffix = f"{{{label}}}" if label else ""
+            lines.extend([f'{name}_bucket{{{sep}le="+Inf"}} {count}',
+                          f"{name}_sum{suffix} {total!r}", f"{name}_count{suffix} {count}"])
+
+        for attr, name, kind, help_ in METRIC_SPEC:
+            lines += [f"# HELP {name} {help_}", f"# TYPE {name} {kind}"]
+            for profile, m in runs: sample(name, f'profile="{esc(profile)}"', getattr(m, attr))
+        for attr, name, kind, help_ in GLOBAL_METRIC_SPEC:
+            lines += [f"# HELP {name} {help_}", f"# TYPE {name} {kind}"]
+            sample(name, "", getattr(self, attr))
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        with self._lock: runs = sorted(self._runs.items())
+        def value(v):
+            if isinstance(v, Counter): return v.value
+            counts, total, count = v.snapshot()
+            return {"count": count, "sum": total, "mean": total / count if count else None,
+                    "p50": v.quantile(0.5), "p99": v.quantile(0.99), "buckets": counts}
+        out = {"time": time.time(), "uptime_sec": time.time() - self.started, "profiles": {}}
+        for profile, m in runs:
+            out["profiles"][profile] = {attr: value(getattr(m, attr)) for attr, *_ in METRIC_SPEC}
+        out.update((attr, value(getattr(self, attr))) for attr, *_ in GLOBAL_METRIC_SPEC)
+        return out
+
+METRICS = Metrics()
+
+def serve_metrics(port, host="127.0.0.1", metrics=METRICS):
+    """HTTP endpoint μόνο για localhost: /metrics (Prometheus) και /metrics.json. Επιστρέφει τον server."""
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler  # μόνο αν ζητηθεί endpoint
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics": body, ctype = metrics.prometheus().encode(), "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/metrics.json": body, ctype = json.dumps(metrics.to_json()).encode(), "application/json"
+            else: self.send_error(404); return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype); self.send_header("Content-Length", str(len(body)))
+            self.end_headers(); self.wfile.write(body)
+
+        def log_message(self, *args): pass
+
+    srv = ThreadingHTTPServer((host, port), Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+class MetricsDump:
+    """Γράφει περιοδικά το to_json() σε αρχείο (atomic replace), και μία τελευταία φορά στο stop()."""
+    INTERVAL = 10.0
+
+    def __init__(self, path, interval=None, metrics=METRICS):
+        self.path = Path(path)
+        self.interval = interval or self.INTERVAL
+        self.metrics = metrics
+        self._stop = threading.Event()
+        self._thread = None
 
     def start(self):
-        if not self.cfg.data.get("points"):
-            messagebox.showwarning("Προσοχή", "Ορίστε τουλάχιστον ένα σημείο κλικ."); return
-        if not self._save_form(): return
-        
-        self.running = True 
-        self.start_btn.configure(state="disabled"); self.stop_btn.configure(state="normal")
-        self.iconify()
-        self.status_bar.configure(text="Εκτέλεση...")
-        threading.Thread(target=self._run_loop, daemon=True).start()
-
-    def stop(self): 
-        self.running = False
-
-    def on_close(self): 
-        self.watcher_run = False; self.running = False
-        try: keyboard.unhook_all()
-        except: pass
-        self.destroy()
-
-    def _humanized_click(self, tx, ty, click_type):
-        if not self.running: return 
-        
-        # Προσθήκη τυχαίου offset (±20 pixels) για να μην είναι pixel-perfect το σημείο
-        tx += random.randint(-20, 20)
-        ty += random.randint(-20, 20)
-        
-        if random.random() > 0.3:
-            overshoot_x = tx + random.randint(-15, 15)
-            overshoot_y = ty + random.randint(-15, 15)
-            pyautogui.moveTo(overshoot_x, overshoot_y, duration=random.uniform(0.15, 0.3), tween=pyautogui.easeOutQuad)
-            if not self.running: return
-            time.sleep(random.uniform(0.01, 0.05))
-        
-        if not self.running: return
-        pyautogui.moveTo(tx, ty, duration=random.uniform(0.1, 0.25), tween=pyautogui.easeInOutQuad)
-        time.sleep(random.uniform(0.05, 0.2))
-        
-        if not self.running: return
-        btn = 'left' if click_type == "Αριστερό" else 'right'
-        
-        if click_type == "Διπλό":
-            # Προσομοίωση Διπλού Κλικ
-            pyautogui.mouseDown(button='left')
-            time.sleep(random.uniform(0.03, 0.08))
-            pyautogui.mouseUp(button='left')
-            time.sleep(random.uniform(0.05, 0.15))
-            pyautogui.mouseDown(button='left')
-            time.sleep(random.uniform(0.03, 0.08))
-            pyautogui.mouseUp(button='left')
-        else:
-            pyautogui.mouseDown(button=btn)
-            time.sleep(random.uniform(0.03, 0.12))
-            pyautogui.mouseUp(button=btn)
+        self._thread = threading.Thread(target=self._run, daemon=True); self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread: self._thread.join(2.0)
+        self.dump()
+
+    def _run(self):
+        while not self._stop.wait(self.interval): self.dump()
 
-    def _run_loop(self):
+    def dump(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
         try:
-            delay = max(0, self.cfg.data.get("start_delay_sec", 5))
-            t_start = time.time()
-            while self.running and (time.time() - t_start) < delay:
-                time.sleep(0.1)
+            with open(tmp, "w", encoding="utf-8") as f: json.dump(self.metrics.to_json(), f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError: pass
 
-            pts = self.cfg.data["points"]
-            pt_index = 0
-            
-            while self.running:
-                # Επιλογή Σημείου με τη σειρά
-                pt = pts[pt_index]
-                tx, ty = pt["x"], pt["y"]
-                pt_index = (pt_index + 1) % len(pts) # Loop back to 0
-                
-                cl_type = self.cfg.data.get("click_type", "Αριστερό")
-                self._humanized_click(tx, ty, cl_type)
-                
-                base_min = float(self.cfg.data["interval_minutes"])
-                actual_wait = random.uniform(2.0, base_min * 60) if self.cfg.data["use_random_timing"] else max(0.2, base_min * 60)
-                
-                if not self.cfg.data["use_random_timing"]:
-                    actual_wait += random.uniform(-0.5, 0.5)
-                    
-                t0 = time.time()
-                ds = False; dj = False
-                while self.running and (time.time() - t0 < actual_wait):
-                    el = time.time() - t0
-                    if not ds and self.cfg.data["scroll"] != 0 and el > (actual_wait * random.uniform(0.3, 0.6)):
-                        scroll_amt = self.cfg.data["scroll"]
-                        chunks = [scroll_amt // 2, scroll_amt - (scroll_amt // 2)]
-                        for chunk in chunks:
-                            pyautogui.scroll(chunk)
-                            time.sleep(random.uniform(0.05, 0.15))
-                        ds = True
-                    if not dj and self.cfg.data["move_jitter"] > 0 and el > (actual_wait * random.uniform(0.6, 0.9)):
-                        j = self.cfg.data["move_jitter"]
-                        pyautogui.moveRel(random.randint(-j, j), random.randint(-j, j), 
-                                          duration=random.uniform(0.2, 0.5), tween=pyautogui.easeInOutSine)
-                        dj = True
-                    time.sleep(0.1)
-        except Exception:
-            self.running = False
+# ---------- CLICK ENGINE ----------
+class InputArbiter:
+    """Ένα worker thread που εκτελεί σειριακά τις ενέργειες εισόδου (κλικ, scroll, jitter) όλων των
+    runs, ώστε δύο profiles να μη μπλέκουν ποτέ μια κίνηση με ένα κλικ. Ο scheduler μόνο παραδίδει
+    εδώ τις ενέργειες τη στιγμή του deadline τους."""
+
+    def __init__(self):
+        self._q = queue.Queue()
+        self._lock = threading.Lock()
+        self.current = None  # το run που εκτελεί αυτή τη στιγμή ενέργεια
+        self._thread = None
+
+    def submit(self, run, deadline, fn, args):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, daemon=True); self._thread.start()
+        self._q.put((run, deadline, fn, args))
+
+    def busy_with(self, run):
+        with self._lock: return self.current is run
+
+    def stop(self): self._q.put(None)
+
+    def _work(self):
+        while True:
+            item = self._q.get()
+            if item is None: return
+            self._execute(*item)
+
+    def _execute(self, run, deadline, fn, args):
+        with self._lock: self.current = run
+        try:
+            if not run.stopped.is_set():
+                d = run.clock() - deadline
+                run.drift.record(d); run.metrics.drift.observe(d)
+                fn(*args)
+        except Exception as e:
+            run.error = e; run.metrics.errors.inc(); run.stopped.set()
         finally:
-            self.after(0, lambda: (
-                self.start_btn.configure(state="normal"), 
-                self.stop_btn.configure(state="disabled"),
-                self.status_bar.configure(text="Έτοιμο / Σταμάτησε")
-            ))
-
-    def _watcher(self):
-        while self.watcher_run:
-            time.sleep(2.0)
-            if self.cfg.reload_if_changed(): self.after(0, self._refresh_form)
-
-if __name__ == "__main__": App().mainloop()
+            with self._lock: self.current = None
+            if run.stopped.is_set(): run._finish()
+
+class RunManager:
+    """Όλα τα ενεργά runs (ένα ανά profile) μοιράζονται ένα Scheduler thread και έναν InputArbiter.
+    Ο manager ορίζει επίσης χρόνο (clock/sleep), threads και backends των runs· ο SimManager τα
+    αντικαθιστά με εικονικό χρόνο χωρίς να αλλάζει τίποτα στον ClickEngine."""
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, cfg, on_exit=None, metrics=METRICS):
+        self.cfg = cfg
+        self.on_exit = on_exit or (lambda run: None)
+        self.metrics = metrics
+        self.sched = Scheduler()
+        self.arbiter = InputArbiter()
+        self.runs = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._matching = None
+
+    def start(self, profile, on_status=None):
+        with self._lock:
+            if profile in self.runs: return self.runs[profile]
+            if self._thread is None: self._thread = self._start_scheduler()
+            cls = ReplayEngine if (self.cfg.raw_data["profiles"].get(profile) or {}).get("replay") else ClickEngine
+            run = self.runs[profile] = cls(self, profile, on_status=on_status)
+        run.start()
+        return run
+
+    def _start_scheduler(self):
+        t = threading.Thread(target=self.sched.run, daemon=True); t.start()
+        return t
+
+    @staticmethod
+    def sleep(event, d): return event.wait(d)
+
+    @staticmethod
+    def spawn(fn): threading.Thread(target=fn, daemon=True).start()
+
+    @staticmethod
+    def make_backend(name): return make_backend(name)
+
+    def match_service(self):
+        """Ο κοινός MatchService των runs με image target (ένα frame ανά tick για όλα)."""
+        with self._lock:
+            if self._matching is None: self._matching = MatchService(clock=self.clock)
+            return self._matching
+
+    def stop(self, profile):
+        run = self.runs.get(profile)
+        if run: run.stop()
+
+    def stop_all(self):
+        for run in list(self.runs.values()): run.stop()
+
+    def reload(self):
+        for run in list(self.runs.values()): run.reload()
+
+    def is_running(self, profile): return profile in self.runs
+
+    def wait(self):
+        for run in list(self.runs.values()): run.wait()
+
+    def shutdown(self):
+        self.stop_all(); self.sched.stop(); self.arbiter.stop()
+
+    def _finished(self, run):
+        with self._lock:
+            if self.runs.get(run.profile) is run: del self.runs[run.profile]
+        self.on_exit(run)
+
+class ClickEngine:
+    """Ένα run ενός profile, χωρίς καμία εξάρτηση από GUI. Όλη η κατάσταση του run ζει εδώ· ο χρόνος
+    και η είσοδος περνάνε από τον κοινό Scheduler/InputArbiter του RunManager, και η επικοινωνία
+    προς τα έξω γίνεται μόνο με callbacks."""
+    STOP_BUDGET = 0.02  # μέγιστος χρόνος από stop() μέχρι να αφεθούν τα κουμπιά
+    SCROLL_SEG = 5  # "κλικ" ροδέλας ανά κλήση του backend, ώστε το scroll να διακόπτεται
+
+    def __init__(self, manager, profile, on_status=None):
+        self.manager = manager
+        self.cfg = manager.cfg
+        self.sched, self.arbiter = manager.sched, manager.arbiter
+        self.clock, self._sleep = manager.clock, manager.sleep  # πραγματικός ή εικονικός χρόνος (SimManager)
+        self.profile = profile
+        self.on_status = on_status or (lambda text: None)
+        self.stopped = threading.Event()
+        self.done = threading.Event()
+        self.drift = DriftStats()  # deadline -> πραγματική έναρξη στον arbiter
+        self.metrics = manager.metrics.run(profile)
+        self.backend = None
+        self.error = None
+        self._held = set(); self._stop_t = None; self.stop_latency = None
+        self._latest_plan = None; self._compiler = None
+        self._last_click = -math.inf
+        self.last_cycle = None
+        self._matchers = (); self._matcher_key = None; self._service = None; self._screen = None
+        self._watch = None; self._watch_key = None
+        self._finish_lock = threading.Lock()
+
+    @property
+    def running(self): return not self.done.is_set()
+
+    def start(self):
+        # Το plan (και μια διαδρομή shortest_path) χτίζεται σε δικό του thread, όχι στον scheduler/arbiter
+        self.manager.spawn(self._prepare)
+
+    def stop(self):
+        if self._stop_t is None: self._stop_t = self.clock()
+        self.stopped.set()
+        # Αν ο arbiter εκτελεί τώρα ενέργεια αυτού του run, θα καλέσει ο ίδιος το _finish μόλις
+        # επιστρέψει (αμέσως, αφού όλες οι αναμονές ξυπνάνε από το stopped)
+        if not self.arbiter.busy_with(self): self._finish()
+
+    def wait(self, timeout=None): return self.done.wait(timeout)
+
+    def _build_plan(self):
+        return RunPlan(self.cfg.raw_data["profiles"][self.profile], name=self.profile)
+
+    def reload(self):
+        """Χτίζει νέο RunPlan στο thread που καλεί (π.χ. του watcher)· το run το παραλαμβάνει στον επόμενο κύκλο."""
+        t0 = time.monotonic()
+        try: self._latest_plan = self._build_plan()
+        except (KeyError, ValueError): return  # το profile διαγράφηκε ή άδειασε: συνεχίζει με το τρέχον plan
+        self.metrics.plan.observe(time.monotonic() - t0)
+
+    def summary(self):
+        drift = self.drift.summary()
+        text = f"drift: μ.ό. {drift['mean_ms']:.2f} ms, max {drift['max_ms']:.2f} ms"
+        if self.stop_latency is not None: text += f", stop {self.stop_latency * 1000:.1f} ms"
+        if self.error is not None: text += f", σφάλμα: {self.error}"
+        return text
+
+    def _at(self, deadline, fn, *args):
+        self.sched.call_at(deadline, self.arbiter.submit, self, deadline, fn, args)
+
+    def _wait(self, d):
+        """Αναμονή στο stop event του run· True αν ζητήθηκε stop (ξυπνάει αμέσως, όχι στο τέλος του d)."""
+        if d > 0: return self._sleep(self.stopped, d)
+        return self.stopped.is_set()
+
+    def _glide(self, x1, y1, dur, ease):
+        b = self.backend
+        x0, y0 = b.position()
+        path = TRAJECTORIES.path(x0, y0, x1, y1, dur, ease)
+        step = dur / len(path)
+        t0 = self.clock()
+        for i, (x, y) in enumerate(path, 1):
+            if self._wait(t0 + step * i - self.clock()): return
+            b.move_to(x, y)
+        self.metrics.move.observe(self.clock() - t0)
+
+    def _scroll(self, amount):
+        b = self.backend
+        sign = 1 if amount > 0 else -1
+        left = abs(amount)
+        while left > 0:
+            if self._wait(0): return
+            n = min(left, self.SCROLL_SEG)
+            b.scroll(sign * n); left -= n
+
+    def _do_step(self, st):
+        if self._wait(0): return
+        b = self.backend
+        if st.kind == "move": self._glide(st.x, st.y, st.dur, st.ease)
+        elif st.kind == "press": b.press(st.button); self._held.add(st.button)
+        elif st.kind == "release": b.release(st.button); self._held.discard(st.button)
+        elif st.kind == "scroll": self._scroll(st.y); self.metrics.scrolls.inc()
+        elif st.kind == "jitter":
+            self.metrics.jitters.inc()
+            x, y = b.position()
+            self._glide(x + st.x, y + st.y, st.dur, st.ease)
+
+    def _humanized_click(self, steps):
+        # Τα offsets/overshoot/χρόνοι είναι ήδη κληρωμένα από τον PlanCompiler
+        t0 = self.clock()
+        for st in steps:
+            if self._wait(t0 + st.t - self.clock()): return
+            self._do_step(st)
+            if st.kind == "press": self.metrics.dispatch.observe(self.clock() - t0 - st.t)
+
+    def _release_held(self):
+        for btn in list(self._held):
+            try: self.backend.release(btn)
+            except Exception: pass
+        self._held.clear()
+
+    def _prepare(self):
+        try:
+            plan = self._latest_plan = self._build_plan()
+            self._compiler = PlanCompiler(plan)
+            # Backend/matcher/watch αποκτώνται με το lock του _finish: ένα stop() πριν από εδώ έχει ήδη
+            # καθαρίσει και δεν αποκτάται τίποτα, ένα stop() στο μεταξύ περιμένει και τα αφήνει όλα
+            with self._finish_lock:
+                if self.done.is_set(): return
+                self.backend = self.manager.make_backend(plan.backend)
+                self._load_matcher(plan); self._load_watch(plan)
+            self._compiler.prefetch()  # το πρώτο batch (και το import του NumPy) πριν ξεκινήσει το timing
+            r = plan.route
+            if r and r.before > 0:
+                self.on_status(f"Εκτέλεση... (διαδρομή {r.before:.0f} → {r.after:.0f} px, -{(1 - r.after / r.before) * 100:.0f}%)")
+            if self.stopped.is_set(): return self._finish()
+            self._at(self.clock() + plan.start_delay, self._cycle if self._watch is None else self._poll)
+        except Exception as e:
+            self.error = e; self.metrics.errors.inc(); self.stop()
+
+    def _load_matcher(self, plan):
+        self._matcher_key = (plan.templates, plan.match_threshold)
+        if self._service is not None: self._service.release(self.backend.grab); self._service = None
+        if plan.target != "image": self._matchers = (); return
+        self._matchers = [TemplateMatcher.load(p, plan.match_threshold) for p in plan.templates]
+        self._service = self.manager.match_service(); self._service.acquire(self.backend.grab)
+        if self._screen is None: self._screen = self.backend.screen_size()
+
+    def _load_watch(self, plan):
+        if self._watch is not None: self._watch.close()
+        self._watch_key = plan.watch
+        self._watch = None if plan.watch is None else RegionWatch(plan.watch, self.backend.region_grabber(plan.watch.region))
+
+    def _locate(self, plan):
+        """(κέντρο, matcher) του πρώτου template της λίστας που υπάρχει στην οθόνη, ή (None, None)."""
+        if len(self._matchers) == 1 and self._service.users == 1:
+            # Μόνο ένα template σε όλον τον manager: ο matcher κάνει grab μόνο γύρω από το τελευταίο hit
+            return self._matchers[0].locate(self.backend.grab, plan.search_region, self._screen), self._matchers[0]
+        hits = self._service.locate_many([(p, plan.match_threshold, plan.search_region) for p in plan.templates])
+        return next(((h, m) for h, m in zip(hits, self._matchers) if h is not None), (None, None))
+
+    def _aim(self, steps, hit, matcher):
+        """Μεταφέρει τα βήματα ενός κλικ (compiled γύρω από το (0, 0)) στο κέντρο του match. Το τελικό
+        σημείο μένει μέσα στο template όσο κι αν είναι το offset του PlanCompiler."""
+        hx, hy = hit
+        mx, my = max(0, matcher.w // 2 - 2), max(0, matcher.h // 2 - 2)
+        last = max(i for i, st in enumerate(steps) if st.kind == "move")
+        out = []
+        for i, st in enumerate(steps):
+            if st.kind == "move":
+                dx, dy = st.x, st.y
+                if i == last: dx, dy = max(-mx, min(mx, dx)), max(-my, min(my, dy))
+                st = st._replace(x=hx + dx, y=hy + dy)
+            out.append(st)
+        return out
+
+    def _finish(self):
+        with self._finish_lock:
+            if self.done.is_set(): return
+            self.stopped.set()
+            if self.backend: self._release_held()
+            if self._stop_t is not None:
+                self.stop_latency = self.clock() - self._stop_t
+                self.metrics.stop.observe(self.stop_latency)
+            if self._watch is not None: self._watch.close()
+            if self._service is not None: self._service.release(self.backend.grab); self._service = None
+            if self.backend: self.backend.close()
+            self.done.set()
+        self.manager._finished(self)
+
+    def _cycle(self):
+        # Hot-swap: το νεότερο plan (χτισμένο από τον watcher) μπαίνει μόνο στην αρχή ενός κύκλου.
+        # Μία ανάγνωση attribute, χωρίς lock: ο watcher μόνο αντικαθιστά τη reference.
+        plan = self._latest_plan
+        if plan is not self._compiler.plan:
+            self._compiler.update(plan)
+            if (plan.templates, plan.match_threshold) != self._matcher_key: self._load_matcher(plan)
+            if plan.watch != self._watch_key: self._load_watch(plan)
+        # Rate limit του profile: ο κύκλος μετατίθεται αν το προηγούμενο κλικ ήταν πολύ πρόσφατο
+        earliest = self._last_click + plan.min_click_gap
+        if self.clock() < earliest:
+            self._at(earliest, self._cycle); return
+        self._last_click = self.clock()
+        cy = self.last_cycle = next(self._compiler)
+        click = cy.click
+        if self._matchers:
+            t = time.perf_counter()
+            hit, matcher = self._locate(plan)
+            self.metrics.locate.observe(time.perf_counter() - t)
+            if hit is None:
+                # Χωρίς στόχο δεν γίνεται κλικ· ο επόμενος κύκλος ξαναψάχνει κανονικά
+                self.metrics.misses.inc(); self.on_status("Ο στόχος δεν βρέθηκε στην οθόνη")
+                self._rearm(self.clock() + cy.wait); return
+            click = self._aim(click, hit, matcher)
+        self._humanized_click(click)
+        if self._wait(0): return
+        self.metrics.clicks.inc()
+
+        # Scroll/jitter είναι ήδη κληρωμένα και μπαίνουν στο heap ως απόλυτα deadlines
+        t0 = self.clock()
+        for st in cy.after:
+            self._at(t0 + st.t, self._do_step, st)
+        self._rearm(t0 + cy.wait)
+
+    def _rearm(self, deadline):
+        """Επόμενος κύκλος: στο deadline του timer, ή αμέσως νέα παρακολούθηση αν το profile έχει trigger."""
+        if self._watch is None: self._at(deadline, self._cycle)
+        else: self._watch.arm(); self._at(self.clock(), self._poll)
+
+    def _poll(self):
+        plan = self._latest_plan
+        if plan.watch != self._watch_key: self._load_watch(plan)
+        w = self._watch
+        if w is None: return self._cycle()  # το profile γύρισε σε timer
+        t = time.perf_counter()
+        fire = w.poll(self.clock())
+        self.metrics.poll.observe(time.perf_counter() - t)
+        if fire: self.metrics.triggers.inc(); return self._cycle()
+        self._at(self.clock() + w.interval, self._poll)
+
+# ---------- SIMULATION ----------
+class VirtualClock:
+    """Εικονικό time.monotonic(): προχωράει μόνο όταν το ζητήσει η προσομοίωση."""
+    __slots__ = ("t",)
+    def __init__(self, t=0.0): self.t = t
+    def __call__(self): return self.t
+
+class SimScheduler(Scheduler):
+    """Discrete-event εκδοχή του Scheduler: ίδιο heap/call_at/cancel, αλλά αντί να κοιμάται
+    πηγαίνει το ρολόι κατευθείαν στο επόμενο deadline."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def run_until(self, t_end):
+        heap = self._heap
+        while heap and heap[0][0] <= t_end and not self.stopped.is_set():
+            entry = heapq.heappop(heap)
+            if entry[2] is None: continue
+            if entry[0] > self.clock.t: self.clock.t = entry[0]
+            entry[2](*entry[3])
+        if t_end > self.clock.t: self.clock.t = t_end
+
+class SimArbiter(InputArbiter):
+    """Εκτελεί κάθε ενέργεια αμέσως (στο thread της προσομοίωσης) και κρατάει trace ανά ενέργεια."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+        self.trace = []
+
+    def submit(self, run, deadline, fn, args):
+        t = self.clock.t
+        cy, b = run.last_cycle, run.backend
+        self._execute(run, deadline, fn, args)
+        name = getattr(fn, "__name__", "")
+        if name in ("_cycle", "_poll") and run.last_cycle is not cy:
+            cy = run.last_cycle
+            self.trace.append({"t": t, "end": self.clock.t, "profile": run.profile, "action": "click",
+                               "point": cy.point, "x": b.x, "y": b.y, "wait": cy.wait, "drift": t - deadline})
+        elif name == "_do_step" and args[0].kind in ("scroll", "jitter"):
+            st = args[0]
+            self.trace.append({"t": t, "end": self.clock.t, "profile": run.profile, "action": st.kind,
+                               "dx": st.x, "dy": st.y, "drift": t - deadline})
+
+    def stop(self): pass
+
+class SimManager(RunManager):
+    """RunManager σε εικονικό χρόνο: ο ίδιος ClickEngine (_cycle/_humanized_click/_glide) τρέχει
+    απέναντι σε RecordingBackend, και κάθε αναμονή απλώς προχωράει το VirtualClock."""
+
+    def __init__(self, cfg, on_exit=None):
+        super().__init__(cfg, on_exit, metrics=Metrics())
+        self.clock = VirtualClock()
+        self.sched = SimScheduler(self.clock)
+        self.arbiter = SimArbiter(self.clock)
+
+    def _start_scheduler(self): return True
+
+    def sleep(self, event, d):
+        self.clock.t += d
+        return event.is_set()
+
+    @staticmethod
+    def spawn(fn): fn()
+
+    def make_backend(self, name): return RecordingBackend(clock=self.clock)
+
+    def run_for(self, seconds):
+        self.sched.run_until(self.clock.t + seconds)
+        self.stop_all()
+
+def _dist(xs):
+    xs = sorted(xs)
+    if not xs: return None
+    q = lambda p: xs[min(len(xs) - 1, int(p * len(xs)))]
+    return {"n": len(xs), "mean": sum(xs) / len(xs), "min": xs[0], "p50": q(0.5), "p99": q(0.99), "max": xs[-1]}
+
+def sim_summary(trace, hours):
+    """Στατιστικά του trace: διαστήματα ανάμεσα στα κλικ, θέση scroll/jitter μέσα στον κύκλο, περιστροφή σημείων."""
+    clicks = [e for e in trace if e["action"] == "click"]
+    out = {"hours": hours, "clicks": len(clicks),
+           "interval_sec": _dist([b["t"] - a["t"] for a, b in zip(clicks, clicks[1:])]),
+           "planned_wait_sec": _dist([c["wait"] for c in clicks]),
+           "click_duration_sec": _dist([c["end"] - c["t"] for c in clicks]),
+           "drift_ms": _dist([e["drift"] * 1000 for e in trace])}
+    # Θέση κάθε scroll/jitter ως κλάσμα της αναμονής του κύκλου του (από το τέλος του κλικ)
+    last = None; at = {"scroll": [], "jitter": []}
+    for e in trace:
+        if e["action"] == "click": last = e
+        elif last is not None and last["wait"] > 0: at[e["action"]].append((e["t"] - last["end"]) / last["wait"])
+    for kind, xs in at.items():
+        out[kind] = {"count": sum(1 for e in trace if e["action"] == kind), "position": _dist(xs)}
+    counts = {}
+    for c in clicks: counts[c["point"]] = counts.get(c["point"], 0) + 1
+    out["points"] = {"visits": dict(sorted(counts.items())), "sequence_head": [c["point"] for c in clicks[:20]]}
+    return out
+
+def simulate(profile, hours=24.0, seed=None, name="sim"):
+    """Προσομοίωση `hours` ωρών ενός profile (dict) σε εικονικό χρόνο. Επιστρέφει (trace, summary)."""
+    prof = dict(profile)
+    if seed is not None: prof["seed"] = seed
+    prof["backend"] = "recording"
+    cfg = type("SimConfig", (), {})()
+    cfg.raw_data = {"profiles": {name: prof}, "current_profile": name}
+    mgr = SimManager(cfg)
+    run = mgr.start(name)
+    mgr.run_for(hours * 3600)
+    if run.error is not None: raise run.error
+    return mgr.arbiter.trace, sim_summary(mgr.arbiter.trace, hours)
+
+# ---------- RECORDER ----------
+# Εγγραφή μακροεντολών: τα global hooks (mouse + keyboard) γράφουν records σταθερού μεγέθους σε
+# προ-δεσμευμένο ring buffer, και ένα thread τα αντιγράφει σε append-only αρχείο μέσω mmap.
+# Η μνήμη μένει σταθερή όσο κι αν κρατήσει η εγγραφή, και το άνοιγμα διαβάζει μόνο το header.
+REC = struct.Struct("<dBBxxiii")  # t (sec από την αρχή), kind, button, x, y, value
+REC_HEADER = struct.Struct("<4sHHdQ")  # magic, version, μέγεθος record, start (epoch), πλήθος records
+REC_MAGIC = b"PGRC"
+EV_MOVE, EV_DOWN, EV_UP, EV_SCROLL, EV_KEY_DOWN, EV_KEY_UP = range(6)
+EV_NAMES = ("move", "down", "up", "scroll", "key_down", "key_up")
+BUTTON_CODES = {"left": 1, "right": 2, "middle": 3, "x": 4, "x2": 5}
+BUTTON_NAMES = {v: k for k, v in BUTTON_CODES.items()}
+RecEvent = namedtuple("RecEvent", "t kind button x y value")
+
+class RingBuffer:
+    """Σταθερό bytearray με `capacity` records. Ο producer (hook thread) δεν δεσμεύει ποτέ μνήμη·
+    αν ο consumer μείνει πίσω, τα νέα records μετριούνται στο dropped αντί να γράψουν πάνω στα παλιά."""
+
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.buf = bytearray(capacity * REC.size)
+        self.head = 0  # records που γράφτηκαν συνολικά
+        self.tail = 0  # records που διαβάστηκαν συνολικά
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def push(self, t, kind, button=0, x=0, y=0, value=0):
+        with self._lock:
+            if self.head - self.tail >= self.capacity: self.dropped += 1; return
+            REC.pack_into(self.buf, (self.head % self.capacity) * REC.size, t, kind, button, x, y, value)
+            self.head += 1
+
+    def drain(self, sink):
+        """Δίνει στο sink τα διαθέσιμα records ως memoryview (δύο κομμάτια αν γίνεται wrap-around).
+        Ο producer δεν αγγίζει το τμήμα tail..head μέχρι να προχωρήσει το tail, άρα η αντιγραφή γίνεται χωρίς lock."""
+        with self._lock: tail, head = self.tail, self.head
+        n = head - tail
+        if not n: return 0
+        mv, size = memoryview(self.buf), REC.size
+        start = tail % self.capacity
+        first = min(n, self.capacity - start)
+        sink(mv[start * size:(start + first) * size])
+        if n > first: sink(mv[:(n - first) * size])
+        with self._lock: self.tail = head
+        return n
+
+class MacroWriter:
+    """Append-only αρχείο (header + records) που γράφεται μέσω mmap και μεγαλώνει ανά CHUNK. Το πλήθος
+    στο header ενημερώνεται σε κάθε append, άρα ένα crash αφήνει πάντα αναγνώσιμη εγγραφή."""
+    CHUNK = 1 << 20
+
+    def __init__(self, path, start=None):
+        import mmap
+        self._mmap = mmap.mmap
+        self.path = Path(path)
+        self.start = time.time() if start is None else start
+        self.count = 0
+        self._f = open(self.path, "w+b")
+        self._size = 0; self._mm = None
+        self._grow(REC_HEADER.size)
+        self._header()
+
+    def _grow(self, need):
+        if need <= self._size: return
+        if self._mm is not None: self._mm.close()  # στα Windows δεν αλλάζει μέγεθος αρχείο που είναι mapped
+        self._size = -(-need // self.CHUNK) * self.CHUNK
+        self._f.truncate(self._size)
+        self._mm = self._mmap(self._f.fileno(), self._size)
+
+    def _header(self):
+        REC_HEADER.pack_into(self._mm, 0, REC_MAGIC, 1, REC.size, self.start, self.count)
+
+    def append(self, data):
+        off = REC_HEADER.size + self.count * REC.size
+        self._grow(off + len(data))
+        self._mm[off:off + len(data)] = data
+        self.count += len(data) // REC.size
+        self._header()
+
+    def close(self):
+        if self._mm is None: return
+        self._mm.flush(); self._mm.close(); self._mm = None
+        self._f.truncate(REC_HEADER.size + self.count * REC.size)  # χωρίς το αχρησιμοποίητο τέλος του chunk
+        self._f.close()
+
+class MacroRecording:
+    """Read-only mmap μιας εγγραφής: το άνοιγμα κοστίζει όσο η ανάγνωση του header, ανεξάρτητα από τη
+    διάρκεια, και κάθε record αποκωδικοποιείται μόνο όταν ζητηθεί."""
+
+    def __init__(self, path):
+        import mmap
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, self.start, count = REC_HEADER.unpack_from(self._mm, 0)
+        if magic != REC_MAGIC or size != REC.size:
+            self._mm.close(); raise ValueError(f"{self.path.name}: not a PeRGio recording")
+        self.count = min(count, (len(self._mm) - REC_HEADER.size) // REC.size)
+
+    def __len__(self): return self.count
+
+    def __getitem__(self, i):
+        if i < 0: i += self.count
+        if not 0 <= i < self.count: raise IndexError(i)
+        return RecEvent._make(REC.unpack_from(self._mm, REC_HEADER.size + i * REC.size))
+
+    def __iter__(self):
+        # unpack_from απευθείας από το mmap: καμία αντιγραφή του αρχείου, μόνο οι σελίδες που διαβάζονται
+        unpack, mm, make = REC.unpack_from, self._mm, RecEvent._make
+        for off in range(REC_HEADER.size, REC_HEADER.size + self.count * REC.size, REC.size):
+            yield make(unpack(mm, off))
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+    def close(self): self._mm.close()
+
+    @property
+    def duration(self): return self[-1].t if self.count else 0.0
+
+    def clicks(self, button="left", exclude=None):
+        """[(t, x, y)] των πατημάτων του button· exclude=(x, y, w, h) αγνοεί κλικ μέσα σε αυτό το ορθογώνιο (π.χ. το παράθυρο)."""
+        code = BUTTON_CODES[button]
+        out = []
+        for e in self:
+            if e.kind != EV_DOWN or e.button != code: continue
+            if exclude and exclude[0] <= e.x < exclude[0] + exclude[2] and exclude[1] <= e.y < exclude[1] + exclude[3]: continue
+            out.append((e.t, e.x, e.y))
+        return out
+
+    def to_points(self, points, button="left", exclude=None):
+        """Προσθέτει τα κλικ στο PointSet (χωρίς διπλότυπα, όπως το _capture). Επιστρέφει πόσα μπήκαν."""
+        added = 0
+        for _, x, y in self.clicks(button, exclude):
+            if points.find_duplicate(x, y) is None: points.append((x, y)); added += 1
+        return added
+
+class Recorder:
+    """Global hooks (mouse και, προαιρετικά, keyboard) → RingBuffer → MacroWriter. Το mouse είναι
+    προαιρετική εξάρτηση και φορτώνεται μόνο στο start()."""
+    FLUSH = 0.05  # κάθε πόσο αδειάζει το ring buffer στο αρχείο
+
+    def __init__(self, path, capacity=1 << 16, keys=True):
+        self.path = Path(path)
+        self.ring = RingBuffer(capacity)
+        self.keys = keys
+        self.writer = None
+        self._unhooks = []
+        self._x = self._y = 0  # τα ButtonEvent/WheelEvent δεν έχουν θέση: κρατάμε την τελευταία
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        import mouse
+        self.writer = MacroWriter(self.path)
+        self._x, self._y = mouse.get_position()
+        cb = mouse.hook(self._on_mouse); self._unhooks.append(lambda: mouse.unhook(cb))
+        if self.keys:
+            import keyboard
+            self._unhooks.append(keyboard.hook(self._on_key))
+        self._thread = threading.Thread(target=self._drain_loop, daemon=True); self._thread.start()
+
+    def stop(self):
+        """Σταματάει τα hooks, γράφει ό,τι έμεινε και κλείνει το αρχείο. Επιστρέφει το path."""
+        for unhook in self._unhooks:
+            try: unhook()
+            except Exception: pass
+        self._unhooks.clear()
+        self._stop.set()
+        if self._thread: self._thread.join()
+        if self.writer: self.writer.close()
+        return self.path
+
+    def _drain_loop(self):
+        while not self._stop.wait(self.FLUSH): self.ring.drain(self.writer.append)
+        self.ring.drain(self.writer.append)
+
+    def _on_mouse(self, e):
+        t = e.time - self.writer.start
+        kind = type(e).__name__
+        if kind == "MoveEvent":
+            self._x, self._y = int(e.x), int(e.y)
+            self.ring.push(t, EV_MOVE, 0, self._x, self._y)
+        elif kind == "ButtonEvent":
+            self.ring.push(t, EV_UP if e.event_type == "up" else EV_DOWN, BUTTON_CODES.get(e.button, 0), self._x, self._y)
+        elif kind == "WheelEvent":
+            self.ring.push(t, EV_SCROLL, 0, self._x, self._y, int(e.delta))
+
+    def _on_key(self, e):
+        self.ring.push(e.time - self.writer.start, EV_KEY_UP if e.event_type == "up" else EV_KEY_DOWN,
+                       0, self._x, self._y, e.scan_code or 0)
+
+# ---------- REPLAY ----------
+def rdp(pts, tol):
+    """Ramer–Douglas–Peucker σε λίστα (t, x, y): οι δείκτες των σημείων που χρειάζονται ώστε καμία
+    κίνηση να μην απέχει πάνω από tol px από την πολυγωνική γραμμή. Επαναληπτικό (χωρίς αναδρομή)."""
+    n = len(pts)
+    if n < 3 or tol <= 0: return list(range(n))
+    keep = [False] * n; keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    tol2 = tol * tol
+    while stack:
+        a, b = stack.pop()
+        _, ax, ay = pts[a]; _, bx, by = pts[b]
+        dx, dy = bx - ax, by - ay
+        seg2 = dx * dx + dy * dy
+        best, idx = -1.0, -1
+        for i in range(a + 1, b):
+            _, px, py = pts[i]
+            if seg2:
+                u = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / seg2))
+                ex, ey = ax + u * dx - px, ay + u * dy - py
+            else:
+                ex, ey = px - ax, py - ay
+            d2 = ex * ex + ey * ey
+            if d2 > best: best, idx = d2, i
+        if best > tol2:
+            keep[idx] = True
+            stack.append((a, idx)); stack.append((idx, b))
+    return [i for i in range(n) if keep[i]]
+
+def decimate(events, tol, max_run=4096):
+    """Stream από RecEvent όπου κάθε συνεχόμενη σειρά κινήσεων περνάει από rdp(). Τα υπόλοιπα events
+    (κλικ, scroll, πλήκτρα) περνάνε αυτούσια, άρα η κίνηση πριν από κάθε κλικ καταλήγει στο ίδιο σημείο.
+    Μέγιστο max_run κινήσεις στη μνήμη."""
+    run = []
+    def flush():
+        pts = [(e.t, e.x, e.y) for e in run]
+        for i in rdp(pts, tol): yield run[i]
+        run.clear()
+    for e in events:
+        if e.kind == EV_MOVE:
+            run.append(e)
+            if len(run) >= max_run: yield from flush()
+            continue
+        if run: yield from flush()
+        yield e
+    if run: yield from flush()
+
+class ReplayEngine(ClickEngine):
+    """Αναπαράγει μια εγγραφή .pgrec με τους ίδιους μηχανισμούς του ClickEngine (scheduler, arbiter,
+    stop/F7, metrics, SimManager). Τα events διαβάζονται σταδιακά από το mmap και εκτελούνται σε
+    κομμάτια των SLICE δευτερολέπτων, ώστε ο arbiter να μένει διαθέσιμος και σε άλλα runs."""
+    SLICE = 0.05
+    LOOP_GAP = 0.5  # sec ανάμεσα σε δύο επαναλήψεις (πριν την κλιμάκωση του χρόνου)
+
+    def _prepare(self):
+        try:
+            plan = self._latest_plan = self._build_plan()
+            self.plan = plan
+            with self._finish_lock:  # όπως στο ClickEngine._prepare: κανένα backend μετά από ένα πρόωρο stop()
+                if self.done.is_set(): return
+                self.backend = self.manager.make_backend(plan.backend)
+            self._rng = random.Random(plan.seed)
+            self._events = self._stream(plan)
+            self._next = next(self._events, None)
+            self.dispatched = 0
+            self._shift = 0.0  # χρόνος που πρόσθεσε το humanize (overshoot) στο timeline
+            if self._next is None: raise ValueError("empty recording")
+            self.on_status(f"Replay {Path(plan.replay).name} (x{plan.replay_speed:g}{', loop' if plan.replay_loop else ''})")
+            if self.stopped.is_set(): return self._finish()
+            self._base = self.clock() + plan.start_delay - self._next.t / plan.replay_speed
+            self._at(self._deadline(self._next), self._cycle)
+        except Exception as e:
+            self.error = e; self.metrics.errors.inc(); self.stop()
+
+    def _stream(self, plan):
+        offset = 0.0
+        while True:
+            with MacroRecording(plan.replay) as rec:
+                events = iter(rec)
+                if plan.replay_tolerance: events = decimate(events, plan.replay_tolerance)
+                first = last = None
+                for e in events:
+                    if e.kind in (EV_KEY_DOWN, EV_KEY_UP): continue  # τα backends στέλνουν μόνο mouse
+                    if first is None: first = e.t
+                    last = offset + e.t - first
+                    yield e._replace(t=last)
+            if not plan.replay_loop or last is None: return
+            offset = last + self.LOOP_GAP
+
+    def _deadline(self, e): return self._base + e.t / self.plan.replay_speed + self._shift
+
+    def _cycle(self):
+        e = self._next
+        end = self.clock() + self.SLICE
+        while e is not None:
+            dl = self._deadline(e)
+            if dl > end: break
+            if self._wait(dl - self.clock()): return
+            self._dispatch(e, dl)
+            e = self._next = next(self._events, None)
+        if self._wait(0): return
+        if e is None: self.stopped.set(); return  # τέλος της εγγραφής: ο arbiter καλεί το _finish
+        self._at(self._deadline(e), self._cycle)
+
+    def _dispatch(self, e, deadline):
+        b = self.backend
+        self.dispatched += 1
+        if e.kind == EV_MOVE: b.move_to(e.x, e.y)
+        elif e.kind == EV_DOWN:
+            btn = BUTTON_NAMES.get(e.button)
+            if btn not in ("left", "right", "middle"): return
+            x, y = e.x, e.y
+            if self.plan.replay_humanize: x, y = self._humanize(x, y)
+            b.move_to(x, y); b.press(btn); self._held.add(btn)
+            self.metrics.dispatch.observe(self.clock() - deadline)
+        elif e.kind == EV_UP:
+            btn = BUTTON_NAMES.get(e.button)
+            if btn not in self._held: return
+            b.release(btn); self._held.discard(btn)
+            self.metrics.clicks.inc()
+        elif e.kind == EV_SCROLL:
+            self._scroll(e.value); self.metrics.scrolls.inc()
+
+    def _humanize(self, x, y):
+        """Ίδιες κατανομές με τον PlanCompiler: offset έως move_jitter (μέχρι 20 px) και, στο 70% των
+        κλικ, overshoot ±15 px πριν το τελικό σημείο. Ο χρόνος του overshoot μεταθέτει το υπόλοιπο replay."""
+        r, j = self._rng, min(20, self.plan.jitter)
+        x, y = x + r.randint(-j, j), y + r.randint(-j, j)
+        if r.random() > 0.3:
+            t0 = self.clock()
+            self._glide(x + r.randint(-15, 15), y + r.randint(-15, 15), r.uniform(0.15, 0.3), "out")
+            if not self._wait(r.uniform(0.01, 0.05)): self._glide(x, y, r.uniform(0.1, 0.25), "inout")
+            self._shift += self.clock() - t0
+        return x, y
+
+# ---------- GUI ----------
+def _load_gui():
+    """Φορτώνει τα GUI modules και ορίζει τα ToolTip/App (μία φορά)."""
+    global tk, ctk, messagebox, simpledialog, filedialog, ToolTip, PointsList, App
+    if "App" in globals(): return
+    import tkinter as tk
+    import customtkinter as ctk
+    from tkinter import messagebox, simpledialog, filedialog
+
+    # --- TOOLTIP CLASS ---
+    class ToolTip:
+        def __init__(self, widget, text):
+            self.widget = widget
+            self.text = text
+            self.tip_window = None
+            self.widget.bind("<Enter>", self.show_tip)
+            self.widget.bind("<Leave>", self.hide_tip)
+
+        def show_tip(self, event=None):
+            if self.tip_window or not self.text: return
+            x, y, _cx, cy = self.widget.bbox("insert")
+            x = x + self.widget.winfo_rootx() + 25
+            y = y + cy + self.widget.winfo_rooty() + 25
+            self.tip_window = tw = tk.Toplevel(self.widget)
+            tw.wm_overrideredirect(True)
+            tw.attributes("-topmost", True)
+            tw.wm_geometry(f"+{x}+{y}")
+            label = tk.Label(tw, text=self.text, justify='left',
+                             background="#ffffe0", relief='solid', borderwidth=1,
+                             font=("tahoma", "9", "normal"), padx=5, pady=2)
+            label.pack(ipadx=1)
+
+        def hide_tip(self, event=None):
+            tw = self.tip_window
+            self.tip_window = None
+            if tw: tw.destroy()
+
+    # --- POINTS LIST ---
+    class PointsList(ctk.CTkFrame):
+        """Virtualized λίστα σημείων με επεξεργασία x/y στη θέση τους. Υπάρχουν μόνο ROWS γραμμές, που
+        ξαναχρησιμοποιούνται στο scroll, άρα 10 ή 10.000 σημεία κοστίζουν το ίδιο. Κάθε γραμμή θυμάται
+        τι δείχνει και αγγίζει τα widgets της μόνο όταν αλλάξει η δική της τιμή."""
+        ROWS = 5
+        SELECTED = "#1f538d"
+
+        def __init__(self, master, on_change):
+            super().__init__(master)
+            self.on_change = on_change  # καλείται μετά από κάθε αλλαγή των points από τη λίστα
+            self.points = PointSet()
+            self.top = 0; self.selected = None
+            self._rows = []
+            body = ctk.CTkFrame(self, fg_color="transparent")
+            body.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=3)
+            for r in range(self.ROWS):
+                f = ctk.CTkFrame(body, fg_color="transparent", corner_radius=4)
+                f.pack(fill="x", pady=1)
+                lbl = ctk.CTkLabel(f, text="", width=60, anchor="e")
+                lbl.pack(side="left", padx=5)
+                ex, ey = ctk.CTkEntry(f, width=70, state="disabled"), ctk.CTkEntry(f, width=70, state="disabled")
+                ex.pack(side="left", padx=2); ey.pack(side="left", padx=2)
+                for w in (f, lbl):
+                    w.bind("<Button-1>", lambda e, r=r: self._select(r))
+                for e_ in (ex, ey):
+                    e_.bind("<FocusIn>", lambda e, r=r: self._select(r))
+                    e_.bind("<Return>", lambda e, r=r: self._commit(r))
+                    e_.bind("<FocusOut>", lambda e, r=r: self._commit(r))
+                for w in (f, lbl, ex, ey): self._bind_wheel(w)
+                self._rows.append({"frame": f, "label": lbl, "x": ex, "y": ey, "shown": None})
+            self._bind_wheel(body)
+            self.bar = ctk.CTkScrollbar(self, command=self._yview)
+            self.bar.pack(side="right", fill="y", pady=3)
+
+        def _bind_wheel(self, w):
+            w.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+            w.bind("<Button-4>", lambda e: self.scroll(-1))
+            w.bind("<Button-5>", lambda e: self.scroll(1))
+
+        def set_points(self, points, reset=False):
+            if points is not self.points or reset:
+                self.points = points
+                if reset: self.top = 0; self.selected = None
+                elif self.selected is not None and self.selected >= len(points): self.selected = None
+            self.refresh()
+
+        def refresh(self):
+            n = len(self.points)
+            self.top = max(0, min(self.top, n - self.ROWS))
+            for r, row in enumerate(self._rows):
+                i = self.top + r
+                shown = (i, *self.points.xy(i), i == self.selected) if i < n else None
+                if shown == row["shown"]: continue
+                prev, row["shown"] = row["shown"], shown
+                if shown is None:
+                    row["label"].configure(text=""); row["frame"].configure(fg_color="transparent")
+                    for key in ("x", "y"):
+                        e = row[key]; e.configure(state="normal"); e.delete(0, 'end'); e.configure(state="disabled")
+                    continue
+                if prev is None:
+                    for key in ("x", "y"): row[key].configure(state="normal")
+                if prev is None or prev[0] != i: row["label"].configure(text=f"#{i + 1}")
+                App._put_entry(row["x"], shown[1]); App._put_entry(row["y"], shown[2])
+                if prev is None or prev[3] != shown[3]:
+                    row["frame"].configure(fg_color=self.SELECTED if shown[3] else "transparent")
+            if n > self.ROWS: self.bar.set(self.top / n, (self.top + self.ROWS) / n)
+            else: self.bar.set(0.0, 1.0)
+
+        def scroll(self, delta):
+            self.top += delta; self.refresh()
+
+        def scroll_to(self, i):
+            if i < self.top: self.top = i
+            elif i >= self.top + self.ROWS: self.top = i - self.ROWS + 1
+            self.refresh()
+
+        def _yview(self, *args):
+            n = len(self.points)
+            if args[0] == "moveto": self.top = int(float(args[1]) * n + 0.5)
+            elif args[0] == "scroll": self.top += int(args[1]) * (self.ROWS if args[2] == "pages" else 1)
+            self.refresh()
+
+        def _select(self, r):
+            i = self.top + r
+            if i < len(self.points) and i != self.selected: self.selected = i; self.refresh()
+
+        def _commit(self, r):
+            row = self._rows[r]
+            i = self.top + r
+            if row["shown"] is None or i >= len(self.points): return
+            try: x, y = int(row["x"].get()), int(row["y"].get())
+            except ValueError: row["shown"] = None; self.refresh(); return  # άκυρη τιμή: επιστροφή στην αποθηκευμένη
+            if (x, y) == self.points.xy(i): return
+            self.points.set_xy(i, x, y); self.on_change()
+
+        def remove_selected(self):
+            i = self.selected
+            if i is None: return
+            del self.points[i]
+            self.selected = min(i, len(self.points) - 1) if len(self.points) else None
+            self.refresh(); self.on_change()
+
+        def move_selected(self, d):
+            i = self.selected
+            if i is None or not 0 <= i + d < len(self.points): return
+            self.points.swap(i, i + d); self.selected = i + d
+            self.scroll_to(i + d); self.on_change()
+
+    class App(ctk.CTk):
+        def __init__(self, swap_ready=None):
+            super().__init__()
+            ctk.set_appearance_mode("dark")
+            ctk.set_default_color_theme("blue")
+            self.title("PeRGio Clicker")
+            self.geometry("560x900")
+
+            try:
+                if ICON_PATH.exists(): self.iconbitmap(str(ICON_PATH))
+            except Exception: pass
+
+            self.cfg = open_config()
+            self.runs = RunManager(self.cfg, on_exit=lambda run: self.after(0, self._run_finished, run))
+            self.watcher = ConfigWatcher(self.cfg, self._config_changed, metrics=self.runs.metrics)
+
+            self.grid_columnconfigure(0, weight=1)
+
+            # Header
+            top_frame = ctk.CTkFrame(self, fg_color="transparent")
+            top_frame.pack(fill="x", padx=10, pady=(10, 5))
+            ctk.CTkLabel(top_frame, text="PeRGio Clicker", font=ctk.CTkFont(size=26, weight="bold")).pack(side="left", padx=10)
+            ctk.CTkLabel(top_frame, text="Hotkeys: F6 (Start), F7 (Stop όλα), Ctrl+F7 (Stop), F8 (Εγγραφή)", font=ctk.CTkFont(size=11), text_color="gray").pack(side="right", padx=10, pady=10)
+
+            # Profiles
+            self.prof_frame = ctk.CTkFrame(self)
+            self.prof_frame.pack(fill="x", padx=20, pady=5)
+            ctk.CTkLabel(self.prof_frame, text="Προφίλ:").pack(side="left", padx=(10,5), pady=10)
+            self.prof_var = ctk.StringVar(value=self.cfg.raw_data["current_profile"])
+            self.prof_menu = ctk.CTkOptionMenu(self.prof_frame, variable=self.prof_var, command=self._change_profile)
+            self.prof_menu.pack(side="left", padx=5)
+            self.prof_menu.configure(values=list(self.cfg.raw_data["profiles"].keys()))
+
+            ctk.CTkButton(self.prof_frame, text="Νέο", width=50, command=self._new_profile).pack(side="left", padx=5)
+            ctk.CTkButton(self.prof_frame, text="Διαγραφή", width=60, fg_color="#dc3545", hover_color="#c82333", command=self._delete_profile).pack(side="left", padx=5)
+
+            # Points
+            self.points_frame = ctk.CTkFrame(self)
+            self.points_frame.pack(fill="x", padx=20, pady=10)
+
+            self.points_lbl = ctk.CTkLabel(self.points_frame, text="Σημεία: 0", font=ctk.CTkFont(weight="bold"))
+            self.points_lbl.pack(pady=(10, 5))
+
+            p_btn_frame = ctk.CTkFrame(self.points_frame, fg_color="transparent")
+            p_btn_frame.pack(pady=(0, 5))
+            btn_add = ctk.CTkButton(p_btn_frame, text="Προσθήκη Σημείου (3s)", width=150, command=self.add_point)
+            btn_add.pack(side="left", padx=5)
+            ToolTip(btn_add, "Πάτησε το, πήγαινε το ποντίκι στο σημείο και περίμενε.\nΜπορείς να προσθέσεις πολλά σημεία το ένα μετά το άλλο.")
+
+            btn_clear = ctk.CTkButton(p_btn_frame, text="Καθαρισμός", width=80, fg_color="#ffc107", text_color="black", hover_color="#e0a800", command=self.clear_points)
+            btn_clear.pack(side="left", padx=5)
+
+            self.points_list = PointsList(self.points_frame, on_change=self._points_changed)
+            self.points_list.pack(fill="x", padx=10)
+            pl_btns = ctk.CTkFrame(self.points_frame, fg_color="transparent")
+            pl_btns.pack(pady=(3, 10))
+            ctk.CTkButton(pl_btns, text="▲", width=30, command=lambda: self.points_list.move_selected(-1)).pack(side="left", padx=2)
+            ctk.CTkButton(pl_btns, text="▼", width=30, command=lambda: self.points_list.move_selected(1)).pack(side="left", padx=2)
+            btn_del = ctk.CTkButton(pl_btns, text="Αφαίρεση", width=70, fg_color="#dc3545", hover_color="#c82333", command=self.points_list.remove_selected)
+            btn_del.pack(side="left", padx=2)
+            ToolTip(btn_del, "Κλικ σε μια γραμμή για επιλογή· τα x/y αλλάζουν κατευθείαν στη λίστα (Enter).")
+            self._shown_profile = None; self._refresh_queued = False
+
+            self.recorder = None
+            self.rec_btn = ctk.CTkButton(p_btn_frame, text="Εγγραφή (F8)", width=110, fg_color="#6f42c1", hover_color="#5a32a3", command=self.toggle_record)
+            self.rec_btn.pack(side="left", padx=5)
+            ToolTip(self.rec_btn, "Καταγράφει κινήσεις, κλικ, scroll και πλήκτρα σε αρχείο (recordings/).\nΣτο τέλος τα αριστερά κλικ μπορούν να γίνουν σημεία του προφίλ.")
+
+            # Form
+            self.form = ctk.CTkScrollableFrame(self)  # οι ρυθμίσεις κυλάνε, ώστε το παράθυρο να χωράει στην οθόνη
+            self.form.pack(fill="both", expand=True, padx=20, pady=5)
+
+            # Click Type
+            type_frame = ctk.CTkFrame(self.form, fg_color="transparent")
+            type_frame.pack(fill="x", pady=2)
+            ctk.CTkLabel(type_frame, text="Τύπος Κλικ:", width=170, anchor="e").pack(side="left", padx=5)
+            self.click_type_var = ctk.StringVar(value="Αριστερό")
+            ctk.CTkOptionMenu(type_frame, variable=self.click_type_var, values=["Αριστερό", "Δεξί", "Διπλό"], width=100).pack(side="left", padx=5)
+
+            # Points Order
+            order_frame = ctk.CTkFrame(self.form, fg_color="transparent")
+            order_frame.pack(fill="x", pady=2)
+            ctk.CTkLabel(order_frame, text="Σειρά Σημείων:", width=170, anchor="e").pack(side="left", padx=5)
+            self.order_var = ctk.StringVar(value=ORDER_LABELS["as_recorded"])
+            ctk.CTkOptionMenu(order_frame, variable=self.order_var, values=list(ORDER_LABELS.values()), width=170).pack(side="left", padx=5)
+            order_i = ctk.CTkLabel(order_frame, text="(i)", font=ctk.CTkFont(size=12, slant="italic"), text_color="gray")
+            order_i.pack(side="left")
+            ToolTip(order_i, "Με 'Συντομότερη διαδρομή' τα σημεία επισκέπτονται με τη σειρά\nπου ελαχιστοποιεί τη συνολική μετακίνηση του ποντικιού.")
+
+            # Target
+            tg_frame = ctk.CTkFrame(self.form, fg_color="transparent")
+            tg_frame.pack(fill="x", pady=2)
+            ctk.CTkLabel(tg_frame, text="Στόχος:", width=170, anchor="e").pack(side="left", padx=5)
+            self.target_var = ctk.StringVar(value=TARGET_LABELS["points"])
+            ctk.CTkOptionMenu(tg_frame, variable=self.target_var, values=list(TARGET_LABELS.values()), width=80).pack(side="left", padx=5)
+            self.template_var = ctk.StringVar(value="")
+            ctk.CTkLabel(tg_frame, textvariable=self.template_var, width=80, anchor="w").pack(side="left", padx=2)
+            ctk.CTkButton(tg_frame, text="...", width=30, command=self._choose_template).pack(side="left", padx=2)
+            tg_cap = ctk.CTkButton(tg_frame, text="Λήψη (3s)", width=70, command=self.capture_template)
+            tg_cap.pack(side="left", padx=2)
+            ToolTip(tg_cap, "Πήγαινε το ποντίκι πάνω στο κουμπί/εικονίδιο και περίμενε:\nένα κομμάτι 48x48 γύρω του γίνεται η εικόνα-στόχος.\nΜε Στόχο 'Εικόνα' κάθε κλικ γίνεται εκεί που βρίσκεται τώρα στην οθόνη.")
+
+            # Trigger
+            tr_frame = ctk.CTkFrame(self.form, fg_color="transparent")
+            tr_frame.pack(fill="x", pady=2)
+            ctk.CTkLabel(tr_frame, text="Κλικ όταν:", width=170, anchor="e").pack(side="left", padx=5)
+            self.trigger_var = ctk.StringVar(value=TRIGGER_LABELS["timer"])
+            ctk.CTkOptionMenu(tr_frame, variable=self.trigger_var, values=list(TRIGGER_LABELS.values()), width=150).pack(side="left", padx=5)
+            tr_i = ctk.CTkLabel(tr_frame, text="(i)", font=ctk.CTkFont(size=12, slant="italic"), text_color="gray")
+            tr_i.pack(side="left")
+            ToolTip(tr_i, "Χρονόμετρο: κλικ κάθε 'Χρονικό Διάστημα'.\nΑλλαγή περιοχής / Εμφάνιση χρώματος / Σταθεροποίηση: η περιοχή\nπαρακολουθείται συνεχώς και το κλικ γίνεται μέσα σε λίγα ms από το γεγονός.")
+            wr_frame = ctk.CTkFrame(self.form, fg_color="transparent")
+            wr_frame.pack(fill="x", pady=2)
+            ctk.CTkLabel(wr_frame, text="Περιοχή / Χρώμα:", width=170, anchor="e").pack(side="left", padx=5)
+            self.watch_region_var = ctk.StringVar(value="")
+            ctk.CTkLabel(wr_frame, textvariable=self.watch_region_var, width=110, anchor="w").pack(side="left", padx=2)
+            wr_btn = ctk.CTkButton(wr_frame, text="Περιοχή (3s)", width=80, command=self.capture_watch_region)
+            wr_btn.pack(side="left", padx=2)
+            ToolTip(wr_btn, "Πήγαινε το ποντίκι στην πάνω αριστερή γωνία της περιοχής και περίμενε,\nμετά στην κάτω δεξιά και ξαναπερίμενε. Το χρώμα είναι αυτό κάτω από\nτο ποντίκι τη στιγμή της πρώτης λήψης.")
+            self.watch_color_entry = ctk.CTkEntry(wr_frame, width=70, placeholder_text="#rrggbb")
+            self.watch_color_entry.pack(side="left", padx=2)
+
+            self.interval_entry = self._add_field("Χρονικό Διάστημα (min):", "Πόση ώρα θα περιμένει το πρόγραμμα ανάμεσα σε κάθε κλικ.")
+
+            # Random Switch with Tooltip
+            self.rand_frame = ctk.CTkFrame(self.form, fg_color="transparent")
+            self.rand_frame.pack(fill="x", pady=10)
+            self.rand_switch = ctk.CTkSwitch(self.rand_frame, text="Τυχαίο Διάστημα")
+            self.rand_switch.pack(side="left", padx=(60, 5))
+            info_i = ctk.CTkLabel(self.rand_frame, text="(i)", font=ctk.CTkFont(size=12, slant="italic"), text_color="gray")
+            info_i.pack(side="left")
+            ToolTip(info_i, "Αν ενεργοποιηθεί, το κλικ θα γίνεται σε μια τυχαία στιγμή\nαπό 1 δευτερόλεπτο έως το 'Χρονικό Διάστημα' που έβαλες.")
+
+            self.scroll_entry = self._add_field("Scroll:", "Πόσο θα 'ρολάρει' (κυλήσει) η σελίδα ανάμεσα στα κλικ.")
+            self.move_jitter_entry = self._add_field("Τυχαία Μετακίνηση (px):", "Πόσα pixels θα κινείται τυχαία το ποντίκι γύρω από το σημείο.")
+            self.delay_entry = self._add_field("Καθυστέρηση (sec):", "Πόσα δευτερόλεπτα θα περιμένει το πρόγραμμα πριν ξεκινήσει το πρώτο κλικ.")
+            self.rate_entry = self._add_field("Μέγ. Κλικ / λεπτό:", "Ανώτατο όριο κλικ ανά λεπτό για αυτό το προφίλ (0 = χωρίς όριο).\nΧρήσιμο όταν τρέχουν πολλά προφίλ ταυτόχρονα.")
+
+            # Replay
+            rp_frame = ctk.CTkFrame(self.form, fg_color="transparent")
+            rp_frame.pack(fill="x", pady=2)
+            ctk.CTkLabel(rp_frame, text="Replay Εγγραφής:", width=170, anchor="e").pack(side="left", padx=5)
+            self.replay_var = ctk.StringVar(value="")
+            ctk.CTkLabel(rp_frame, textvariable=self.replay_var, width=130, anchor="w").pack(side="left", padx=5)
+            ctk.CTkButton(rp_frame, text="...", width=30, command=self._choose_replay).pack(side="left", padx=2)
+            ctk.CTkButton(rp_frame, text="✕", width=30, fg_color="#6c757d", hover_color="#5a6268", command=lambda: self.replay_var.set("")).pack(side="left", padx=2)
+            self.replay_speed_entry = self._add_field("Ταχύτητα Replay (x):", "2 = διπλάσια ταχύτητα, 0.5 = μισή.\nΤο replay σταματάει με F7 όπως κάθε run.")
+            rp_sw = ctk.CTkFrame(self.form, fg_color="transparent")
+            rp_sw.pack(fill="x", pady=4)
+            self.replay_loop_switch = ctk.CTkSwitch(rp_sw, text="Επανάληψη")
+            self.replay_loop_switch.pack(side="left", padx=(60, 5))
+            self.replay_humanize_switch = ctk.CTkSwitch(rp_sw, text="Ανθρώπινα κλικ")
+            self.replay_humanize_switch.pack(side="left", padx=5)
+            rp_i = ctk.CTkLabel(rp_sw, text="(i)", font=ctk.CTkFont(size=12, slant="italic"), text_color="gray")
+            rp_i.pack(side="left")
+            ToolTip(rp_i, "Με εγγραφή επιλεγμένη, η ΕΝΑΡΞΗ την αναπαράγει αντί για τα σημεία.\n'Ανθρώπινα κλικ': νέα τυχαία offsets (έως την Τυχαία Μετακίνηση) και overshoot σε κάθε κλικ.")
+
+            self._refresh_form()
+
+            # Action Buttons
+            self.btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+            self.btn_frame.pack(fill="x", padx=20, pady=15)
+            self.start_btn = ctk.CTkButton(self.btn_frame, text="ΕΝΑΡΞΗ (F6)", command=self.start, fg_color="#28a745", hover_color="#218838", font=ctk.CTkFont(weight="bold"))
+            self.start_btn.grid(row=0, column=0, padx=(0,5), sticky="ew")
+            self.stop_btn = ctk.CTkButton(self.btn_frame, text="ΠΑΥΣΗ (F7)", command=self.stop, fg_color="#dc3545", hover_color="#c82333", font=ctk.CTkFont(weight="bold"), state="disabled")
+            self.stop_btn.grid(row=0, column=1, padx=(5,0), sticky="ew")
+            self.btn_frame.grid_columnconfigure((0,1), weight=1)
+
+            self.runs_lbl = ctk.CTkLabel(self, text="Ενεργά: -", font=ctk.CTkFont(size=11))
+            self.runs_lbl.pack(pady=(0, 2))
+
+            self.status_bar = ctk.CTkLabel(self, text="Έτοιμο", font=ctk.CTkFont(size=11), text_color="gray")
+            self.status_bar.pack(side="bottom", pady=5)
+
+            # Start background threads
+            self.watcher.start()
+
+            # Hotkeys: το keyboard (global hook) φορτώνεται αφού σχεδιαστεί το παράθυρο
+            self._keyboard = None
+            self.after_idle(self._setup_hotkeys)
+
+            self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+            # Hot-swap του core: ο launcher δίνει swap_ready() και το App κλείνει μόνο του στο πρώτο
+            # idle σημείο (κανένα run, καμία εγγραφή). Το config γίνεται flush και το ξαναδιαβάζει το νέο core.
+            # Τα runs δεν περνάνε στο νέο core (άλλες κλάσεις, άλλα threads): γι' αυτό το swap τα περιμένει
+            self.swap_ready = swap_ready
+            self.swapping = False
+            self._swap_notice = False
+            if swap_ready: self.after(self.SWAP_POLL_MS, self._poll_swap)
+
+        SWAP_POLL_MS = 5000
+
+        def _poll_swap(self):
+            try: ready = self.swap_ready()
+            except Exception: ready = False
+            if ready and not self.runs.runs and self.recorder is None:
+                self.swapping = True; self.on_close(); return
+            if ready and not self._swap_notice:
+                self._swap_notice = True
+                self.status_bar.configure(text="Νέα έκδοση: εφαρμόζεται όταν σταματήσουν όλα τα runs (το παράθυρο θα ξανανοίξει)")
+            self.after(self.SWAP_POLL_MS, self._poll_swap)
+
+        def _add_field(self, label_text, tooltip_text):
+            frame = ctk.CTkFrame(self.form, fg_color="transparent")
+            frame.pack(fill="x", pady=2)
+            ctk.CTkLabel(frame, text=label_text, width=170, anchor="e").pack(side="left", padx=5)
+            entry = ctk.CTkEntry(frame, width=70)
+            entry.pack(side="left", padx=5)
+            info = ctk.CTkLabel(frame, text="(i)", font=ctk.CTkFont(size=12, slant="italic"), text_color="gray")
+            info.pack(side="left")
+            ToolTip(info, tooltip_text)
+            return entry
+
+        def _setup_hotkeys(self):
+            try:
+                import keyboard
+                keyboard.add_hotkey('F6', self._hotkey_start)
+                keyboard.add_hotkey('F7', self._hotkey_stop)
+                keyboard.add_hotkey('ctrl+F7', self._hotkey_stop_current)
+                keyboard.add_hotkey('F8', lambda: self.after(0, self.toggle_record))
+                self._keyboard = keyboard
+            except Exception: pass
+
+        def _hotkey_start(self):
+            if not self.running: self.after(0, self.start)
+
+        def _hotkey_stop(self):
+            # stop() αγγίζει μόνο flags/events, άρα καλείται κατευθείαν από το thread του keyboard
+            self.runs.stop_all()
+
+        def _hotkey_stop_current(self): self.stop()
+
+        def _change_profile(self, new_val):
+            self.cfg.raw_data["current_profile"] = new_val
+            self.cfg.save()
+            self._refresh_form(); self._refresh_buttons()
+
+        def _new_profile(self):
+            name = simpledialog.askstring("Νέο Προφίλ", "Όνομα νέου προφίλ:", parent=self)
+            if name and name.strip():
+                name = name.strip()
+                self.cfg.raw_data["profiles"][name] = dict(DEFAULTS)
+                self.cfg.raw_data["current_profile"] = name
+                self.prof_menu.configure(values=list(self.cfg.raw_data["profiles"].keys()))
+                self.prof_var.set(name)
+                self.cfg.save()
+                self._refresh_form()
+
+        def _delete_profile(self):
+            cp = self.cfg.raw_data["current_profile"]
+            if cp == "Default":
+                messagebox.showwarning("Προσοχή", "Το Προφίλ 'Default' δεν μπορεί να διαγραφεί.")
+                return
+            if messagebox.askyesno("Επιβεβαίωση", f"Διαγραφή του προφίλ '{cp}';"):
+                del self.cfg.raw_data["profiles"][cp]
+                new_cp = list(self.cfg.raw_data["profiles"].keys())[0]
+                self.cfg.raw_data["current_profile"] = new_cp
+                self.prof_menu.configure(values=list(self.cfg.raw_data["profiles"].keys()))
+                self.prof_var.set(new_cp)
+                self.cfg.save()
+                self._refresh_form()
+
+        def _refresh_points_lbl(self):
+            n = len(self.cfg.data["points"])
+            title = f"Σημεία: {n}" if n else "Σημεία: 0 (Κενό)"
+            if self.points_lbl.cget("text") != title: self.points_lbl.configure(text=title)
+
+        def _points_changed(self):
+            self.cfg.save(); self._refresh_points_lbl()
+
+        # Incremental refresh: κάθε widget αλλάζει μόνο αν η τιμή του διαφέρει από αυτή που δείχνει ήδη,
+        # ώστε ένα reload να μη σβήνει/ξαναγράφει όλα τα πεδία (ούτε αυτό που επεξεργάζεται ο χρήστης)
+        @staticmethod
+        def _put_entry(entry, value):
+            text = str(value)
+            if entry.get() != text: entry.delete(0, 'end'); entry.insert(0, text)
+
+        @staticmethod
+        def _put_var(var, value):
+            if var.get() != value: var.set(value)
+
+        @staticmethod
+        def _put_switch(sw, on):
+            if bool(sw.get()) != bool(on): sw.select() if on else sw.deselect()
+
+        def _refresh_form(self):
+            self._refresh_queued = False
+            d = self.cfg.data
+            name = self.cfg.raw_data["current_profile"]
+            self.points_list.set_points(d["points"], reset=name != self._shown_profile)
+            self._shown_profile = name
+            self._refresh_points_lbl()
+            for entry, key in ((self.interval_entry, "interval_minutes"), (self.scroll_entry, "scroll"),
+                               (self.move_jitter_entry, "move_jitter"), (self.delay_entry, "start_delay_sec"),
+                               (self.rate_entry, "max_clicks_per_min"), (self.replay_speed_entry, "replay_speed")):
+                self._put_entry(entry, d.get(key, DEFAULTS[key]))
+            self._put_entry(self.watch_color_entry, d.get("watch_color") or "")
+            for sw, key in ((self.replay_loop_switch, "replay_loop"), (self.replay_humanize_switch, "replay_humanize"),
+                            (self.rand_switch, "use_random_timing")):
+                self._put_switch(sw, d.get(key))
+            tpl = d.get("template") or ""
+            wr = d.get("watch_region")
+            for var, value in ((self.replay_var, d.get("replay") or ""), (self.click_type_var, d.get("click_type", "Αριστερό")),
+                               (self.order_var, ORDER_LABELS.get(d.get("order"), ORDER_LABELS["as_recorded"])),
+                               (self.target_var, TARGET_LABELS.get(d.get("target"), TARGET_LABELS["points"])),
+                               (self.template_var, tpl if isinstance(tpl, str) else "; ".join(tpl)),
+                               (self.trigger_var, TRIGGER_LABELS.get(d.get("trigger"), TRIGGER_LABELS["timer"])),
+                               (self.watch_region_var, ",".join(str(v) for v in wr) if wr else "")):
+                self._put_var(var, value)
+
+        def _save_form(self):
+            try:
+                self.cfg.data.update({
+                    "interval_minutes": float(self.interval_entry.get()),
+                    "use_random_timing": bool(self.rand_switch.get()),
+                    "scroll": int(self.scroll_entry.get()),
+                    "move_jitter": int(self.move_jitter_entry.get()),
+                    "start_delay_sec": int(self.delay_entry.get()),
+                    "max_clicks_per_min": max(0.0, float(self.rate_entry.get())),
+                    "replay": self.replay_var.get(),
+                    "replay_speed": float(self.replay_speed_entry.get()),
+                    "replay_loop": bool(self.replay_loop_switch.get()),
+                    "replay_humanize": bool(self.replay_humanize_switch.get()),
+                    "click_type": self.click_type_var.get(),
+                    "order": next(k for k, v in ORDER_LABELS.items() if v == self.order_var.get()),
+                    "target": next(k for k, v in TARGET_LABELS.items() if v == self.target_var.get()),
+                    "template": self._templates(),
+                    "trigger": next(k for k, v in TRIGGER_LABELS.items() if v == self.trigger_var.get()),
+                    "watch_region": [int(v) for v in self.watch_region_var.get().split(",")] if self.watch_region_var.get() else None,
+                    "watch_color": self.watch_color_entry.get().strip()
+                })
+                self.cfg.save(); return True
+            except ValueError: messagebox.showerror("Λάθος", "Ελέγξτε τις τιμές."); return False
+
+        def add_point(self):
+            self.status_bar.configure(text="Καταγραφή ποντικιού σε 3s...")
+            self.after(3000, self._capture)
+
+        def clear_points(self):
+            self.cfg.data["points"].clear()
+            self.points_list.selected = None; self.points_list.refresh()
+            self._points_changed()
+
+        def _capture(self):
+            x, y = _pyautogui().position()
+            pts = self.cfg.data["points"]
+            dup = pts.find_duplicate(int(x), int(y))
+            if dup is not None:
+                self.status_bar.configure(text=f"Το σημείο ({x}, {y}) υπάρχει ήδη (#{dup + 1})"); return
+            i = pts.append((int(x), int(y)))
+            self._points_changed(); self.points_list.scroll_to(i)
+            self.status_bar.configure(text=f"Προστέθηκε σημείο: ({x}, {y})")
+
+        def start(self):
+            name = self.cfg.raw_data["current_profile"]
+            if self.runs.is_running(name): return
+            image = self.target_var.get() == TARGET_LABELS["image"]
+            if image and not self.template_var.get():
+                messagebox.showwarning("Προσοχή", "Επιλέξτε ή τραβήξτε μια εικόνα-στόχο."); return
+            if not image and not self.cfg.data.get("points") and not self.replay_var.get():
+                messagebox.showwarning("Προσοχή", "Ορίστε τουλάχιστον ένα σημείο κλικ."); return
+            trigger = self.trigger_var.get()
+            if trigger != TRIGGER_LABELS["timer"] and not self.watch_region_var.get():
+                messagebox.showwarning("Προσοχή", "Ορίστε την περιοχή που θα παρακολουθείται."); return
+            if trigger == TRIGGER_LABELS["color"] and _parse_color(self.watch_color_entry.get()) is None:
+                messagebox.showwarning("Προσοχή", "Ορίστε χρώμα στη μορφή #rrggbb."); return
+            if not self._save_form(): return
+
+            if not self.runs.runs: self.iconify()
+            self.status_bar.configure(text=f"Εκτέλεση '{name}'...")
+            self.runs.start(name, on_status=lambda text: self.after(0, lambda: self.status_bar.configure(text=f"{name}: {text}")))
+            self._refresh_buttons()
+
+        @property
+        def running(self): return self.runs.is_running(self.cfg.raw_data["current_profile"])
+
+        def stop(self): self.runs.stop(self.cfg.raw_data["current_profile"])
+
+        def _refresh_buttons(self):
+            on = self.running
+            self.start_btn.configure(state="disabled" if on else "normal")
+            self.stop_btn.configure(state="normal" if on else "disabled")
+            self.runs_lbl.configure(text="Ενεργά: " + (", ".join(self.runs.runs) or "-"))
+
+        def _run_finished(self, run):
+            self._refresh_buttons()
+            self.status_bar.configure(text=f"Σταμάτησε '{run.profile}' ({run.summary()})")
+
+        def _choose_replay(self):
+            path = filedialog.askopenfilename(parent=self, title="Εγγραφή για replay", initialdir=str(REC_DIR if REC_DIR.exists() else APP_DIR),
+                                              filetypes=[("PeRGio recording", "*.pgrec"), ("All files", "*.*")])
+            if not path: return
+            p = Path(path)
+            try: MacroRecording(p).close()
+            except (OSError, ValueError) as e: messagebox.showerror("Λάθος", str(e)); return
+            # Μέσα στο recordings/ αποθηκεύεται σχετικό path, ώστε το profile να μεταφέρεται μαζί με τον φάκελο
+            self.replay_var.set(p.name if p.parent.resolve() == REC_DIR.resolve() else str(p))
+
+        def _templates(self):
+            # Πολλές εικόνες χωρίζονται με "; " στο label και αποθηκεύονται ως λίστα
+            names = [t for t in self.template_var.get().split("; ") if t]
+            return names if len(names) > 1 else "".join(names)
+
+        def _choose_template(self):
+            paths = filedialog.askopenfilenames(parent=self, title="Εικόνες-στόχοι (κλικ στην πρώτη που βρεθεί)",
+                                                initialdir=str(TEMPLATE_DIR if TEMPLATE_DIR.exists() else APP_DIR),
+                                                filetypes=[("Images", "*.png *.bmp *.jpg"), ("All files", "*.*")])
+            if not paths: return
+            names = []
+            for path in paths:
+                p = Path(path)
+                try: TemplateMatcher.load(p)
+                except (OSError, ValueError) as e: messagebox.showerror("Λάθος", f"{p.name}: {e}"); return
+                names.append(p.name if p.parent.resolve() == TEMPLATE_DIR.resolve() else str(p))
+            self.template_var.set("; ".join(names))
+            self.target_var.set(TARGET_LABELS["image"])
+
+        def capture_template(self):
+            self.status_bar.configure(text="Λήψη εικόνας-στόχου σε 3s...")
+            self.after(3000, self._capture_template)
+
+        def _capture_template(self):
+            pg = _pyautogui()
+            x, y = pg.position()
+            sw, sh = pg.size()
+            half = TEMPLATE_SIDE // 2
+            x0, y0 = max(0, min(int(x) - half, sw - TEMPLATE_SIDE)), max(0, min(int(y) - half, sh - TEMPLATE_SIDE))
+            TEMPLATE_DIR.mkdir(exist_ok=True)
+            path = TEMPLATE_DIR / time.strftime("target-%Y%m%d-%H%M%S.png")
+            try: pg.screenshot(region=(x0, y0, TEMPLATE_SIDE, TEMPLATE_SIDE)).save(path)
+            except Exception as e: messagebox.showerror("Λάθος", str(e)); return
+            self.template_var.set(path.name); self.target_var.set(TARGET_LABELS["image"])
+            self.status_bar.configure(text=f"Εικόνα-στόχος: {path.name}")
+
+        def capture_watch_region(self):
+            self.status_bar.configure(text="Πάνω αριστερή γωνία σε 3s...")
+            self.after(3000, self._capture_watch_corner)
+
+        def _capture_watch_corner(self):
+            pg = _pyautogui()
+            x, y = (int(v) for v in pg.position())
+            try: r, g, b = pg.pixel(x, y)[:3]
+            except Exception: r = None
+            if r is not None and not self.watch_color_entry.get().strip():
+                self.watch_color_entry.insert(0, f"#{r:02x}{g:02x}{b:02x}")
+            self.status_bar.configure(text="Κάτω δεξιά γωνία σε 3s...")
+            self.after(3000, self._capture_watch_region, x, y)
+
+        def _capture_watch_region(self, x0, y0):
+            x1, y1 = (int(v) for v in _pyautogui().position())
+            x, y = min(x0, x1), min(y0, y1)
+            w, h = abs(x1 - x0) + 1, abs(y1 - y0) + 1
+            self.watch_region_var.set(f"{x},{y},{w},{h}")
+            if self.trigger_var.get() == TRIGGER_LABELS["timer"]: self.trigger_var.set(TRIGGER_LABELS["change"])
+            self.status_bar.configure(text=f"Περιοχή παρακολούθησης: {w}x{h} στο ({x}, {y})")
+
+        def toggle_record(self):
+            if self.recorder is None: self._start_record()
+            else: self._stop_record()
+
+        def _start_record(self):
+            if missing_deps("mouse"):
+                messagebox.showerror("Λάθος", f"Η εγγραφή χρειάζεται το πακέτο 'mouse':\n{sys.executable} -m pip install mouse"); return
+            REC_DIR.mkdir(exist_ok=True)
+            path = REC_DIR / time.strftime("%Y%m%d-%H%M%S.pgrec")
+            rec = Recorder(path)
+            try: rec.start()
+            except Exception as e:
+                rec.stop(); messagebox.showerror("Λάθος", f"Η εγγραφή δεν ξεκίνησε: {e}"); return
+            self.recorder = rec
+            self.rec_btn.configure(text="Διακοπή (F8)")
+            self.status_bar.configure(text=f"Εγγραφή σε {path.name}... (F8 για διακοπή)")
+
+        def _stop_record(self):
+            rec, self.recorder = self.recorder, None
+            path = rec.stop()
+            self.rec_btn.configure(text="Εγγραφή (F8)")
+            win = (self.winfo_rootx(), self.winfo_rooty(), self.winfo_width(), self.winfo_height())
+            with MacroRecording(path) as r:
+                n = len(r.clicks(exclude=win))  # χωρίς τα κλικ πάνω στο ίδιο το παράθυρο (π.χ. το κουμπί διακοπής)
+                text = f"Εγγραφή {path.name}: {len(r)} γεγονότα, {r.duration:.0f}s, {n} κλικ"
+                if rec.ring.dropped: text += f", χάθηκαν {rec.ring.dropped}"
+                self.status_bar.configure(text=text)
+                if n and messagebox.askyesno("Εγγραφή", f"{text}.\nΠροσθήκη των κλικ ως σημεία του προφίλ;"):
+                    added = r.to_points(self.cfg.data["points"], exclude=win)
+                    self.cfg.save(); self._refresh_form()
+                    self.status_bar.configure(text=f"Προστέθηκαν {added} σημεία από {path.name}")
+
+        def on_close(self): 
+            if self.recorder: self.recorder.stop()  # πριν το unhook_all, που θα έβγαζε και το hook της εγγραφής
+            self.watcher.stop(); self.runs.shutdown()
+            self.cfg.flush()
+            try: self._keyboard and self._keyboard.unhook_all()
+            except: pass
+            self.destroy()
+
+        def _config_changed(self):
+            # Από το thread του watcher: μια ριπή reloads γίνεται ένα μόνο refresh στο Tk loop
+            self.runs.reload()
+            if not self._refresh_queued:
+                self._refresh_queued = True; self.after(0, self._refresh_form)
+
+def __getattr__(name):
+    # `PeRGio_Clicker_core.App` από τον launcher: το GUI φορτώνεται την πρώτη φορά που ζητηθεί
+    if name in ("App", "ToolTip", "PointsList"):
+        _load_gui(); return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ---------- CLI ----------
+def run_headless(profiles=None, config=None, backend=None):
+    """Εκτελεί ένα ή περισσότερα profiles ταυτόχρονα χωρίς GUI. SIGINT/SIGTERM = stop, SIGHUP = reload ρυθμίσεων."""
+    import signal
+    _headless()
+    cfg = open_config(Path(config) if config else None)
+    names = list(dict.fromkeys(profiles or [cfg.raw_data.get("current_profile", "Default")]))
+    for name in names:
+        if name not in cfg.raw_data["profiles"]:
+            print(f"Profile '{name}' not found", file=sys.stderr); return 2
+        if backend:
+            cfg.raw_data["profiles"][name]["backend"] = backend
+        try: RunPlan(cfg.raw_data["profiles"][name], name=name)
+        except ValueError as e:
+            print(f"Profile '{name}': {e}", file=sys.stderr); return 2
+    log = lambda text: print(f"[{time.strftime('%H:%M:%S')}] {text}", file=sys.stderr, flush=True)
+    errors = []
+    def _exit(run):
+        if run.error is not None: errors.append(run)
+        log(f"'{run.profile}' stopped ({run.summary()})")
+    manager = RunManager(cfg, on_exit=_exit)
+
+    def _reload():
+        manager.reload(); log("reload")
+    watcher = ConfigWatcher(cfg, _reload, metrics=manager.metrics)
+    signal.signal(signal.SIGINT, lambda *_: manager.stop_all())
+    signal.signal(signal.SIGTERM, lambda *_: manager.stop_all())
+    if hasattr(signal, "SIGHUP"): signal.signal(signal.SIGHUP, lambda *_: watcher.reload(force=True))
+
+    log(f"run {', '.join(repr(n) for n in names)} ({cfg.path.name})")
+    runs = [manager.start(name, on_status=lambda text, name=name: log(f"{name}: {text}")) for name in names]
+    watcher.start()
+    try:
+        # Σε POSIX το wait χωρίς timeout διακόπτεται από signals· στα Windows χρειάζεται timeout
+        for run in runs:
+            while not run.done.wait(None if os.name == "posix" else 1.0): pass
+    finally:
+        watcher.stop(); manager.shutdown(); cfg.flush()
+    return 1 if errors else 0
+
+def run_record(out=None, seconds=None, keys=True):
+    """Εγγραφή χωρίς GUI· Ctrl+C (ή --seconds) τη σταματάει."""
+    _headless()
+    missing = missing_deps("mouse", *(["keyboard"] if keys else []))
+    if missing:
+        print(f"Λείπουν πακέτα: {' '.join(missing)}\n  {sys.executable} -m pip install {' '.join(missing)}", file=sys.stderr); return 1
+    if out is None:
+        REC_DIR.mkdir(exist_ok=True); out = REC_DIR / time.strftime("%Y%m%d-%H%M%S.pgrec")
+    rec = Recorder(out, keys=keys)
+    rec.start()
+    print(f"recording to {out} (Ctrl+C to stop)", file=sys.stderr)
+    try: time.sleep(seconds) if seconds else threading.Event().wait()
+    except KeyboardInterrupt: pass
+    finally: rec.stop()
+    with MacroRecording(out) as r:
+        print(f"{len(r)} events, {r.duration:.1f}s, {len(r.clicks())} left clicks, dropped {rec.ring.dropped}", file=sys.stderr)
+    return 0
+
+def run_replay(args):
+    """Replay μιας εγγραφής ως προσωρινό profile (όχι στις ρυθμίσεις). SIGINT/SIGTERM = stop."""
+    import signal
+    _headless()
+    prof = dict(DEFAULTS, replay=str(Path(args.recording).resolve()), replay_speed=args.speed, replay_loop=args.loop,
+                replay_tolerance=args.tolerance, replay_humanize=args.humanize, move_jitter=args.jitter,
+                backend=args.backend, start_delay_sec=args.delay, seed=args.seed)
+    cfg = type("ReplayConfig", (), {})()
+    cfg.raw_data = {"profiles": {"replay": prof}, "current_profile": "replay"}
+    try:
+        with MacroRecording(prof["replay"]) as rec: recorded = len(rec)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr); return 2
+    log = lambda text: print(f"[{time.strftime('%H:%M:%S')}] {text}", file=sys.stderr, flush=True)
+    if args.dry_run:
+        if args.loop: print("--dry-run with --loop never ends", file=sys.stderr); return 2
+        mgr = SimManager(cfg); run = mgr.start("replay")
+        while not run.done.is_set() and mgr.sched._heap: mgr.sched.run_until(mgr.clock.t + 3600)
+        mgr.stop_all()
+        ev = run.backend.events
+        took = (ev[-1][0] if ev else 0.0) - prof["start_delay_sec"]
+        log(f"recorded {recorded} events, dispatched {getattr(run, 'dispatched', 0)}, backend calls {len(ev)}, {took:.1f}s")
+        return 1 if run.error is not None else 0
+    mgr = RunManager(cfg)
+    signal.signal(signal.SIGINT, lambda *_: mgr.stop_all())
+    signal.signal(signal.SIGTERM, lambda *_: mgr.stop_all())
+    run = mgr.start("replay", on_status=log)
+    try:
+        while not run.done.wait(None if os.name == "posix" else 1.0): pass
+    finally:
+        mgr.shutdown()
+    log(f"stopped: dispatched {getattr(run, 'dispatched', 0)}/{recorded} events ({run.summary()})")
+    return 1 if run.error is not None else 0
+
+def run_simulation(profile=None, config=None, hours=24.0, seed=None, trace=None):
+    """Τυπώνει τα στατιστικά της προσομοίωσης σε JSON και (προαιρετικά) γράφει το trace."""
+    cfg = open_config(Path(config) if config else None)
+    name = profile or cfg.raw_data.get("current_profile", "Default")
+    if name not in cfg.raw_data["profiles"]:
+        print(f"Profile '{name}' not found", file=sys.stderr); return 2
+    prof = cfg.raw_data["profiles"][name]
+    t0 = time.perf_counter()
+    try: events, summary = simulate(prof, hours, seed, name=name)
+    except ValueError as e:
+        print(f"Profile '{name}': {e}", file=sys.stderr); return 2
+    summary["wall_sec"] = time.perf_counter() - t0
+    if trace:
+        with open(trace, "w", encoding="utf-8") as f:
+            for e in events: f.write(json.dumps(e) + "\n")
+    print(json.dumps(summary, indent=2))
+    return 0
+
+@contextlib.contextmanager
+def _metrics_exporters(args):
+    """Ξεκινάει endpoint/JSON dump αν ζητήθηκαν και τα σταματάει (με ένα τελευταίο dump) στο τέλος."""
+    srv = serve_metrics(args.metrics_port) if args.metrics_port else None
+    dump = MetricsDump(args.metrics_json, args.metrics_interval) if args.metrics_json else None
+    if dump: dump.start()
+    try: yield
+    finally:
+        if srv: srv.shutdown(); srv.server_close()
+        if dump: dump.stop()
+
+def main(argv=None, swap_ready=None):
+    """CLI/GUI. swap_ready: callable του launcher (True = υπάρχει νεότερο επαληθευμένο core)· τότε
+    το GUI κλείνει στο πρώτο idle σημείο και η main επιστρέφει EXIT_SWAP."""
+    import argparse
+    # Τα --metrics-* δουλεύουν και πριν και μετά το `run` (SUPPRESS: ο subparser δεν πατάει τις τιμές του γονέα)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--metrics-port", type=int, default=argparse.SUPPRESS, help="Prometheus endpoint στο 127.0.0.1:PORT/metrics")
+    common.add_argument("--metrics-json", default=argparse.SUPPRESS, help="περιοδικό JSON dump των metrics σε αυτό το αρχείο")
+    common.add_argument("--metrics-interval", type=float, default=argparse.SUPPRESS, help=f"δευτερόλεπτα ανάμεσα στα dumps (προεπιλογή {MetricsDump.INTERVAL:g})")
+    ap = argparse.ArgumentParser(prog="PeRGio_Clicker_core", description="PeRGio Clicker", parents=[common])
+    ap.set_defaults(metrics_port=None, metrics_json=None, metrics_interval=None)
+    sub = ap.add_subparsers(dest="cmd")
+    r = sub.add_parser("run", parents=[common], help="headless εκτέλεση profiles (χωρίς tkinter/customtkinter)")
+    r.add_argument("--profile", action="append", help="όνομα profile, επαναλαμβάνεται για ταυτόχρονα runs (προεπιλογή: το current_profile)")
+    r.add_argument("--config", help="coords_minutes.json ή .db (προεπιλογή: δίπλα στην εφαρμογή)")
+    r.add_argument("--backend", choices=sorted(BACKENDS), help="override του backend του profile")
+    sm = sub.add_parser("simulate", help="προσομοίωση ενός profile σε εικονικό χρόνο (χωρίς αναμονές και ποντίκι)")
+    sm.add_argument("--profile", help="όνομα profile (προεπιλογή: το current_profile)")
+    sm.add_argument("--config", help="coords_minutes.json ή .db (προεπιλογή: δίπλα στην εφαρμογή)")
+    sm.add_argument("--hours", type=float, default=24.0, help="εικονικές ώρες (προεπιλογή 24)")
+    sm.add_argument("--seed", type=int, help="seed για αναπαραγώγιμα αποτελέσματα")
+    sm.add_argument("--trace", help="trace ανά ενέργεια σε JSON Lines")
+    rc = sub.add_parser("record", help="εγγραφή mouse/keyboard σε αρχείο .pgrec μέχρι Ctrl+C ή --seconds")
+    rc.add_argument("out", nargs="?", help=f"αρχείο εξόδου (προεπιλογή: {REC_DIR.name}/<ώρα>.pgrec)")
+    rc.add_argument("--seconds", type=float, help="διάρκεια εγγραφής")
+    rc.add_argument("--no-keys", action="store_true", help="χωρίς πλήκτρα (μόνο mouse)")
+    ip = sub.add_parser("import-recording", help="τα κλικ μιας εγγραφής ως σημεία ενός profile")
+    ip.add_argument("recording")
+    ip.add_argument("--profile", help="όνομα profile (προεπιλογή: το current_profile)")
+    ip.add_argument("--config", help="coords_minutes.json ή .db (προεπιλογή: δίπλα στην εφαρμογή)")
+    ip.add_argument("--button", choices=sorted(BUTTON_CODES), default="left")
+    rp = sub.add_parser("replay", help="αναπαραγωγή μιας εγγραφής .pgrec χωρίς GUI (Ctrl+C = stop)")
+    rp.add_argument("recording")
+    rp.add_argument("--speed", type=float, default=1.0, help="κλιμάκωση χρόνου (2 = διπλάσια ταχύτητα)")
+    rp.add_argument("--loop", action="store_true")
+    rp.add_argument("--tolerance", type=float, default=DEFAULTS["replay_tolerance"], help="px για τη decimation των κινήσεων (0 = όλα τα events)")
+    rp.add_argument("--humanize", action="store_true", help="νέα τυχαία offsets/overshoot στα κλικ")
+    rp.add_argument("--jitter", type=int, default=DEFAULTS["move_jitter"], help="μέγιστο offset του --humanize σε px")
+    rp.add_argument("--backend", choices=sorted(BACKENDS), default="pyautogui")
+    rp.add_argument("--delay", type=float, default=3.0, help="sec πριν την έναρξη")
+    rp.add_argument("--seed", type=int)
+    rp.add_argument("--dry-run", action="store_true", help="σε εικονικό χρόνο, χωρίς ποντίκι: μόνο πόσα events θα σταλούν")
+    m = sub.add_parser("migrate-sqlite", help="μετατροπή του coords_minutes.json σε coords_minutes.db")
+    m.add_argument("--config", default=str(CONFIG_PATH))
+    m.add_argument("--db", default=str(DB_PATH))
+    args = ap.parse_args(argv)
+
+    if args.cmd == "run":
+        with _metrics_exporters(args): return run_headless(args.profile, args.config, args.backend)
+    if args.cmd == "simulate":
+        return run_simulation(args.profile, args.config, args.hours, args.seed, args.trace)
+    if args.cmd == "replay":
+        return run_replay(args)
+    if args.cmd == "record":
+        return run_record(args.out, args.seconds, not args.no_keys)
+    if args.cmd == "import-recording":
+        cfg = open_config(Path(args.config) if args.config else None)
+        name = args.profile or cfg.raw_data.get("current_profile", "Default")
+        if name not in cfg.raw_data["profiles"]:
+            print(f"Profile '{name}' not found", file=sys.stderr); return 2
+        prof = cfg.raw_data["profiles"][name]
+        prof["points"] = points = PointSet.from_json(prof.get("points"))
+        with MacroRecording(args.recording) as r: added = r.to_points(points, args.button)
+        cfg.save(); cfg.flush()
+        print(f"{added} points added to '{name}' ({len(points)} total)")
+        return 0
+    if args.cmd == "migrate-sqlite":
+        if Path(args.db).exists():
+            print(f"{args.db} already exists", file=sys.stderr); return 2
+        SqliteConfig(Path(args.db), migrate_from=Path(args.config)).flush()
+        return 0
+    missing = missing_deps(*GUI_DEPS)
+    if missing:
+        print(f"Λείπουν πακέτα: {' '.join(missing)}\n  {sys.executable} -m pip install {' '.join(missing)}", file=sys.stderr)
+        if "customtkinter" in missing: return 1
+    _load_gui()
+    with _metrics_exporters(args):
+        app = App(swap_ready=swap_ready); app.mainloop()
+    return EXIT_SWAP if app.swapping else 0
+
+if __name__ == "__main__":
+    if getattr(sys, "frozen", False):
+        import multiprocessing; multiprocessing.freeze_support()  # workers του MatchService στο exe
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Config: migration του παλιού flat format (x/y), coalesced εγγραφές, και οι εγγραφές που αποτυγχάνουν
+μένουν dirty και ξαναδοκιμάζονται."""
+import json
+
+import PeRGio_Clicker_core as core
+
+LEGACY = {"x": 120, "y": 340, "interval_minutes": 2.5, "scroll": -50}
+
+def _legacy(tmp_path):
+    p = tmp_path / "coords_minutes.json"
+    p.write_text(json.dumps(LEGACY), encoding="utf-8")
+    return p
+
+def _check_default(cfg):
+    assert cfg.raw_data["current_profile"] == "Default"
+    prof = cfg.data
+    assert [(p.x, p.y) for p in prof["points"]] == [(120, 340)]
+    assert "x" not in prof and "y" not in prof
+    assert prof["interval_minutes"] == 2.5 and prof["scroll"] == -50
+    assert prof["click_type"] == core.DEFAULTS["click_type"]  # τα υπόλοιπα από τα DEFAULTS
+
+def test_json_legacy_migration_round_trip(tmp_path):
+    path = _legacy(tmp_path)
+    cfg = core.Config(path)
+    _check_default(cfg)
+    cfg.data["points"].append((5, 6), label="b")
+    cfg.save(); cfg.flush()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert "profiles" in saved and "x" not in saved
+    assert saved["profiles"]["Default"]["points"] == [{"x": 120, "y": 340}, {"x": 5, "y": 6, "label": "b"}]
+    again = core.Config(path)
+    assert [(p.x, p.y) for p in again.data["points"]] == [(120, 340), (5, 6)]
+    assert again.data["points"][1]["label"] == "b"
+
+def test_saves_coalesce_into_one_write(tmp_path):
+    cfg = core.Config(tmp_path / "c.json"); cfg.flush()
+    before = cfg.writes
+    for i in range(50):
+        cfg.data["scroll"] = i; cfg.save()
+    cfg.flush()
+    assert cfg.writes == before + 1
+    assert core.Config(tmp_path / "c.json").data["scroll"] == 49
+    assert not (tmp_path / "c.json.tmp").exists()
+
+def test_failed_write_stays_dirty_and_retries(tmp_path, monkeypatch):
+    path = tmp_path / "c.json"
+    cfg = core.Config(path)
+    cfg.data["interval_minutes"] = 7.0
+    real = core.os.replace
+    def fail(*a): raise OSError("disk full")
+    monkeypatch.setattr(core.os, "replace", fail)
+    cfg._dirty.set()
+    assert cfg.flush() is False
+    assert isinstance(cfg.last_error, OSError) and cfg._dirty.is_set()
+    assert not (tmp_path / "c.json.tmp").exists()
+    monkeypatch.setattr(core.os, "replace", real)
+    assert cfg.flush() is True and cfg.last_error is None
+    assert core.Config(path).data["interval_minutes"] == 7.0
+
+def test_writer_thread_survives_errors(tmp_path, monkeypatch):
+    cfg = core.Config(tmp_path / "c.json")
+    monkeypatch.setattr(cfg, "COALESCE", 0.01)
+    calls = []
+    real = cfg._write
+    def flaky():
+        calls.append(1)
+        if len(calls) <= 2: raise ValueError("boom")
+        real()
+    monkeypatch.setattr(cfg, "_write", flaky)
+    cfg.data["scroll"] = 33
+    cfg.save()
+    for _ in range(200):
+        if not cfg._dirty.is_set() and len(calls) >= 3: break
+        core.time.sleep(0.01)
+    assert len(calls) == 3 and cfg._writer.is_alive()
+    assert core.Config(tmp_path / "c.json").data["scroll"] == 33
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Κύκλος ζωής ενός run: ένα stop() πριν ή κατά τη διάρκεια του _prepare δεν αφήνει πόρους ανοιχτούς."""
+import threading
+
+import PeRGio_Clicker_core as core
+
+class Backend(core.RecordingBackend):
+    closed = 0
+    def close(self): Backend.closed += 1
+
+class Manager(core.RunManager):
+    """Το _prepare τρέχει όταν το ζητήσει το test· το make_backend μπορεί να μπλοκάρει στο gate."""
+    def __init__(self, cfg):
+        super().__init__(cfg, metrics=core.Metrics())
+        self.pending, self.made = [], 0
+        self.gate, self.entered = threading.Event(), threading.Event()
+        self.gate.set()
+    def _start_scheduler(self): return True
+    def spawn(self, fn): self.pending.append(fn)
+    def make_backend(self, name):
+        self.made += 1; self.entered.set(); self.gate.wait(5)
+        return Backend()
+
+def _manager():
+    cfg = type("Cfg", (), {})()
+    cfg.raw_data = {"profiles": {"A": dict(core.DEFAULTS, points=[{"x": 1, "y": 1}])}, "current_profile": "A"}
+    Backend.closed = 0
+    return Manager(cfg)
+
+def test_stop_before_prepare_acquires_nothing():
+    mgr = _manager()
+    run = mgr.start("A")
+    run.stop()
+    assert run.done.is_set()
+    mgr.pending.pop()()
+    assert mgr.made == 0 and run.backend is None and run.error is None
+
+def test_stop_during_prepare_closes_backend():
+    mgr = _manager()
+    run = mgr.start("A")
+    mgr.gate.clear()
+    t = threading.Thread(target=mgr.pending.pop()); t.start()
+    assert mgr.entered.wait(5)
+    stopper = threading.Thread(target=run.stop); stopper.start()
+    mgr.gate.set(); t.join(5); stopper.join(5)
+    assert run.done.is_set() and mgr.made == 1 and Backend.closed == 1
+    assert "A" not in mgr.runs
+
+def test_trigger_clicks_without_timer_motion():
+    np = __import__("pytest").importorskip("numpy")
+    screen = np.full((200, 200, 3), 100, dtype=np.float32)
+    backends = []
+    class Sim(core.SimManager):
+        def make_backend(self, name):
+            backends.append(core.RecordingBackend(clock=self.clock, screen=screen)); return backends[-1]
+    prof = dict(core.DEFAULTS, trigger="change", watch_region=[50, 50, 10, 10], points=[[5, 5]],
+                scroll=-100, move_jitter=15, start_delay_sec=1, seed=1)
+    cfg = type("Cfg", (), {})()
+    cfg.raw_data = {"profiles": {"p": prof}, "current_profile": "p"}
+    mgr = Sim(cfg)
+    def paint(s, v): s[50:60, 50:60] = v
+    mgr.sched.call_at(20.0, paint, screen, 200)
+    mgr.sched.call_at(40.0, paint, screen, 100)
+    run = mgr.start("p"); mgr.run_for(60)
+    assert run.error is None
+    ev = backends[0].events
+    presses = [t for t, kind, _, _ in ev if kind == "press"]
+    assert len(presses) == 2
+    for changed, t in zip((20.0, 40.0), presses):
+        assert 0 < t - changed < 0.15  # poll (έως RegionWatch.SLOW) + σύντομη κίνηση, όχι ολόκληρο glide
+    assert not [e for e in ev if e[1] == "scroll"]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Το headless `run` με το default backend (pyautogui) δεν φορτώνει ποτέ tkinter."""
+import json, os, subprocess, sys
+
+import pytest
+
+import PeRGio_Clicker_core as core
+from conftest import ROOT
+
+SCRIPT = """
+import json, os, signal, sys, threading
+import PeRGio_Clicker_core as core
+threading.Timer(3, os.kill, (os.getpid(), signal.SIGINT)).start()  # αν υπάρχει οθόνη και κάνει κλικ
+rc = core.main(["run", "--config", sys.argv[1]])
+print(json.dumps({"rc": rc, "tkinter": "tkinter" in sys.modules, "pyautogui_tried": "pytweening" in sys.modules}))
+os._exit(0)
+"""
+
+@pytest.mark.skipif(os.name != "posix", reason="SIGINT μέσω os.kill")
+def test_headless_run_never_imports_tkinter(tmp_path):
+    path = tmp_path / "c.json"
+    prof = dict(core.DEFAULTS, points=[{"x": 5, "y": 5}], start_delay_sec=0)
+    assert prof["backend"] == "pyautogui"
+    path.write_text(json.dumps({"profiles": {"Default": prof}, "current_profile": "Default"}), encoding="utf-8")
+    env = {k: v for k, v in os.environ.items() if k != "DISPLAY"}
+    env["PYTHONPATH"] = str(ROOT)
+    p = subprocess.run([sys.executable, "-c", SCRIPT, str(path)], env=env, cwd=tmp_path,
+                       capture_output=True, text=True, timeout=30)
+    out = json.loads(p.stdout.strip().splitlines()[-1])
+    assert out["pyautogui_tried"] or core.missing_deps("pyautogui")
+    assert out["tkinter"] is False, p.stderr
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""CoreLoader του launcher: ποιο core φορτώνεται και πότε πέφτει στο bundled/embedded, και το marshal cache."""
+import os, sys
+
+import pytest
+
+import PeRGio_Clicker as L
+
+CORE = "VERSION = {!r}\nGUI_DEPS = ()\nEXIT_SWAP = 75\ndef main(argv=None, swap_ready=None): return 0\n"
+
+@pytest.fixture
+def isolated(monkeypatch):
+    """Το CoreLoader γράφει sys.modules/sys.path/PERGIO_APP_DIR: επαναφορά μετά το test."""
+    monkeypatch.delitem(sys.modules, L.CORE_NAME, raising=False)
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.setenv("PERGIO_APP_DIR", str(L.APP_DIR))
+
+def _loader(tmp_path, remote=None, bundled=None, sha=None):
+    upd = tmp_path / "updates"; upd.mkdir(exist_ok=True)
+    if remote is not None: (upd / "core.py").write_text(remote, encoding="utf-8")
+    if bundled is not None: (tmp_path / "core.py").write_text(bundled, encoding="utf-8")
+    if sha is None and remote is not None: sha = L.sha256_bytes(remote.encode())
+    L.save_state({"sha256": sha} if sha else {}, upd / "state.json")
+    return L.CoreLoader(upd / "core.py", tmp_path / "core.py", upd / "state.json", upd / "__pycache__")
+
+def test_loader_prefers_verified_remote(tmp_path, isolated):
+    loader = _loader(tmp_path, CORE.format("remote"), CORE.format("bundled"))
+    assert loader.load().VERSION == "remote"
+    assert sys.modules[L.CORE_NAME].VERSION == "remote"
+    assert list((tmp_path / "updates" / "__pycache__").glob("core-*.bin"))
+    assert loader.load().VERSION == "remote"  # από το marshal cache
+
+def test_loader_rejects_hash_mismatch(tmp_path, isolated):
+    loader = _loader(tmp_path, CORE.format("tampered"), CORE.format("bundled"), sha="0" * 64)
+    mod = loader.load()
+    assert mod.VERSION == "bundled" and loader.path == tmp_path / "core.py"
+
+def test_loader_falls_back_when_remote_fails(tmp_path, isolated):
+    loader = _loader(tmp_path, "raise RuntimeError('boom')\n", CORE.format("bundled"))
+    assert loader.load().VERSION == "bundled"
+
+def test_newer_available_after_update(tmp_path, isolated):
+    loader = _loader(tmp_path, CORE.format("remote"), CORE.format("bundled"))
+    loader.load()
+    assert not loader.newer_available()
+    new = CORE.format("remote2")
+    (tmp_path / "updates" / "core.py").write_text(new, encoding="utf-8")
+    L.save_state({"sha256": L.sha256_bytes(new.encode())}, tmp_path / "updates" / "state.json")
+    assert loader.newer_available() and loader.newer_available()  # μένει True μέχρι το επόμενο load()
+    assert loader.load().VERSION == "remote2"
+    assert not loader.newer_available()
+
+def test_loader_skips_core_without_main(tmp_path, isolated):
+    loader = _loader(tmp_path, "VERSION = 'old script core'\n", CORE.format("bundled"))
+    assert loader.load().VERSION == "bundled"
+
+def test_loader_skips_core_with_missing_gui_deps(tmp_path, isolated, monkeypatch):
+    core = CORE.format("remote").replace("GUI_DEPS = ()", "GUI_DEPS = ('pergio_no_such_module',)")
+    loader = _loader(tmp_path, core)
+    assert loader.load(gui=False).VERSION == "remote"  # CLI commands δεν χρειάζονται τα GUI modules
+    assert loader.load() is None
+    monkeypatch.setattr(L, "run_embedded", lambda: "embedded")
+    assert L.run_core(loader, []) == "embedded"
+
+def test_no_core_runs_embedded(tmp_path, isolated, monkeypatch):
+    loader = _loader(tmp_path)
+    assert loader.load() is None
+    monkeypatch.setattr(L, "run_embedded", lambda: "embedded")
+    assert L.run_core(loader, []) == "embedded"
+
+def _cache(tmp_path): return sorted(p.name for p in (tmp_path / "updates" / "__pycache__").glob("core-*.bin"))
+
+def test_cache_keeps_recent_cores(tmp_path, isolated, monkeypatch):
+    loader = _loader(tmp_path)
+    compiled = []
+    monkeypatch.setattr(L, "compile", lambda *a: compiled.append(a[1]) or compile(*a), raising=False)
+    cores = []
+    for i in range(5):
+        src = tmp_path / f"core{i}.py"; src.write_text(CORE.format(f"v{i}"), encoding="utf-8")
+        sha = L.sha256_file(src)
+        loader._code(src, sha); cores.append(sha)
+        # Διακριτά mtimes στη σειρά εγγραφής, ανεξάρτητα από την ανάλυση χρόνου του filesystem
+        path, = (tmp_path / "updates" / "__pycache__").glob(f"core-{sha[:32]}.*")
+        os.utime(path, ns=((i + 1) * 10 ** 9,) * 2)
+    names = _cache(tmp_path)
+    assert len(names) == L.CACHE_KEEP
+    assert {n.split(".")[0] for n in names} == {f"core-{sha[:32]}" for sha in cores[-L.CACHE_KEEP:]}
+    assert len(compiled) == 5
+    loader._code(tmp_path / "core4.py", cores[4]); loader._code(tmp_path / "core3.py", cores[3])
+    assert len(compiled) == 5  # remote και bundled εναλλάξ: κανένα νέο compile
+
+def test_switching_between_remote_and_bundled_reuses_cache(tmp_path, isolated, monkeypatch):
+    loader = _loader(tmp_path, CORE.format("remote"), CORE.format("bundled"))
+    assert loader.load().VERSION == "remote"
+    (tmp_path / "updates" / "core.py").write_text(CORE.format("broken update"), encoding="utf-8")  # hash mismatch
+    assert loader.load().VERSION == "bundled"
+    (tmp_path / "updates" / "core.py").write_text(CORE.format("remote"), encoding="utf-8")
+    monkeypatch.setattr(L, "compile", lambda *a: pytest.fail("recompiled"), raising=False)
+    assert loader.load().VERSION == "remote" and loader.load(gui=False).VERSION == "remote"
+    assert len(_cache(tmp_path)) == 2
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""MatchService: το frame το τραβάει πάντα ένα ζωντανό backend, και το process pool ψάχνει πολλά
+templates πάνω στο ίδιο frame σε shared memory."""
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+import PeRGio_Clicker_core as core
+
+SIDE = core.TEMPLATE_SIDE
+
+def _screen(seed=0, shape=(400, 600)):
+    a = np.random.default_rng(seed).integers(0, 256, (shape[0] + 1, shape[1] + 1)).astype("float32")
+    return np.rint((a[:-1, :-1] + a[1:, :-1] + a[:-1, 1:] + a[1:, 1:]) / 4)
+
+def _template(tmp_path, screen, x, y, name):
+    path = tmp_path / name
+    Image.fromarray(screen[y:y + SIDE, x:x + SIDE].astype("uint8"), "L").save(path)
+    return str(path)
+
+class Backend(core.RecordingBackend):
+    """Το grab αποτυγχάνει μετά το close(), όπως ένα πραγματικό backend που έκλεισε τη σύνδεσή του."""
+    def __init__(self, screen):
+        super().__init__(screen=screen); self.closed = False; self.grabs = 0
+    def grab(self, region=None):
+        if self.closed: raise RuntimeError("backend closed")
+        self.grabs += 1
+        return super().grab(region)
+    def close(self): self.closed = True
+
+def test_frame_comes_from_a_live_backend(tmp_path):
+    screen = _screen()
+    req = [(_template(tmp_path, screen, 100, 50, "t.png"), 0.9, None)]
+    clock = [0.0]
+    svc = core.MatchService(clock=lambda: clock[0], workers=1)
+    a, b = Backend(screen), Backend(screen)
+    svc.acquire(a.grab); svc.acquire(b.grab)
+    assert svc.users == 2
+    assert svc.locate_many(req) == [(100 + SIDE // 2, 50 + SIDE // 2)]
+
+    # Ο χρήστης που τράβηξε το frame τελειώνει: το επόμενο frame (ακόμα και στο ίδιο tick) από τον άλλον
+    taker, other = (b, a) if b.grabs else (a, b)
+    svc.release(taker.grab); taker.close()
+    assert svc.users == 1
+    assert svc.locate_many(req) == [(100 + SIDE // 2, 50 + SIDE // 2)] and other.grabs == 1
+
+    # Όλοι τελείωσαν: ένα νέο run δεν κληρονομεί το grab κανενός
+    svc.release(other.grab); other.close()
+    c = Backend(screen)
+    svc.acquire(c.grab); clock[0] += 1
+    assert svc.locate_many(req) == [(100 + SIDE // 2, 50 + SIDE // 2)] and c.grabs == 1
+    svc.release(c.grab)
+    assert svc.users == 0 and svc._shm is None
+
+def test_manager_service_is_rebound_after_runs_finish():
+    mgr = core.RunManager(type("Cfg", (), {"raw_data": {"profiles": {}}})(), metrics=core.Metrics())
+    svc = mgr.match_service()
+    assert mgr.match_service() is svc
+    a = Backend(_screen(1))
+    svc.acquire(a.grab); svc.release(a.grab); a.close()
+    b = Backend(_screen(1))
+    svc.acquire(b.grab)
+    try: svc.locate_many([])
+    finally: svc.release(b.grab)
+    assert b.grabs == 1 and a.grabs == 0
+
+def test_pool_searches_templates_concurrently_on_one_frame(tmp_path):
+    screen = _screen(2)
+    spots = [(30, 40), (400, 300), (250, 120)]
+    paths = [_template(tmp_path, screen, x, y, f"t{i}.png") for i, (x, y) in enumerate(spots)]
+    missing = _template(tmp_path, _screen(3), 10, 10, "missing.png")
+    svc = core.MatchService(clock=lambda: 0.0, workers=2)
+    backend = Backend(screen)
+    svc.acquire(backend.grab)
+    try:
+        reqs = [(p, 0.9, None) for p in paths] + [(missing, 0.9, None)]
+        results = {}
+        def search(i, rs): results[i] = svc.locate_many(rs)
+        threads = [threading.Thread(target=search, args=(0, reqs[:2] + reqs[3:])), threading.Thread(target=search, args=(1, reqs[1:3]))]
+        for t in threads: t.start()
+        for t in threads: t.join(120)
+        centre = lambda x, y: (x + SIDE // 2, y + SIDE // 2)
+        assert results[0] == [centre(*spots[0]), centre(*spots[1]), None]
+        assert results[1] == [centre(*spots[1]), centre(*spots[2])]
+        assert svc._pool is not None and (paths[0], 0.9) not in svc._local  # πέρασε πράγματι από τους workers
+        assert backend.grabs == 1 and svc.frames == 1  # ένα grab για όλα
+        assert svc.requests == 5 and svc.searches == 4  # το κοινό αίτημα εκτελέστηκε μία φορά
+        # Το επόμενο tick: τα hits των workers έγιναν cache θέσης στον service
+        assert set(svc._last) == {(p, 0.9) for p in paths + [missing]}
+        assert svc._last[(paths[2], 0.9)] == spots[2]
+    finally:
+        svc.release(backend.grab)
+    assert svc._pool is None and svc._shm is None
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Metrics: ακριβείς counters από πολλά threads, έγκυρο Prometheus/JSON από το endpoint,
+χρονομέτρηση του πραγματικού reload των ρυθμίσεων."""
+import json, math, re, threading, urllib.error, urllib.request
+
+import pytest
+
+import PeRGio_Clicker_core as core
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"(?:,|$)')
+
+def _parse(text):
+    """Ελάχιστος parser του text format 0.0.4: {family: type} και [(name, labels, value)]."""
+    types, samples = {}, []
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" "); types[name] = kind; continue
+        if line.startswith("#"): continue
+        m = SAMPLE.match(line)
+        assert m, line
+        name, labels, value = m.groups()
+        samples.append((name, dict(LABEL.findall(labels or "")), float(value)))
+    return types, samples
+
+def _family(name, types):
+    for suffix in ("_bucket", "_sum", "_count"):
+        if name.endswith(suffix) and name[:-len(suffix)] in types: return name[:-len(suffix)]
+    return name
+
+def _get(srv, path):
+    with urllib.request.urlopen(f"http://127.0.0.1:{srv.server_address[1]}{path}", timeout=5) as r:
+        return r.headers["Content-Type"], r.read().decode("utf-8")
+
+@pytest.fixture
+def metrics():
+    m = core.Metrics()
+    a = m.run('A "quoted"\\x')
+    a.clicks.inc(3)
+    for v in (0.0003, 0.003, 0.003, 0.2, 9.0): a.drift.observe(v)
+    m.run("B").misses.inc()
+    m.config_reload.observe(0.004)
+    return m
+
+def test_counter_is_exact_across_threads():
+    c = core.Counter()
+    def work():
+        for _ in range(20000): c.inc()
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert c.value == 8 * 20000
+
+def test_prometheus_endpoint_parses(metrics):
+    srv = core.serve_metrics(0, metrics=metrics)
+    try:
+        ctype, text = _get(srv, "/metrics")
+        with pytest.raises(urllib.error.HTTPError): _get(srv, "/nope")
+    finally:
+        srv.shutdown(); srv.server_close()
+    assert ctype.startswith("text/plain; version=0.0.4")
+    types, samples = _parse(text)
+    assert set(types) == {name for _, name, *_ in core.METRIC_SPEC + core.GLOBAL_METRIC_SPEC}
+    for name, _, _ in samples: assert _family(name, types) in types
+    by = {(n, tuple(sorted(l.items()))): v for n, l, v in samples}
+    a = (("profile", 'A \\"quoted\\"\\\\x'),)
+    assert by[("pergio_clicks_total", a)] == 3
+    assert by[("pergio_target_misses_total", (("profile", "B"),))] == 1
+
+    # Buckets αθροιστικά, +Inf == count, sum ίδιο με τις παρατηρήσεις
+    buckets = [(l["le"], v) for n, l, v in samples if n == "pergio_drift_seconds_bucket" and l["profile"] == a[0][1]]
+    assert [float(le) for le, _ in buckets] == sorted(float(le) for le, _ in buckets)
+    values = [v for _, v in buckets]
+    assert values == sorted(values) and buckets[-1] == ("+Inf", 5)
+    assert dict(buckets)["0.0005"] == 1 and dict(buckets)["0.005"] == 3 and dict(buckets)["5.0"] == 4
+    assert by[("pergio_drift_seconds_count", a)] == 5
+    assert by[("pergio_drift_seconds_sum", a)] == pytest.approx(9.2063)
+
+    # Το reload των ρυθμίσεων δεν έχει label profile
+    assert by[("pergio_config_reload_seconds_count", ())] == 1
+    assert by[("pergio_config_reload_seconds_bucket", (("le", "0.005"),))] == 1
+
+def test_json_endpoint(metrics):
+    srv = core.serve_metrics(0, metrics=metrics)
+    try: ctype, text = _get(srv, "/metrics.json")
+    finally: srv.shutdown(); srv.server_close()
+    assert ctype == "application/json"
+    data = json.loads(text)
+    a = data["profiles"]['A "quoted"\\x']
+    assert a["clicks"] == 3 and a["drift"]["count"] == 5 and a["drift"]["p50"] == 0.005
+    assert data["config_reload"]["count"] == 1 and math.isclose(data["config_reload"]["sum"], 0.004)
+
+def test_watcher_times_only_real_reloads(tmp_path):
+    m = core.Metrics()
+    cfg = core.Config(tmp_path / "c.json"); cfg.flush()
+    calls = []
+    w = core.ConfigWatcher(cfg, lambda: calls.append(1), metrics=m)
+    w.reload()  # ίδιο hash: ούτε on_change ούτε δείγμα
+    assert calls == [] and m.config_reload.count == 0
+    raw = json.loads(cfg.path.read_text(encoding="utf-8"))
+    raw["profiles"]["Default"]["interval_minutes"] = 7.0
+    cfg.path.write_text(json.dumps(raw), encoding="utf-8")
+    w.reload()
+    assert calls == [1] and m.config_reload.count == 1
+    assert cfg.data["interval_minutes"] == 7.0
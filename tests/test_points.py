@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""PointSet: grid index (nearest/duplicate/region) απέναντι σε brute force, και JSON round-trip
+(λίστα από dict κάτω από COMPACT_MIN, base64 από εκεί και πάνω)."""
+import json, math, random
+
+import pytest
+
+import PeRGio_Clicker_core as core
+
+def _random_set(n, seed=1, span=2000):
+    rng = random.Random(seed)
+    return core.PointSet([rng.randrange(-span, span) for _ in range(n)], [rng.randrange(-span, span) for _ in range(n)])
+
+def test_nearest_matches_brute_force():
+    ps = _random_set(500)
+    rng = random.Random(2)
+    for _ in range(200):
+        x, y = rng.randrange(-2500, 2500), rng.randrange(-2500, 2500)
+        i, d = ps.nearest(x, y)
+        assert d == pytest.approx(min(math.hypot(px - x, py - y) for px, py in ps.coords()))
+        assert d == pytest.approx(math.hypot(ps.xy(i)[0] - x, ps.xy(i)[1] - y))
+
+def test_nearest_max_dist_and_duplicates():
+    ps = core.PointSet([100, 400], [100, 100])
+    assert ps.nearest(130, 100, max_dist=20) is None
+    assert ps.nearest(110, 100, max_dist=20)[0] == 0
+    assert ps.find_duplicate(403, 97) == 1 and ps.find_duplicate(250, 100) is None
+    assert core.PointSet().nearest(0, 0) is None
+
+def test_region_matches_brute_force():
+    ps = _random_set(500, seed=3)
+    for x0, y0, x1, y1 in ((-100, -100, 300, 250), (500, 500, -500, -500), (0, 0, 0, 0)):
+        want = [i for i, (x, y) in enumerate(ps.coords())
+                if min(x0, x1) <= x <= max(x0, x1) and min(y0, y1) <= y <= max(y0, y1)]
+        assert ps.region(x0, y0, x1, y1) == want
+
+def test_index_follows_mutations():
+    ps = core.PointSet([0, 1000], [0, 1000])
+    assert ps.nearest(990, 990)[0] == 1
+    ps.append((980, 980)); assert ps.nearest(979, 979)[0] == 2
+    ps.set_xy(2, 0, 5); assert ps.nearest(979, 979)[0] == 1
+    del ps[0]; assert ps.nearest(0, 0)[0] == 1 and len(ps) == 2
+
+def test_small_set_round_trips_as_dicts():
+    ps = core.PointSet.from_json([{"x": 1, "y": 2}, {"x": -3, "y": 4, "label": "ok"}])
+    out = ps.to_json()
+    assert out == [{"x": 1, "y": 2}, {"x": -3, "y": 4, "label": "ok"}]
+    assert core.PointSet.from_json(json.loads(json.dumps(out))).to_json() == out
+
+def test_large_set_round_trips_as_base64():
+    ps = _random_set(core.PointSet.COMPACT_MIN + 50, seed=4, span=2 ** 30)
+    ps._attrs = {3: {"label": "x"}}
+    out = json.loads(json.dumps(ps.to_json()))
+    assert out["enc"] == "i32le-b64"
+    back = core.PointSet.from_json(out)
+    assert list(back.coords()) == list(ps.coords()) and back[3]["label"] == "x"
+    assert back.digest() == ps.digest()
+
+def test_json_config_keeps_compact_points(tmp_path):
+    path = tmp_path / "c.json"
+    cfg = core.Config(path, compact=True)
+    n = core.PointSet.COMPACT_MIN + 10
+    for i in range(n): cfg.data["points"].append((i, -i))
+    cfg.save(); cfg.flush()
+    assert json.loads(path.read_text(encoding="utf-8"))["profiles"]["Default"]["points"]["enc"] == "i32le-b64"
+    assert list(core.Config(path).data["points"].coords()) == [(i, -i) for i in range(n)]
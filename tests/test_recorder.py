@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Recorder: wrap-around και dropped του RingBuffer, round-trip MacroWriter → MacroRecording μέσω mmap."""
+import pytest
+
+import PeRGio_Clicker_core as core
+
+def _collect(ring):
+    chunks = []
+    ring.drain(lambda mv: chunks.append(bytes(mv)))
+    data = b"".join(chunks)
+    return len(chunks), [core.RecEvent._make(core.REC.unpack_from(data, i)) for i in range(0, len(data), core.REC.size)]
+
+def test_ring_buffer_wraps_around():
+    ring = core.RingBuffer(capacity=4)
+    for i in range(3): ring.push(float(i), core.EV_MOVE, 0, i, -i)
+    n, events = _collect(ring)
+    assert n == 1 and [e.x for e in events] == [0, 1, 2]
+
+    # head=3: τα επόμενα 4 γράφονται στις θέσεις 3, 0, 1, 2 και βγαίνουν σε δύο κομμάτια, με τη σειρά
+    for i in range(3, 7): ring.push(float(i), core.EV_DOWN, 1, i, i, 10 * i)
+    n, events = _collect(ring)
+    assert n == 2
+    assert [(e.t, e.kind, e.button, e.x, e.value) for e in events] == [(float(i), core.EV_DOWN, 1, i, 10 * i) for i in range(3, 7)]
+    assert ring.dropped == 0 and ring.drain(lambda mv: None) == 0
+
+def test_ring_buffer_drops_instead_of_overwriting():
+    ring = core.RingBuffer(capacity=4)
+    for i in range(10): ring.push(float(i), core.EV_MOVE, 0, i, 0)
+    assert ring.dropped == 6
+    _, events = _collect(ring)
+    assert [e.x for e in events] == [0, 1, 2, 3]  # τα παλιά μένουν, τα νέα μετριούνται
+    ring.push(99.0, core.EV_MOVE, 0, 99, 0)
+    assert [e.x for e in _collect(ring)[1]] == [99]
+
+def test_writer_recording_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.MacroWriter, "CHUNK", 4096)  # αναγκάζει αρκετά _grow (remap)
+    path = tmp_path / "m.pgrec"
+    ring = core.RingBuffer(capacity=64)
+    w = core.MacroWriter(path, start=1000.0)
+    expected = []
+    for i in range(1000):
+        e = core.RecEvent(i / 100, i % 6, i % 3, i, -i, i * 7)
+        ring.push(*e); expected.append(e)
+        if i % 50 == 49: ring.drain(w.append)
+        if i == 499:
+            # Πριν το close: το header έχει ήδη το πλήθος, άρα ένα crash αφήνει αναγνώσιμη εγγραφή
+            with core.MacroRecording(path) as partial: assert list(partial) == expected
+    ring.drain(w.append); w.close()
+    assert path.stat().st_size == core.REC_HEADER.size + 1000 * core.REC.size
+
+    with core.MacroRecording(path) as rec:
+        assert len(rec) == 1000 and rec.start == 1000.0
+        assert list(rec) == expected
+        assert rec[0] == expected[0] and rec[-1] == expected[-1] and rec.duration == 9.99
+        with pytest.raises(IndexError): rec[1000]
+
+def test_recording_clicks_and_points(tmp_path):
+    path = tmp_path / "c.pgrec"
+    w = core.MacroWriter(path, start=0.0)
+    ring = core.RingBuffer()
+    left, right = core.BUTTON_CODES["left"], core.BUTTON_CODES["right"]
+    for t, kind, button, x, y in [(0.1, core.EV_MOVE, 0, 5, 5), (0.2, core.EV_DOWN, left, 10, 20), (0.3, core.EV_UP, left, 10, 20),
+                                  (0.4, core.EV_DOWN, right, 30, 30), (0.5, core.EV_DOWN, left, 500, 500),
+                                  (0.6, core.EV_DOWN, left, 11, 21), (0.7, core.EV_DOWN, left, 200, 10)]:
+        ring.push(t, kind, button, x, y)
+    ring.drain(w.append); w.close()
+    with core.MacroRecording(path) as rec:
+        assert rec.clicks() == [(0.2, 10, 20), (0.5, 500, 500), (0.6, 11, 21), (0.7, 200, 10)]
+        assert rec.clicks("right") == [(0.4, 30, 30)]
+        assert rec.clicks(exclude=(400, 400, 200, 200)) == [(0.2, 10, 20), (0.6, 11, 21), (0.7, 200, 10)]
+        pts = core.PointSet()
+        assert rec.to_points(pts, exclude=(400, 400, 200, 200)) == 2  # το (11, 21) είναι διπλότυπο του (10, 20)
+        assert [(p.x, p.y) for p in pts] == [(10, 20), (200, 10)]
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "x.pgrec"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError): core.MacroRecording(path)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Replay: όρια σφάλματος του rdp/decimate, κλιμάκωση χρόνου και επανάληψη του ReplayEngine σε εικονικό χρόνο."""
+import math, random
+
+import pytest
+
+import PeRGio_Clicker_core as core
+
+def _seg_dist(p, a, b):
+    (px, py), (ax, ay), (bx, by) = p, a, b
+    dx, dy = bx - ax, by - ay
+    seg2 = dx * dx + dy * dy
+    u = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / seg2)) if seg2 else 0.0
+    return math.hypot(ax + u * dx - px, ay + u * dy - py)
+
+def _walk(n, seed):
+    r, x, y, out = random.Random(seed), 500, 500, []
+    for i in range(n):
+        x += r.randint(-6, 6); y += r.randint(-6, 6); out.append((i / 100, x, y))
+    return out
+
+@pytest.mark.parametrize("tol", [0.5, 2, 5, 20])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_rdp_stays_within_tolerance(tol, seed):
+    pts = _walk(800, seed)
+    keep = core.rdp(pts, tol)
+    assert keep[0] == 0 and keep[-1] == len(pts) - 1 and keep == sorted(set(keep))
+    for a, b in zip(keep, keep[1:]):
+        for i in range(a + 1, b):
+            assert _seg_dist(pts[i][1:], pts[a][1:], pts[b][1:]) <= tol + 1e-9
+    assert len(keep) < len(pts)
+
+def test_rdp_degenerate_cases():
+    line = [(i, i, 2 * i) for i in range(50)]
+    assert core.rdp(line, 1) == [0, 49]
+    assert core.rdp(line, 0) == list(range(50))
+    assert core.rdp(line[:2], 5) == [0, 1]
+    loop = [(0, 0, 0), (1, 30, 0), (2, 0, 0)]  # αρχή == τέλος
+    assert core.rdp(loop, 5) == [0, 1, 2] and core.rdp(loop, 40) == [0, 2]
+
+def _events(pts, clicks_every=200):
+    out = []
+    for i, (t, x, y) in enumerate(pts):
+        out.append(core.RecEvent(t, core.EV_MOVE, 0, x, y, 0))
+        if i % clicks_every == clicks_every - 1:
+            out.append(core.RecEvent(t, core.EV_DOWN, 1, x, y, 0))
+            out.append(core.RecEvent(t, core.EV_UP, 1, x, y, 0))
+    return out
+
+def test_decimate_keeps_every_non_move_event_and_its_position():
+    events = _events(_walk(1000, 7))
+    out = list(core.decimate(iter(events), 3, max_run=64))
+    assert [e for e in out if e.kind != core.EV_MOVE] == [e for e in events if e.kind != core.EV_MOVE]
+    assert len(out) < len(events)
+    # Η τελευταία κίνηση πριν από κάθε κλικ είναι αυτή της εγγραφής
+    def before_clicks(src):
+        pos, out = None, []
+        for e in src:
+            if e.kind == core.EV_MOVE: pos = (e.x, e.y)
+            elif e.kind == core.EV_DOWN: out.append(pos)
+        return out
+    assert before_clicks(out) == before_clicks(events)
+    # Κάθε κίνηση απέχει το πολύ tol από τη διαδρομή που απέμεινε (ανά κομμάτι max_run)
+    kept = [e for e in out if e.kind == core.EV_MOVE]
+    for e in (e for e in events if e.kind == core.EV_MOVE):
+        i = next(k for k, q in enumerate(kept) if q.t >= e.t)
+        a, b = kept[max(0, i - 1)], kept[i]
+        assert _seg_dist((e.x, e.y), (a.x, a.y), (b.x, b.y)) <= 3 + 1e-9
+
+def test_decimate_zero_tolerance_is_identity():
+    events = _events(_walk(300, 4))
+    assert list(core.decimate(iter(events), 0)) == events
+
+# ---------- ReplayEngine ----------
+def _record(path, events):
+    w = core.MacroWriter(path, start=0.0)
+    ring = core.RingBuffer()
+    for e in events: ring.push(*e)
+    ring.drain(w.append); w.close()
+    return path
+
+def _sample(tmp_path):
+    """Κίνηση 2.00..2.99, κλικ 3.00/3.05 στο (400, 300), scroll στο 3.50: διάρκεια 1.5 sec από το πρώτο event."""
+    ev = [core.RecEvent(2 + i / 100, core.EV_MOVE, 0, 100 + 3 * i, 300, 0) for i in range(100)]
+    ev += [core.RecEvent(3.0, core.EV_DOWN, 1, 400, 300, 0), core.RecEvent(3.05, core.EV_UP, 1, 400, 300, 0),
+           core.RecEvent(3.5, core.EV_SCROLL, 0, 400, 300, -3), core.RecEvent(3.6, core.EV_KEY_DOWN, 0, 400, 300, 30)]
+    return _record(tmp_path / "r.pgrec", ev)
+
+def _replay(path, seconds, **kw):
+    prof = dict(core.DEFAULTS, points=[], replay=str(path), replay_tolerance=0, start_delay_sec=1, seed=1, **kw)
+    cfg = type("SimConfig", (), {})()
+    cfg.raw_data = {"profiles": {"R": prof}, "current_profile": "R"}
+    mgr = core.SimManager(cfg)
+    backends = []
+    mgr.make_backend = lambda name: backends.append(core.RecordingBackend(clock=mgr.clock)) or backends[-1]
+    run = mgr.start("R")
+    mgr.run_for(seconds)
+    assert run.error is None and run.done.is_set()
+    return run, backends[0].events
+
+@pytest.mark.parametrize("speed", [0.5, 1.0, 2.0, 4.0])
+def test_replay_scales_time(tmp_path, speed):
+    run, events = _replay(_sample(tmp_path), 10, replay_speed=speed)
+    moves = [e for e in events if e[1] == "move"]
+    assert moves[0][0] == pytest.approx(1.0)  # start_delay, το πρώτο event στο t=0
+    assert moves[99][0] == pytest.approx(1.0 + 0.99 / speed)
+    press, release = [t for t, k, *_ in events if k == "press"], [t for t, k, *_ in events if k == "release"]
+    assert press == [pytest.approx(1.0 + 1.0 / speed)] and release == [pytest.approx(1.0 + 1.05 / speed)]
+    scrolls = [t for t, k, *_ in events if k == "scroll"]
+    assert scrolls and scrolls[0] == pytest.approx(1.0 + 1.5 / speed)
+    assert run.dispatched == 103  # τα πλήκτρα δεν στέλνονται
+    assert run.metrics.clicks.value == 1
+
+def test_replay_loops_with_gap(tmp_path):
+    run, events = _replay(_sample(tmp_path), 8.2, replay_loop=True, replay_speed=1.0)
+    press = [t for t, k, *_ in events if k == "press"]
+    period = 1.5 + core.ReplayEngine.LOOP_GAP
+    assert press == [pytest.approx(2.0 + i * period) for i in range(len(press))]
+    assert len(press) == 4  # 2, 4, 6, 8: η προσομοίωση σταματάει στο 8.2
+    assert not run.backend.held and run.metrics.clicks.value == 4
+
+def test_replay_loop_gap_scales_with_speed(tmp_path):
+    _, events = _replay(_sample(tmp_path), 5.1, replay_loop=True, replay_speed=2.0)
+    press = [t for t, k, *_ in events if k == "press"]
+    assert press == [pytest.approx(1.5 + i * 1.0) for i in range(4)]  # (1.5 + 0.5) / 2
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""shortest_route: έγκυρη μετάθεση που ξεκινά από το πρώτο σημείο και δεν είναι ποτέ μακρύτερη από το
+nearest-neighbour ή τη σειρά εγγραφής."""
+import random
+
+import pytest
+
+import PeRGio_Clicker_core as core
+
+@pytest.mark.parametrize("n, seed", [(4, 1), (12, 2), (60, 3), (200, 4)])
+def test_two_opt_never_longer_than_nearest_neighbour(n, seed):
+    rng = random.Random(seed)
+    ps = core.PointSet([rng.randrange(1920) for _ in range(n)], [rng.randrange(1080) for _ in range(n)])
+    xs, ys = ps._x, ps._y
+    nn = core._tour_length(xs, ys, core._nearest_neighbour(xs, ys))
+    route = core.shortest_route(ps)
+    assert sorted(route.order) == list(range(n)) and route.order[0] == 0
+    assert route.after == pytest.approx(core._tour_length(xs, ys, route.order))
+    assert route.after <= nn + 1e-6
+    assert route.after <= route.before == pytest.approx(core._tour_length(xs, ys, range(n)))
+
+def test_two_opt_untangles_a_crossing():
+    # Τετράγωνο σε σειρά "παπιγιόν": 0-2-1-3 διασταυρώνεται, η βέλτιστη είναι η περίμετρος
+    xs, ys = [0, 100, 100, 0, 50], [0, 100, 0, 100, 0]
+    order = core._two_opt(xs, ys, [0, 1, 2, 3, 4], core.time.monotonic() + 1)
+    assert core._tour_length(xs, ys, order) == pytest.approx(400)
+
+def test_route_is_cached_by_points():
+    ps = core.PointSet([0, 500, 10, 490, 20], [0, 0, 10, 10, 20])
+    assert core.shortest_route(ps) is core.shortest_route(core.PointSet(list(ps._x), list(ps._y)))
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Scheduler και ClickEngine σε εικονικό χρόνο (SimManager + RecordingBackend): χωρίς οθόνη, χωρίς sleeps."""
+import pytest
+
+import PeRGio_Clicker_core as core
+
+POINTS = [{"x": 10, "y": 10}, {"x": 300, "y": 40}, {"x": 50, "y": 500}]
+
+def _profile(**kw):
+    return dict(core.DEFAULTS, points=POINTS, interval_minutes=0.05, start_delay_sec=1,
+                seed=3, move_jitter=0, scroll=0, **kw)
+
+def test_sim_scheduler_runs_in_deadline_order():
+    clock = core.VirtualClock()
+    sched = core.SimScheduler(clock)
+    seen = []
+    for t in (3.0, 1.0, 2.0, 1.0):
+        sched.call_at(t, lambda t=t: seen.append((t, clock())))
+    sched.cancel(sched.call_at(1.5, seen.append, "cancelled"))
+    sched.run_until(10.0)
+    assert seen == [(1.0, 1.0), (1.0, 1.0), (2.0, 2.0), (3.0, 3.0)]
+    assert clock() == 10.0
+
+def test_simulated_profile_click_order_and_intervals():
+    trace, summary = core.simulate(_profile(), hours=0.05)
+    clicks = [e for e in trace if e["action"] == "click"]
+    assert len(clicks) > 20
+    assert [c["point"] for c in clicks] == [i % len(POINTS) for i in range(len(clicks))]
+    assert clicks[0]["t"] == 1.0  # start_delay_sec
+    for a, b in zip(clicks, clicks[1:]):
+        assert b["t"] - a["end"] == pytest.approx(a["wait"])  # επόμενος κύκλος = τέλος κλικ + wait
+        assert 2.5 <= a["wait"] <= 3.5  # interval ±0.5 sec χωρίς random timing
+    assert all(e["drift"] == 0.0 for e in trace)
+    assert summary["clicks"] == len(clicks)
+
+def test_simulated_clicks_land_near_points():
+    trace, _ = core.simulate(_profile(), hours=0.02)
+    for c in (e for e in trace if e["action"] == "click"):
+        p = POINTS[c["point"]]
+        assert abs(c["x"] - p["x"]) <= 20 and abs(c["y"] - p["y"]) <= 20
+
+def test_same_seed_same_timeline():
+    a, _ = core.simulate(_profile(), hours=0.02)
+    b, _ = core.simulate(_profile(), hours=0.02)
+    assert a == b
+
+def test_shortest_path_visits_every_point_once_per_round():
+    trace, _ = core.simulate(_profile(order="shortest_path"), hours=0.02)
+    seq = [e["point"] for e in trace if e["action"] == "click"]
+    for i in range(0, len(seq) - len(POINTS) + 1, len(POINTS)):
+        assert sorted(seq[i:i + len(POINTS)]) == [0, 1, 2]
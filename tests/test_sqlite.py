@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""SqliteConfig: migration από το JSON, round-trip, και αλλαγές από άλλη σύνδεση (watcher και reload
+που δεν πετάει τοπικές αλλαγές που δεν έχουν γραφτεί ακόμα)."""
+import sqlite3, sys, threading
+
+import pytest
+
+import PeRGio_Clicker_core as core
+from test_config import _check_default, _legacy
+
+def test_sqlite_migrates_legacy_json(tmp_path):
+    db = tmp_path / "coords_minutes.db"
+    cfg = core.SqliteConfig(db, migrate_from=_legacy(tmp_path))
+    _check_default(cfg)
+    cfg.data["points"].append((7, 8), label="c")
+    cfg.raw_data["profiles"]["Other"] = dict(core.DEFAULTS, points=[{"x": 1, "y": 2}])
+    cfg.save(); cfg.flush()
+    again = core.SqliteConfig(db)
+    assert [(p.x, p.y) for p in again.data["points"]] == [(120, 340), (7, 8)]
+    assert again.data["points"][1]["label"] == "c"
+    assert list(again.raw_data["profiles"]) == ["Default", "Other"]
+    assert list(again.raw_data["profiles"]["Other"]["points"].coords()) == [(1, 2)]
+
+def test_sqlite_ignores_own_writes(tmp_path):
+    db = tmp_path / "c.db"
+    cfg = core.SqliteConfig(db)
+    cfg.data["interval_minutes"] = 3.0
+    cfg.save(); cfg.flush()
+    assert not cfg.reload_if_changed()
+    other = core.SqliteConfig(db)
+    other.data["interval_minutes"] = 4.0
+    other.save(); other.flush()
+    assert cfg.reload_if_changed()
+    assert cfg.data["interval_minutes"] == 4.0
+
+def _external_commit(db, name, **settings):
+    """Commit από δεύτερη σύνδεση sqlite3, όπως ένα άλλο process της εφαρμογής. Η σύνδεση επιστρέφεται
+    ανοιχτή: το close θα έβγαζε IN_CLOSE_WRITE στο -wal και θα έκρυβε ένα watcher που δεν βλέπει το commit."""
+    c = sqlite3.connect(str(db))
+    row = c.execute("SELECT settings FROM profiles WHERE name = ?", (name,)).fetchone()
+    s = core.json.loads(row[0]) if row else dict(core.DEFAULTS, points=None)
+    s.pop("points", None); s.update(settings)
+    c.execute("INSERT OR REPLACE INTO profiles VALUES (?, ?, COALESCE((SELECT points FROM profiles WHERE name = ?), x''))",
+              (name, core.json.dumps(s), name))
+    c.commit()
+    return c
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify μόνο σε Linux")
+def test_watcher_sees_external_commit(tmp_path):
+    db = tmp_path / "c.db"
+    cfg = core.SqliteConfig(db); cfg.flush()
+    changed = threading.Event()
+    w = core.ConfigWatcher(cfg, changed.set); w.start()
+    try:
+        assert w.mode == "inotify"
+        cfg.data["scroll"] = 1; cfg._dirty.set(); cfg.flush()  # δική μας εγγραφή: κανένα reload
+        assert not changed.wait(0.3)
+        other = _external_commit(db, "Default", interval_minutes=6.0)
+        assert changed.wait(5)
+        assert cfg.data["interval_minutes"] == 6.0 and cfg.data["scroll"] == 1
+        other.close()
+    finally:
+        w.stop()
+
+def test_reload_keeps_unflushed_local_edits(tmp_path):
+    db = tmp_path / "c.db"
+    cfg = core.SqliteConfig(db)
+    cfg.raw_data["profiles"]["Other"] = dict(core.DEFAULTS, points=[{"x": 1, "y": 2}])
+    cfg._dirty.set(); cfg.flush()
+    cfg.data["scroll"] = 42; cfg.data["points"].append((3, 4))
+    cfg.save()  # ακόμα μέσα στο COALESCE
+    _external_commit(db, "Other", interval_minutes=8.0).close()
+    assert cfg.reload_if_changed()
+    assert cfg.data["scroll"] == 42 and list(cfg.data["points"].coords()) == [(3, 4)]
+    assert cfg.raw_data["profiles"]["Other"]["interval_minutes"] == 8.0
+    again = core.SqliteConfig(db)
+    assert again.data["scroll"] == 42
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Ένα stop() στη μέση μιας κίνησης, ενός press ή ενός scroll σταματάει τον engine μέσα στο STOP_BUDGET
+και αφήνει τα κουμπιά, απέναντι σε RecordingBackend (χωρίς πραγματικό ποντίκι)."""
+import threading, time
+
+import PeRGio_Clicker_core as core
+
+class Backend(core.RecordingBackend):
+    """Σηματοδοτεί την πρώτη ενέργεια του είδους `kind`· το scroll κοστίζει 1 ms ανά κλήση."""
+    def __init__(self, kind):
+        super().__init__()
+        self.kind, self.started = kind, threading.Event()
+    def move_to(self, x, y):
+        super().move_to(x, y)
+        if self.kind == "move": self.started.set()
+    def press(self, button):
+        super().press(button)
+        if self.kind == "press": self.started.set()
+    def scroll(self, amount):
+        super().scroll(amount); time.sleep(0.001)
+        if self.kind == "scroll": self.started.set()
+
+def _engine(kind):
+    cfg = type("Cfg", (), {})()
+    cfg.raw_data = {"profiles": {"A": dict(core.DEFAULTS, points=[{"x": 1, "y": 1}])}, "current_profile": "A"}
+    eng = core.ClickEngine(core.RunManager(cfg, metrics=core.Metrics()), "A")
+    eng.backend = Backend(kind)
+    return eng
+
+def _stop_while(kind, fn):
+    """Τρέχει fn σε thread, κάνει stop() μόλις αρχίσει η ενέργεια και επιστρέφει (latency, engine)."""
+    eng = _engine(kind)
+    t = threading.Thread(target=fn, args=(eng,)); t.start()
+    assert eng.backend.started.wait(5)
+    t0 = time.monotonic(); eng.stop()
+    t.join(5)
+    assert not t.is_alive()
+    return time.monotonic() - t0, eng
+
+def test_stop_during_glide():
+    latency, eng = _stop_while("move", lambda e: e._glide(1900, 1000, 5.0, "inout"))
+    assert latency < core.ClickEngine.STOP_BUDGET
+    assert eng.backend.position() != (1900, 1000)  # δεν ολοκλήρωσε την κίνηση
+
+def test_stop_while_button_held():
+    Step = core.Step
+    steps = [Step(0.0, "press", button="left"), Step(5.0, "release", button="left")]
+    latency, eng = _stop_while("press", lambda e: e._humanized_click(steps))
+    assert latency < core.ClickEngine.STOP_BUDGET
+    assert not eng.backend.held
+    assert [k for _, k, _, _ in eng.backend.events] == ["press", "release"]  # το release έγινε από το _finish
+
+def test_stop_during_scroll():
+    latency, eng = _stop_while("scroll", lambda e: e._scroll(-100000))
+    assert latency < core.ClickEngine.STOP_BUDGET
+    assert sum(a for _, k, a, _ in eng.backend.events if k == "scroll") > -100000
+
+def test_stop_latency_of_a_running_profile():
+    backend = Backend("move")
+    class Manager(core.RunManager):
+        def make_backend(self, name): return backend
+    cfg = type("Cfg", (), {})()
+    cfg.raw_data = {"profiles": {"A": dict(core.DEFAULTS, points=[{"x": 900, "y": 900}], start_delay_sec=0)},
+                    "current_profile": "A"}
+    mgr = Manager(cfg, metrics=core.Metrics())
+    try:
+        run = mgr.start("A")
+        assert backend.started.wait(5)
+        run.stop()
+        assert run.wait(5)
+        assert run.error is None and run.stop_latency < core.ClickEngine.STOP_BUDGET
+        assert not backend.held
+    finally:
+        mgr.shutdown()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""TemplateMatcher: η πυραμίδα NCC βρίσκει ένα γνωστό κομμάτι της οθόνης, και το cache του τελευταίου hit."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import PeRGio_Clicker_core as core
+
+SIDE = core.TEMPLATE_SIDE
+
+def _screen(seed=0, shape=(600, 800)):
+    # Θόρυβος εξομαλυμένος σε 2×2, ώστε να μοιάζει λίγο με εικόνα αλλά να μένει μοναδικός
+    a = np.random.default_rng(seed).integers(0, 256, (shape[0] + 1, shape[1] + 1)).astype("float32")
+    return (a[:-1, :-1] + a[1:, :-1] + a[:-1, 1:] + a[1:, 1:]) / 4
+
+class Grab:
+    def __init__(self, screen): self.screen, self.regions = screen, []
+    def __call__(self, region=None):
+        self.regions.append(region)
+        if region is None: return self.screen
+        x, y, w, h = region
+        return self.screen[y:y + h, x:x + w]
+
+@pytest.mark.parametrize("x, y", [(0, 0), (123, 77), (401, 333), (800 - SIDE, 600 - SIDE), (17, 551)])
+def test_search_finds_known_patch(x, y):
+    screen = _screen()
+    m = core.TemplateMatcher(screen[y:y + SIDE, x:x + SIDE])
+    assert len(m.levels) > 1  # η αναζήτηση περνάει πράγματι από την πυραμίδα
+    score, hx, hy = m.search(screen)
+    assert (hx, hy) == (x, y) and score == pytest.approx(1.0, abs=1e-4)
+
+def test_search_ignores_brightness_and_contrast():
+    screen = _screen(1)
+    m = core.TemplateMatcher(screen[200:200 + SIDE, 300:300 + SIDE])
+    score, x, y = m.search(screen * 0.5 + 60)
+    assert (x, y) == (300, 200) and score > 0.99
+
+def test_locate_uses_last_hit_then_full_search():
+    screen = _screen(2)
+    grab = Grab(screen)
+    m = core.TemplateMatcher(screen[100:100 + SIDE, 500:500 + SIDE])
+    assert m.locate(grab, screen=(800, 600)) == (500 + SIDE // 2, 100 + SIDE // 2)
+    assert grab.regions == [(0, 0, 800, 600)]
+
+    # Ίδια θέση: μόνο ένα μικρό grab γύρω από το τελευταίο hit
+    grab.regions.clear()
+    assert m.locate(grab, screen=(800, 600)) == (500 + SIDE // 2, 100 + SIDE // 2)
+    (rx, ry, rw, rh), = grab.regions
+    assert rw <= SIDE + 2 * m.CACHE_MARGIN and rh <= SIDE + 2 * m.CACHE_MARGIN
+
+    # Το template μετακινήθηκε: το cache αποτυγχάνει και ακολουθεί πλήρης αναζήτηση
+    moved = screen.copy()
+    moved[100:100 + SIDE, 500:500 + SIDE] = _screen(3, (SIDE, SIDE))
+    moved[420:420 + SIDE, 60:60 + SIDE] = screen[100:100 + SIDE, 500:500 + SIDE]
+    grab.screen, grab.regions = moved, []
+    assert m.locate(grab, screen=(800, 600)) == (60 + SIDE // 2, 420 + SIDE // 2)
+    assert len(grab.regions) == 2 and m.last == (60, 420)
+
+def test_locate_in_region_returns_screen_coordinates():
+    screen = _screen(4)
+    m = core.TemplateMatcher(screen[250:250 + SIDE, 610:610 + SIDE])
+    grab = Grab(screen)
+    assert m.locate(grab, region=(500, 200, 250, 150)) == (610 + SIDE // 2, 250 + SIDE // 2)
+    assert grab.regions == [(500, 200, 250, 150)]
+    # Εκτός της περιοχής δεν βρίσκεται
+    m.last = None
+    assert m.locate(grab, region=(0, 0, 300, 200)) is None and m.last is None
+
+def test_absent_or_flat_template_is_not_found():
+    screen = _screen(5)
+    m = core.TemplateMatcher(_screen(6, (SIDE, SIDE)))
+    assert m.locate(Grab(screen)) is None
+    flat = core.TemplateMatcher(np.full((SIDE, SIDE), 128, dtype="float32"))
+    assert flat.search(screen) is None
+    with pytest.raises(ValueError): core.TemplateMatcher(np.zeros((3, 3)))
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Updater του launcher απέναντι σε τοπικό http.server: 304, ξανά λήψη χωρίς validators όταν λείπει
+το αρχείο, απόρριψη κακής λήψης με backoff."""
+import hashlib, json, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import PeRGio_Clicker as L
+
+CORE = "VERSION = {!r}\nGUI_DEPS = ()\nEXIT_SWAP = 75\ndef main(argv=None, swap_ready=None): return 0\n"
+
+@pytest.fixture
+def server():
+    """Σερβίρει το state["body"] με ETag και απαντά 304 σε If-None-Match· μετράει τα status."""
+    state = {"body": CORE.format("remote").encode(), "type": "text/plain; charset=utf-8", "hits": {}}
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = state["body"]
+            etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+            code = 304 if self.headers.get("If-None-Match") == etag else 200
+            state["hits"][code] = state["hits"].get(code, 0) + 1
+            self.send_response(code)
+            self.send_header("ETag", etag); self.send_header("Content-Type", state["type"])
+            self.send_header("Content-Length", "0" if code == 304 else str(len(body)))
+            self.end_headers()
+            if code == 200: self.wfile.write(body)
+        def log_message(self, *a): pass
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{srv.server_address[1]}/PeRGio_Clicker_core.py"
+    yield state
+    srv.shutdown(); srv.server_close()
+
+def _check(server, tmp_path):
+    return L.check_for_update(server["url"], tmp_path / "core.py", tmp_path / "state.json")
+
+def _state(tmp_path): return json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))
+
+def test_download_then_not_modified(server, tmp_path):
+    assert _check(server, tmp_path) == "updated"
+    assert (tmp_path / "core.py").read_bytes() == server["body"]
+    assert _state(tmp_path)["sha256"] == L.sha256_bytes(server["body"])
+    assert _check(server, tmp_path) == "unchanged"
+    assert server["hits"] == {200: 1, 304: 1}
+    assert not (tmp_path / "core.py.part").exists()
+
+def test_missing_dest_refetches_without_validators(server, tmp_path):
+    assert _check(server, tmp_path) == "updated"
+    (tmp_path / "core.py").unlink()
+    assert _check(server, tmp_path) == "updated"
+    assert server["hits"] == {200: 2}
+
+@pytest.mark.parametrize("body, ctype", [(b"def broken(:\n", "text/plain"),
+                                         (b"<!DOCTYPE html><html>rate limited</html>", "text/plain"),
+                                         (b"", "text/plain")])
+def test_bad_download_keeps_old_core_and_backs_off(server, tmp_path, body, ctype):
+    assert _check(server, tmp_path) == "updated"
+    good = (tmp_path / "core.py").read_bytes()
+    server["body"], server["type"] = body, ctype
+    with pytest.raises(Exception):
+        _check(server, tmp_path)
+    assert (tmp_path / "core.py").read_bytes() == good
+    st = _state(tmp_path)
+    assert st["failures"] == 1 and st["sha256"] == L.sha256_bytes(good) and "last_error" in st
+    assert _check(server, tmp_path) == "backoff"
+    assert not (tmp_path / "core.py.part").exists()
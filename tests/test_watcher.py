@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""ConfigWatcher: μία κλήση ανά ριπή εξωτερικών εγγραφών, καμία για τις δικές μας (ίδιο hash)."""
+import json, os, sys, threading, time
+
+import pytest
+
+import PeRGio_Clicker_core as core
+
+def _watch(cfg, monkeypatch, mode):
+    if mode == "poll":
+        monkeypatch.setattr(core.ConfigWatcher, "_inotify", lambda self: None)
+        monkeypatch.setattr(core.ConfigWatcher, "POLL", 0.05)
+    elif not sys.platform.startswith("linux"):
+        pytest.skip("inotify μόνο σε Linux")
+    calls = []
+    changed = threading.Event()
+    w = core.ConfigWatcher(cfg, lambda: (calls.append(time.monotonic()), changed.set()))
+    w.start()
+    assert w.mode == mode
+    return w, calls, changed
+
+def _external_write(path, interval):
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    raw["profiles"]["Default"]["interval_minutes"] = interval
+    tmp = path.with_name("editor.tmp")
+    tmp.write_text(json.dumps(raw), encoding="utf-8"); os.replace(tmp, path)
+
+@pytest.mark.parametrize("mode", ["inotify", "poll"])
+def test_own_writes_are_ignored(tmp_path, monkeypatch, mode):
+    cfg = core.Config(tmp_path / "c.json"); cfg.flush()
+    w, calls, _ = _watch(cfg, monkeypatch, mode)
+    try:
+        for i in range(5):
+            cfg.data["scroll"] = i; cfg._dirty.set(); cfg.flush()
+            time.sleep(0.06)
+        time.sleep(0.2)
+        assert calls == []
+    finally:
+        w.stop()
+
+@pytest.mark.parametrize("mode", ["inotify", "poll"])
+def test_external_change_reloads(tmp_path, monkeypatch, mode):
+    cfg = core.Config(tmp_path / "c.json"); cfg.flush()
+    w, calls, changed = _watch(cfg, monkeypatch, mode)
+    try:
+        time.sleep(0.1)  # mtime με διαφορετική τιμή από το αρχικό (poll)
+        _external_write(cfg.path, 9.0)
+        assert changed.wait(5)
+        assert cfg.data["interval_minutes"] == 9.0
+    finally:
+        w.stop()
+
+def test_inotify_debounces_a_burst(tmp_path, monkeypatch):
+    cfg = core.Config(tmp_path / "c.json"); cfg.flush()
+    monkeypatch.setattr(core.ConfigWatcher, "DEBOUNCE", 0.2)
+    w, calls, changed = _watch(cfg, monkeypatch, "inotify")
+    try:
+        for i in range(10): _external_write(cfg.path, 10.0 + i)
+        assert changed.wait(5)
+        time.sleep(0.5)
+        assert len(calls) == 1
+        assert cfg.data["interval_minutes"] == 19.0  # διαβάστηκε μετά την τελευταία εγγραφή
+    finally:
+        w.stop()